@@ -1,59 +1,32 @@
+import time
+# Marcas del arranque (import, ventana, setup_ui, primer pintado); ver _informar_arranque
+MARCAS_ARRANQUE = [("inicio", time.perf_counter())]
+
 import os
+import sys
+import atexit
+import json
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from git import Repo, GitCommandError
 from datetime import datetime
 import threading
-import subprocess
+import re
+import itertools
+MARCAS_ARRANQUE.append(("import customtkinter", time.perf_counter()))
+
+from aetheryon_core import (
+    ALGORITMOS_DIFF, ARCHIVOS_PRECARGA, CARPETAS_IGNORADAS, LINEAS_VISTA_PREVIA,
+    MAX_ARCHIVOS_COMPARACION, MAX_LINEAS_DIFF_EN_LINEA, METRICAS, PRIORIDAD_FONDO,
+    PRIORIDAD_INTERACTIVA, TRAZADOR, UMBRAL_ARCHIVO_GRANDE, DisposicionGrafo,
+    PlanificadorTrabajos, Proyecto, RegistroCommit, SesionPersistida, cargar_numpy, medir,
+    tamaño_legible, tiempos_relativos, _imprimir_verificacion_backends,
+)
+MARCAS_ARRANQUE.append(("import aetheryon_core", time.perf_counter()))
 
 # Configuración de CustomTkinter
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-#-----------------------------------
-# CONFIGURACIÓN DE CARPETAS A IGNORAR
-#-----------------------------------
-
-CARPETAS_IGNORADAS = {
-    '.git', 'node_modules', 'venv', 'env', '.venv', '__pycache__',
-    '.pytest_cache', '.mypy_cache', 'dist', 'build', '.next', '.nuxt',
-    'target', 'vendor', '.idea', '.vscode',
-}
-
-GITIGNORE_TEMPLATE = """# Dependencias
-node_modules/
-venv/
-env/
-.venv/
-__pycache__/
-*.pyc
-*.pyo
-*.pyd
-
-# Build & Distribución
-dist/
-build/
-*.egg-info/
-.next/
-.nuxt/
-target/
-
-# IDEs
-.idea/
-.vscode/
-*.swp
-*.swo
-
-# Sistema
-.DS_Store
-Thumbs.db
-*.log
-
-# Archivos de entorno
-.env
-.env.local
-"""
-
 #-----------------------------------
 # Custom Dialogs
 #-----------------------------------
@@ -181,883 +154,229 @@ class CTkChoiceDialog(ctk.CTkToplevel):
         self.result = None
         self.destroy()
 
+
 #-----------------------------------
-# Clase Proyecto
+# Resaltado de sintaxis por viewport
 #-----------------------------------
 
-class Proyecto:
-    def __init__(self, path):
-        self.path = path
-        self.repo = self._cargar_repo()
-
-    def _cargar_repo(self):
-        try:
-            return Repo(self.path)
-        except:
-            return None
-
-    def iniciar_git(self):
-        if not os.path.exists(os.path.join(self.path, ".git")):
-            self.repo = Repo.init(self.path)
-            
-            gitignore_path = os.path.join(self.path, ".gitignore")
-            if not os.path.exists(gitignore_path):
-                with open(gitignore_path, 'w', encoding='utf-8') as f:
-                    f.write(GITIGNORE_TEMPLATE)
-                print("📄 .gitignore creado automáticamente")
-            
-            return True
-        return False
-
-    def get_rama_actual(self):
-        if not self.repo:
-            return "Sin repo"
-        try:
-            return str(self.repo.active_branch)
-        except:
-            return "HEAD detached"
-
-    def cambiar_rama(self, nombre_rama):
-        try:
-            self.repo.git.checkout(nombre_rama)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def listar_ramas(self):
-        try:
-            ramas_locales = [str(rama) for rama in self.repo.branches]
-            try:
-                ramas_remotas = [str(rama).replace('origin/', '') for rama in self.repo.remote().refs]
-            except:
-                ramas_remotas = []
-            return {
-                'locales': ramas_locales,
-                'remotas': ramas_remotas
-            }
-        except Exception as e:
-            return {'locales': [], 'remotas': []}
-
-    def fetch(self):
-        try:
-            self.repo.git.fetch()
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def cherry_pick_commit(self, commit_hash):
-        try:
-            self.repo.git.cherry_pick(commit_hash)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def crear_rama(self, nombre_rama):
-        try:
-            self.repo.git.checkout('HEAD', b=nombre_rama)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-#####MERGE
-    def merge_rama(self, rama_origen):
-        """Realiza un merge de la rama especificada a la rama actual"""
-        try:
-            self.repo.git.merge(rama_origen)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def abortar_merge(self):
-        """Aborta un merge en progreso"""
-        try:
-            self.repo.git.merge('--abort')
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def continuar_merge(self):
-        """Continúa un merge después de resolver conflictos"""
-        try:
-            self.repo.git.commit('--no-edit')
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def hay_merge_en_progreso(self):
-        """Verifica si hay un merge en progreso"""
-        merge_head = os.path.join(self.path, '.git', 'MERGE_HEAD')
-        return os.path.exists(merge_head)
-
-    def get_conflictos(self):
-        """Obtiene la lista de archivos con conflictos"""
-        if not self.repo:
-            return []
-        
-        try:
-            # Obtener archivos con conflictos usando git diff
-            output = self.repo.git.diff('--name-only', '--diff-filter=U')
-            if output:
-                return output.strip().split('\n')
-            return []
-        except Exception as e:
-            print(f"Error obteniendo conflictos: {e}")
-            return []
-
-    def resolver_conflicto_archivo(self, archivo, resolucion='ours'):
-        """
-        Resuelve un conflicto de merge para un archivo específico
-        resolucion: 'ours' (mantener cambios actuales) o 'theirs' (aceptar cambios entrantes)
-        """
-        try:
-            if resolucion == 'ours':
-                self.repo.git.checkout('--ours', archivo)
-            elif resolucion == 'theirs':
-                self.repo.git.checkout('--theirs', archivo)
-            
-            self.repo.git.add(archivo)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-
-
-    def detectar_divergencia_ramas(self, rama1, rama2):
-        """
-        Detecta si dos ramas tienen commits diferentes (divergencia)
-        Retorna dict con archivos divergentes y sus timestamps
-        """
-        if not self.repo:
-            return None
-        
-        try:
-            # Obtener commits de ambas ramas
-            commits_rama1 = {}
-            commits_rama2 = {}
-            
-            # Analizar rama1
-            for commit in self.repo.iter_commits(rama1, max_count=50):
-                for item in commit.stats.files.keys():
-                    if item not in commits_rama1:
-                        commits_rama1[item] = {
-                            'hash': commit.hexsha[:8],
-                            'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M'),
-                            'timestamp': commit.committed_date,
-                            'mensaje': commit.message.strip()
-                        }
-            
-            # Analizar rama2
-            for commit in self.repo.iter_commits(rama2, max_count=50):
-                for item in commit.stats.files.keys():
-                    if item not in commits_rama2:
-                        commits_rama2[item] = {
-                            'hash': commit.hexsha[:8],
-                            'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M'),
-                            'timestamp': commit.committed_date,
-                            'mensaje': commit.message.strip()
-                        }
-            
-            # Encontrar divergencias
-            divergencias = {}
-            todos_archivos = set(commits_rama1.keys()) | set(commits_rama2.keys())
-            
-            for archivo in todos_archivos:
-                info1 = commits_rama1.get(archivo)
-                info2 = commits_rama2.get(archivo)
-                
-                # Si el archivo existe en ambas ramas pero con diferentes commits
-                if info1 and info2:
-                    if info1['hash'] != info2['hash']:
-                        divergencias[archivo] = {
-                            rama1: info1,
-                            rama2: info2,
-                            'mas_reciente': rama1 if info1['timestamp'] > info2['timestamp'] else rama2,
-                            'diferencia_dias': abs(info1['timestamp'] - info2['timestamp']) / 86400
-                        }
-                # Si el archivo solo existe en una rama
-                elif info1 and not info2:
-                    divergencias[archivo] = {
-                        rama1: info1,
-                        rama2: {'hash': 'N/A', 'fecha': 'No existe', 'mensaje': 'Archivo no presente'},
-                        'solo_en': rama1
-                    }
-                elif info2 and not info1:
-                    divergencias[archivo] = {
-                        rama1: {'hash': 'N/A', 'fecha': 'No existe', 'mensaje': 'Archivo no presente'},
-                        rama2: info2,
-                        'solo_en': rama2
-                    }
-            
-            return divergencias if divergencias else None
-            
-        except Exception as e:
-            print(f"Error detectando divergencias: {e}")
-            return None
-
-    def analizar_merge_previo(self, rama_origen):
-        """
-        Analiza si un merge sería fast-forward o requiere commit de merge
-        """
-        try:
-            rama_actual = self.get_rama_actual()
-            
-            # Ver si rama_actual está contenida en rama_origen (fast-forward posible)
-            resultado = self.repo.git.merge_base('--is-ancestor', rama_actual, rama_origen)
-            es_fast_forward = (resultado == '')
-            
-            # Contar commits diferentes
-            commits_adelante = len(list(self.repo.iter_commits(f'{rama_actual}..{rama_origen}')))
-            commits_atras = len(list(self.repo.iter_commits(f'{rama_origen}..{rama_actual}')))
-            
-            return {
-                'es_fast_forward': es_fast_forward,
-                'commits_adelante': commits_adelante,  # Cuántos commits tiene rama_origen que no tiene actual
-                'commits_atras': commits_atras,        # Cuántos commits tiene actual que no tiene rama_origen
-                'requiere_merge': commits_adelante > 0 and commits_atras > 0
-            }
-            
-        except Exception as e:
-            print(f"Error analizando merge: {e}")
-            return None
+# Cada cuántas líneas se guarda el estado del tokenizador (comentario o cadena abierta)
+LINEAS_CHECKPOINT = 50
 
-    def get_contenido_archivo_en_rama(self, archivo, rama):
-        """Obtiene el contenido de un archivo en una rama específica"""
-        try:
-            contenido = self.repo.git.show(f'{rama}:{archivo}')
-            return contenido
-        except Exception as e:
-            return None
+# Líneas extra que se resaltan por encima y por debajo de lo visible
+MARGEN_RESALTADO = 60
 
+# Tiempo máximo por tanda de trabajo en el hilo de Tk
+PRESUPUESTO_RESALTADO = 0.006
 
-####
-
-    def push(self):
-        try:
-            self.repo.git.push()
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def pull(self):
-        try:
-            self.repo.git.pull()
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def get_git_log(self, max_count=10):
-        try:
-            return self.repo.git.log('--oneline', max_count=max_count)
-        except GitCommandError as e:
-            return str(e)
-
-    def get_git_status(self):
-        try:
-            return self.repo.git.status()
-        except GitCommandError as e:
-            return str(e)
-
-    def clonar_repo(self, url, directorio_destino):
-        try:
-            print(f"📥 Clonando repositorio: {url}")
-            print(f"📂 Destino: {directorio_destino}")
-            
-            parent_dir = os.path.dirname(directorio_destino)
-            if not os.path.exists(parent_dir):
-                os.makedirs(parent_dir)
-            
-            self.repo = Repo.clone_from(url, directorio_destino)
-            self.path = directorio_destino
-            print("✅ Repositorio clonado exitosamente")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error al clonar: {e}")
-            return str(e)
-
-    def get_commits_detallados(self, max_count=20):
-        if not self.repo:
-            return []
-        
-        try:
-            commits = []
-            for commit in self.repo.iter_commits(max_count=max_count):
-                commits.append({
-                    'hash': commit.hexsha[:8],
-                    'hash_completo': commit.hexsha,
-                    'mensaje': commit.message.strip(),
-                    'autor': str(commit.author),
-                    'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M:%S'),
-                    'fecha_relativa': self._tiempo_relativo(commit.committed_date)
-                })
-            return commits
-        except Exception as e:
-            return []
-
-    def _tiempo_relativo(self, timestamp):
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        commit_time = datetime.fromtimestamp(timestamp, timezone.utc)
-        diff = now - commit_time
-        
-        if diff.days > 0:
-            return f"hace {diff.days} día{'s' if diff.days > 1 else ''}"
-        elif diff.seconds > 3600:
-            horas = diff.seconds // 3600
-            return f"hace {horas} hora{'s' if horas > 1 else ''}"
-        elif diff.seconds > 60:
-            minutos = diff.seconds // 60
-            return f"hace {minutos} minuto{'s' if minutos > 1 else ''}"
-        else:
-            return "hace unos segundos"
-
-    def get_commits_por_archivo(self, archivo, max_count=20):
-        if not self.repo:
-            return []
-        
-        try:
-            commits = []
-            for commit in self.repo.iter_commits(paths=archivo, max_count=max_count):
-                cambios = []
-                if commit.parents:
-                    diffs = commit.parents[0].diff(commit, paths=archivo)
-                    for diff in diffs:
-                        if diff.change_type == 'A':
-                            cambios.append("📄 Archivo creado")
-                        elif diff.change_type == 'M':
-                            cambios.append("✏️ Modificado")
-                        elif diff.change_type == 'D':
-                            cambios.append("🗑️ Eliminado")
-                        elif diff.change_type == 'R':
-                            cambios.append("📝 Renombrado")
-                else:
-                    cambios.append("📄 Commit inicial")
-                
-                commits.append({
-                    'hash': commit.hexsha[:8],
-                    'hash_completo': commit.hexsha,
-                    'mensaje': commit.message.strip(),
-                    'autor': str(commit.author),
-                    'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M:%S'),
-                    'fecha_relativa': self._tiempo_relativo(commit.committed_date),
-                    'cambios': ' | '.join(cambios) if cambios else "Sin cambios"
-                })
-            return commits
-        except Exception as e:
-            print(f"Error obteniendo commits del archivo: {e}")
-            return []
-
-    def crear_tag(self, nombre_tag, mensaje="", commit_hash=None):
-        try:
-            if commit_hash:
-                if mensaje:
-                    self.repo.git.tag('-a', nombre_tag, '-m', mensaje, commit_hash)
-                else:
-                    self.repo.git.tag(nombre_tag, commit_hash)
-            else:
-                if mensaje:
-                    self.repo.git.tag('-a', nombre_tag, '-m', mensaje)
-                else:
-                    self.repo.git.tag(nombre_tag)
-            
-            print(f"🏷️ Tag '{nombre_tag}' creado")
-            return True
-            
-        except GitCommandError as e:
-            return str(e)
-
-    def get_tags(self):
-        if not self.repo:
-            return []
-        
-        try:
-            tags_info = []
-            for tag in self.repo.tags:
-                try:
-                    commit = tag.commit
-                    
-                    try:
-                        tag_obj = self.repo.odb.info(tag.object.binsha)
-                        mensaje_tag = tag.tag.message if hasattr(tag, 'tag') else ""
-                    except:
-                        mensaje_tag = ""
-                    
-                    tags_info.append({
-                        'nombre': tag.name,
-                        'hash': commit.hexsha[:8],
-                        'hash_completo': commit.hexsha,
-                        'mensaje_commit': commit.message.strip(),
-                        'mensaje_tag': mensaje_tag,
-                        'autor': str(commit.author),
-                        'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M:%S'),
-                        'fecha_relativa': self._tiempo_relativo(commit.committed_date)
-                    })
-                except Exception as e:
-                    print(f"Error procesando tag {tag.name}: {e}")
-                    continue
-            
-            tags_info.sort(key=lambda x: x['fecha'], reverse=True)
-            return tags_info
-            
-        except Exception as e:
-            print(f"Error obteniendo tags: {e}")
-            return []
-
-    def eliminar_tag(self, nombre_tag):
-        try:
-            self.repo.git.tag('-d', nombre_tag)
-            print(f"🗑️ Tag '{nombre_tag}' eliminado")
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def push_tags(self):
-        try:
-            self.repo.git.push('--tags')
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def reset_to_commit(self, commit_hash, tipo="soft"):
-        try:
-            if tipo == "soft":
-                self.repo.git.reset('--soft', commit_hash)
-            elif tipo == "mixed":
-                self.repo.git.reset('--mixed', commit_hash)
-            elif tipo == "hard":
-                self.repo.git.reset('--hard', commit_hash)
-            
-            print(f"🔄 Reset {tipo} a commit {commit_hash}")
-            return True
-            
-        except GitCommandError as e:
-            return str(e)
-
-    def crear_repo_gh(self, nombre, visibilidad="private"):
-        """Crea un repositorio en GitHub usando GitHub CLI"""
-        try:
-            os.chdir(self.path)
-            print(f"📂 Cambiando a directorio: {self.path}")
-            
-            if not os.path.exists(os.path.join(self.path, ".git")):
-                print("🚀 Inicializando repositorio Git local...")
-                self.iniciar_git()
-            
-            if not self.repo:
-                self.repo = Repo(self.path)
-            
-            status = subprocess.getoutput("git status --porcelain").strip()
-            print(f"📋 Status actual: {status}")
-            
-            try:
-                result = subprocess.getoutput("git log --oneline -1").strip()
-                if not result:
-                    print("📝 No hay commits, creando commit inicial...")
-                    need_initial_commit = True
-                else:
-                    print(f"✅ Último commit: {result}")
-                    need_initial_commit = False
-            except:
-                need_initial_commit = True
-            
-            if need_initial_commit or status:
-                print("📝 Preparando archivos para commit...")
-                
-                readme_path = os.path.join(self.path, "README.md")
-                if not os.path.exists(readme_path):
-                    with open(readme_path, 'w', encoding='utf-8') as f:
-                        f.write(f"# {nombre}\n\nProyecto creado con AETHERYON Dev Core\n")
-                    print("📄 README.md creado")
-                
-                subprocess.run("git add .", shell=True, check=True)
-                print("➕ Archivos añadidos al stage")
-                
-                commit_result = subprocess.run('git commit -m "Initial commit"', shell=True)
-                if commit_result.returncode == 0:
-                    print("✅ Commit inicial realizado")
-                else:
-                    print("⚠️ Error en commit o no hay cambios")
-            
-            print(f"🌐 Creando repositorio en GitHub: {nombre}")
-            
-            command = f'gh repo create {nombre} --{visibilidad} --source=. --remote=origin --push'
-            print(f"🔧 Ejecutando: {command}")
-            
-            result = subprocess.run(command, shell=True)
-            
-            if result.returncode == 0:
-                print("✅ Repositorio GitHub creado exitosamente")
-                self.repo = Repo(self.path)
-                return True
-            else:
-                error_msg = f"Error ejecutando GitHub CLI (código: {result.returncode}).\n"
-                
-                if result.returncode == 1:
-                    error_msg += "Posible causa: El repositorio ya existe o hay un problema de autenticación."
-                elif result.returncode == 2:
-                    error_msg += "Posible causa: Problema con los parámetros del comando."
-                else:
-                    error_msg += "Verifica que 'gh' esté instalado y autenticado correctamente."
-                
-                return error_msg
-                
-        except Exception as e:
-            print(f"❌ Error en crear_repo_gh: {e}")
-            return str(e)
-
-    def estado_archivos(self):
-        if not self.repo:
-            return {}
-
-        unstaged = []
-        staged = []
-        untracked = []
-
-        try:
-            untracked = self.repo.untracked_files
-            untracked = [f for f in untracked if not self._esta_en_carpeta_ignorada(f)]
-        except Exception as e:
-            print(f"Error obteniendo untracked: {e}")
-            untracked = []
-
-        try:
-            unstaged = [item.a_path for item in self.repo.index.diff(None)]
-            unstaged = [f for f in unstaged if not self._esta_en_carpeta_ignorada(f)]
-        except Exception as e:
-            print(f"Error obteniendo unstaged: {e}")
-            unstaged = []
-
-        try:
-            if self.repo.head.is_valid():
-                staged = [item.a_path for item in self.repo.index.diff("HEAD")]
-            else:
-                staged = [item[0] for item in self.repo.index.entries.keys()]
-            staged = [f for f in staged if not self._esta_en_carpeta_ignorada(f)]
-        except Exception as e:
-            print(f"Error obteniendo staged: {e}")
-            try:
-                staged = [item[0] for item in self.repo.index.entries.keys()]
-                staged = [f for f in staged if not self._esta_en_carpeta_ignorada(f)]
-            except:
-                staged = []
-
-        print(f"📊 Estado Git (filtrado):")
-        print(f"  🆕 Untracked: {len(untracked)} archivos")
-        print(f"  📝 Unstaged: {len(unstaged)} archivos")
-        print(f"  ✅ Staged: {len(staged)} archivos")
-
-        return {
-            "unstaged": unstaged,
-            "staged": staged,
-            "untracked": untracked
-        }
-
-    def _esta_en_carpeta_ignorada(self, ruta):
-        partes = ruta.split('/')
-        return any(carpeta in CARPETAS_IGNORADAS for carpeta in partes)
-
-    def git_add(self, archivos):
-        try:
-            for archivo in archivos:
-                self.repo.git.add(archivo)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-    def git_commit(self, mensaje):
-        try:
-            self.repo.git.commit('-m', mensaje)
-            return True
-        except GitCommandError as e:
-            return str(e)
-
-#########################
-
-    def verificar_cambios_pendientes(self):
-        """
-        Verifica si hay cambios sin guardar en el working directory
-        
-        Returns:
-            dict: {
-                'tiene_cambios': bool,
-                'unstaged': int,
-                'untracked': int,
-                'staged': int,
-                'detalles': list[str]
-            }
-        """
-        if not self.repo:
-            return {
-                'tiene_cambios': False,
-                'unstaged': 0,
-                'untracked': 0,
-                'staged': 0,
-                'detalles': []
-            }
-        
-        try:
-            detalles = []
-            
-            # Archivos modificados pero no staged
-            unstaged_items = list(self.repo.index.diff(None))
-            unstaged = len(unstaged_items)
-            if unstaged > 0:
-                detalles.append(f"📝 {unstaged} archivo(s) modificado(s)")
-            
-            # Archivos sin trackear
-            untracked_files = self.repo.untracked_files
-            untracked = len(untracked_files)
-            if untracked > 0:
-                detalles.append(f"🆕 {untracked} archivo(s) nuevo(s)")
-            
-            # Archivos staged pero no commiteados
-            try:
-                if self.repo.head.is_valid():
-                    staged_items = list(self.repo.index.diff("HEAD"))
-                    staged = len(staged_items)
-                    if staged > 0:
-                        detalles.append(f"✅ {staged} archivo(s) en stage")
-                else:
-                    staged = 0
-            except:
-                staged = 0
-            
-            tiene_cambios = unstaged > 0 or untracked > 0 or staged > 0
-            
-            return {
-                'tiene_cambios': tiene_cambios,
-                'unstaged': unstaged,
-                'untracked': untracked,
-                'staged': staged,
-                'detalles': detalles
-            }
-        except Exception as e:
-            print(f"Error verificando cambios: {e}")
-            return {
-                'tiene_cambios': False,
-                'unstaged': 0,
-                'untracked': 0,
-                'staged': 0,
-                'detalles': []
-            }
-
-    def stash_cambios(self, mensaje="Auto-stash antes de cambiar rama"):
-        """
-        Guarda cambios temporalmente en stash
-        
-        Args:
-            mensaje: Mensaje descriptivo del stash
-            
-        Returns:
-            True si exitoso, str con error si falla
-        """
-        try:
-            # Verificar si hay algo que hacer stash
-            info_cambios = self.verificar_cambios_pendientes()
-            if not info_cambios['tiene_cambios']:
-                return True  # No hay nada que guardar
-            
-            # Stash con mensaje
-            self.repo.git.stash('push', '-u', '-m', mensaje)  # -u incluye untracked
-            print(f"📦 Stash creado: {mensaje}")
-            return True
-        except GitCommandError as e:
-            return f"Error al hacer stash: {str(e)}"
-
-    def aplicar_stash(self, index=0, eliminar_despues=True):
-        """
-        Aplica un stash guardado
-        
-        Args:
-            index: Índice del stash (0 es el más reciente)
-            eliminar_despues: Si True usa 'pop', si False usa 'apply'
-            
-        Returns:
-            True si exitoso, str con error si falla
-        """
-        try:
-            if index == 0 and eliminar_despues:
-                self.repo.git.stash('pop')
-            elif eliminar_despues:
-                self.repo.git.stash('pop', f'stash@{{{index}}}')
-            else:
-                self.repo.git.stash('apply', f'stash@{{{index}}}')
-            
-            print(f"✅ Stash aplicado (índice: {index})")
-            return True
-        except GitCommandError as e:
-            return f"Error al aplicar stash: {str(e)}"
-
-    def listar_stashes(self):
-        """
-        Lista todos los stashes disponibles
-        
-        Returns:
-            list[dict]: Lista de stashes con info estructurada
-        """
-        try:
-            stashes = []
-            stash_list = self.repo.git.stash('list').split('\n')
-            
-            for i, stash_str in enumerate(stash_list):
-                if stash_str.strip():
-                    # Parsear formato: stash@{0}: WIP on branch: mensaje
-                    parts = stash_str.split(': ', 2)
-                    if len(parts) >= 3:
-                        stashes.append({
-                            'index': i,
-                            'ref': parts[0],
-                            'tipo': parts[1],
-                            'mensaje': parts[2] if len(parts) > 2 else '',
-                            'texto_completo': stash_str
-                        })
-                    else:
-                        stashes.append({
-                            'index': i,
-                            'ref': f'stash@{{{i}}}',
-                            'tipo': 'WIP',
-                            'mensaje': stash_str,
-                            'texto_completo': stash_str
-                        })
-            
-            return stashes
-        except Exception as e:
-            print(f"Error listando stashes: {e}")
-            return []
+COLORES_SINTAXIS = {
+    'sx_palabra': "#569CD6",
+    'sx_cadena': "#CE9178",
+    'sx_comentario': "#6A9955",
+    'sx_numero': "#B5CEA8",
+}
 
-    def eliminar_stash(self, index):
-        """Elimina un stash específico"""
-        try:
-            self.repo.git.stash('drop', f'stash@{{{index}}}')
-            print(f"🗑️ Stash {index} eliminado")
-            return True
-        except GitCommandError as e:
-            return f"Error al eliminar stash: {str(e)}"
+LENGUAJES_SINTAXIS = {
+    'python': {
+        'extensiones': ('.py', '.pyw', '.pyi'),
+        'palabras': 'and as assert async await break class continue def del elif else except False finally '
+                    'for from global if import in is lambda None nonlocal not or pass raise return self True '
+                    'try while with yield',
+        'comentario': '#',
+        'bloques': (('"""', '"""', 'sx_cadena'), ("'''", "'''", 'sx_cadena')),
+        'cadenas': '"\'',
+    },
+    'c': {
+        'extensiones': ('.c', '.h', '.cpp', '.hpp', '.cc', '.cs', '.java', '.kt', '.js', '.jsx', '.mjs',
+                        '.ts', '.tsx', '.go', '.rs', '.swift', '.php', '.dart', '.css', '.scss'),
+        'palabras': 'abstract async await break case catch class const continue default delete do else enum '
+                    'export extends false final finally fn for func function if impl implements import in '
+                    'instanceof interface let match mut new null package private protected pub public return '
+                    'static struct super switch this throw true try type typeof use var void while yield',
+        'comentario': '//',
+        'bloques': (('/*', '*/', 'sx_comentario'),),
+        'cadenas': '"\'`',
+    },
+    'shell': {
+        'extensiones': ('.sh', '.bash', '.zsh', '.yml', '.yaml', '.toml', '.ini', '.cfg', '.conf', '.rb', '.r'),
+        'palabras': 'case do done elif else esac export fi for function if in local return then true false '
+                    'while def end require',
+        'comentario': '#',
+        'bloques': (),
+        'cadenas': '"\'',
+    },
+    'sql': {
+        'extensiones': ('.sql',),
+        'palabras': 'select from where insert into values update set delete create table index view '
+                    'drop alter join left right inner outer on group by order having limit and or not null '
+                    'as distinct union primary key foreign references',
+        'sin_mayusculas': True,
+        'comentario': '--',
+        'bloques': (('/*', '*/', 'sx_comentario'),),
+        'cadenas': '"\'',
+    },
+    'html': {
+        'extensiones': ('.html', '.htm', '.xml', '.svg', '.vue', '.xaml'),
+        'palabras': '',
+        'comentario': None,
+        'bloques': (('<!--', '-->', 'sx_comentario'),),
+        'cadenas': '"\'',
+    },
+}
 
-    def cambiar_rama_seguro(self, nombre_rama, forzar=False, stash_automatico=False):
-        """
-        Cambia de rama de forma segura, verificando el estado del working directory
-        
-        Args:
-            nombre_rama: Nombre de la rama destino
-            forzar: Si es True, fuerza el checkout descartando cambios locales
-            stash_automatico: Si es True, hace stash automático de cambios
-        
-        Returns:
-            dict con resultado detallado
-        """
-        try:
-            rama_origen = self.get_rama_actual()
-            
-            # Verificar si ya estamos en esa rama
-            if rama_origen == nombre_rama:
-                return {
-                    'exito': True,
-                    'mensaje': f'Ya estás en la rama {nombre_rama}',
-                    'cambios_pendientes': False,
-                    'rama_actual': rama_origen,
-                    'sin_cambios': True
-                }
-            
-            # Verificar si hay cambios pendientes
-            info_cambios = self.verificar_cambios_pendientes()
-            tiene_cambios = info_cambios['tiene_cambios']
-            
-            # Manejar cambios pendientes
-            if tiene_cambios:
-                if stash_automatico:
-                    # Hacer stash automático
-                    resultado_stash = self.stash_cambios(
-                        f"Auto-stash: cambio de {rama_origen} a {nombre_rama}"
-                    )
-                    if resultado_stash != True:
-                        return {
-                            'exito': False,
-                            'mensaje': 'Error al hacer stash automático',
-                            'cambios_pendientes': True,
-                            'error': resultado_stash
-                        }
-                    print("📦 Cambios guardados automáticamente en stash")
-                elif not forzar:
-                    # Requiere acción del usuario
-                    return {
-                        'exito': False,
-                        'mensaje': 'Hay cambios sin guardar',
-                        'cambios_pendientes': True,
-                        'requiere_stash': True,
-                        'info_cambios': info_cambios
-                    }
-            
-            # Realizar el checkout
-            if forzar:
-                # Checkout forzado (descarta cambios locales)
-                print(f"⚠️ Checkout FORZADO a {nombre_rama} (descartando cambios)")
-                self.repo.git.checkout(nombre_rama, force=True)
-            else:
-                # Checkout normal
-                print(f"🔀 Checkout a {nombre_rama}")
-                self.repo.git.checkout(nombre_rama)
-            
-            # Verificar que el checkout fue exitoso
-            rama_actual = self.get_rama_actual()
-            checkout_exitoso = (rama_actual == nombre_rama)
-            
-            if checkout_exitoso:
-                print(f"✅ Cambio exitoso: {rama_origen} → {rama_actual}")
-                return {
-                    'exito': True,
-                    'mensaje': f'Cambiado exitosamente a {nombre_rama}',
-                    'cambios_pendientes': False,
-                    'rama_origen': rama_origen,
-                    'rama_actual': rama_actual,
-                    'habia_cambios': tiene_cambios,
-                    'stash_aplicado': stash_automatico and tiene_cambios
-                }
-            else:
-                return {
-                    'exito': False,
-                    'mensaje': f'El checkout no se completó correctamente (rama actual: {rama_actual})',
-                    'cambios_pendientes': False,
-                    'rama_actual': rama_actual
-                }
-                
-        except GitCommandError as e:
-            error_msg = str(e)
-            
-            # Analizar el tipo de error
-            if "would be overwritten" in error_msg:
-                return {
-                    'exito': False,
-                    'mensaje': 'Archivos modificados serían sobrescritos',
-                    'cambios_pendientes': True,
-                    'requiere_stash': True,
-                    'error': error_msg,
-                    'tipo_error': 'conflicto_archivos'
-                }
-            elif "does not exist" in error_msg:
-                return {
-                    'exito': False,
-                    'mensaje': f'La rama {nombre_rama} no existe',
-                    'error': error_msg,
-                    'tipo_error': 'rama_inexistente'
-                }
-            else:
-                return {
-                    'exito': False,
-                    'mensaje': f'Error en checkout: {error_msg}',
-                    'error': error_msg,
-                    'tipo_error': 'desconocido'
-                }
-        except Exception as e:
-            return {
-                'exito': False,
-                'mensaje': f'Error inesperado: {str(e)}',
-                'error': str(e),
-                'tipo_error': 'excepcion'
-            }
 
-#########################
+def _compilar_lenguaje(definicion):
+    partes = [f"(?P<b{i}>{re.escape(inicio)})" for i, (inicio, _, _) in enumerate(definicion['bloques'])]
+    if definicion['comentario']:
+        partes.append(f"(?P<comentario>{re.escape(definicion['comentario'])}.*)")
+    for comilla in definicion['cadenas']:
+        partes.append(f"(?P<s{ord(comilla)}>{comilla}(?:[^{comilla}\\\\]|\\\\.)*{comilla}?)")
+    partes.append(r"(?P<numero>\b\d[\w.]*)")
+    if definicion['palabras']:
+        alternativas = '|'.join(definicion['palabras'].split())
+        if definicion.get('sin_mayusculas'):
+            alternativas = f"(?i:{alternativas})"
+        partes.append(f"(?P<palabra>\\b(?:{alternativas})\\b)")
+    definicion['patron'] = re.compile('|'.join(partes))
+
+
+for _definicion in LENGUAJES_SINTAXIS.values():
+    _compilar_lenguaje(_definicion)
+
+
+def lenguaje_de_archivo(archivo):
+    """Definición de sintaxis según la extensión, o None si no se reconoce"""
+    extension = os.path.splitext(archivo)[1].lower()
+    for definicion in LENGUAJES_SINTAXIS.values():
+        if extension in definicion['extensiones']:
+            return definicion
+    return None
+
+
+def _tokenizar_linea(lenguaje, linea, estado):
+    """
+    Tokens (col_inicio, col_fin, etiqueta) de una línea y el estado con el que
+    empieza la siguiente: None o el índice del bloque (comentario/cadena) abierto.
+    """
+    tokens = []
+    posicion = 0
+    bloques = lenguaje['bloques']
+    if estado is not None:
+        fin = linea.find(bloques[estado][1])
+        if fin < 0:
+            return [(0, len(linea), bloques[estado][2])], estado
+        posicion = fin + len(bloques[estado][1])
+        tokens.append((0, posicion, bloques[estado][2]))
+    
+    patron = lenguaje['patron']
+    while True:
+        m = patron.search(linea, posicion)
+        if not m:
+            return tokens, None
+        tipo = m.lastgroup
+        if tipo[0] == 'b':
+            indice = int(tipo[1:])
+            _, cierre, etiqueta = bloques[indice]
+            fin = linea.find(cierre, m.end())
+            if fin < 0:
+                tokens.append((m.start(), len(linea), etiqueta))
+                return tokens, indice
+            posicion = fin + len(cierre)
+            tokens.append((m.start(), posicion, etiqueta))
+            continue
+        etiqueta = 'sx_cadena' if tipo[0] == 's' else f'sx_{tipo}'
+        tokens.append((m.start(), m.end(), etiqueta))
+        posicion = max(m.end(), posicion + 1)
+
+
+class ResaltadorSintaxis:
+    """
+    Resaltado de sintaxis de un CTkTextbox que solo tokeniza las líneas visibles
+    (más un margen), en tandas cortas con `after` para no trabar la interfaz.
+    
+    El estado del tokenizador se guarda cada LINEAS_CHECKPOINT líneas, así que al
+    desplazarse o al cambiar el texto (avisando con `invalidar`) solo se vuelve a
+    procesar lo que falta. `columna_inicio` saltea prefijos como los números de
+    línea; con `separador` solo se resaltan las líneas cuyo prefijo termina en él.
+    """
+
+    def __init__(self, texto, lenguaje, columna_inicio=0, separador=None):
+        self.texto = texto
+        self.lenguaje = lenguaje
+        self.columna_inicio = columna_inicio
+        self.separador = separador
+        # checkpoint -> estado con el que empieza; un checkpoint es un tramo de líneas
+        self._estados = {0: None}
+        self._resaltados = set()
+        self._tanda = None
+        self._visible = None
+        for etiqueta, color in COLORES_SINTAXIS.items():
+            texto.tag_config(etiqueta, foreground=color)
+        self._vigilar()
+
+    def invalidar(self, desde_linea=1):
+        """El texto cambió a partir de `desde_linea`: se descarta lo calculado desde su tramo"""
+        tramo = (desde_linea - 1) // LINEAS_CHECKPOINT
+        self._estados = {k: v for k, v in self._estados.items() if k <= tramo}
+        self._resaltados = {k for k in self._resaltados if k < tramo}
+        inicio = f"{tramo * LINEAS_CHECKPOINT + 1}.0"
+        for etiqueta in COLORES_SINTAXIS:
+            self.texto.tag_remove(etiqueta, inicio, "end")
+        self._visible = None
+
+    def _vigilar(self):
+        # Un sondeo liviano de la posición visible: cubre scroll, resize y texto nuevo
+        if not self.texto.winfo_exists():
+            return
+        visible = (self.texto.index("@0,0"), self.texto.index(f"@0,{self.texto.winfo_height()}"))
+        if visible != self._visible and self._tanda is None:
+            self._visible = visible
+            self._tanda = self.texto.after_idle(self._trabajar)
+        self.texto.after(120, self._vigilar)
+
+    def _trabajar(self):
+        self._tanda = None
+        if not self.texto.winfo_exists() or not self._visible:
+            return
+        limite = time.perf_counter() + PRESUPUESTO_RESALTADO
+        primera = int(self._visible[0].split('.')[0])
+        ultima = int(self._visible[1].split('.')[0])
+        total = int(self.texto.index("end-1c").split('.')[0])
+        desde = max(0, primera - 1 - MARGEN_RESALTADO) // LINEAS_CHECKPOINT
+        hasta = min(total - 1, ultima - 1 + MARGEN_RESALTADO) // LINEAS_CHECKPOINT
+        
+        for tramo in range(desde, hasta + 1):
+            if tramo in self._resaltados:
+                continue
+            # Llegar al tramo desde el último estado conocido, sin pintar los intermedios
+            conocido = max(k for k in self._estados if k <= tramo)
+            while conocido < tramo:
+                self._procesar(conocido, pintar=False)
+                conocido += 1
+                if time.perf_counter() > limite:
+                    self._tanda = self.texto.after(1, self._trabajar)
+                    return
+            self._procesar(tramo, pintar=True)
+            if time.perf_counter() > limite:
+                self._tanda = self.texto.after(1, self._trabajar)
+                return
 
+    def _procesar(self, tramo, pintar):
+        primera = tramo * LINEAS_CHECKPOINT + 1
+        ultima = primera + LINEAS_CHECKPOINT - 1
+        lineas = self.texto.get(f"{primera}.0", f"{ultima}.end").split('\n')
+        estado = self._estados[tramo]
+        desplazamiento = self.columna_inicio
+        for numero, linea in enumerate(lineas, primera):
+            if self.separador and not linea[:desplazamiento].endswith(self.separador):
+                continue
+            tokens, estado = _tokenizar_linea(self.lenguaje, linea[desplazamiento:], estado)
+            if pintar:
+                for inicio, fin, etiqueta in tokens:
+                    self.texto.tag_add(etiqueta, f"{numero}.{inicio + desplazamiento}", 
+                                       f"{numero}.{fin + desplazamiento}")
+        self._estados[tramo + 1] = estado
+        if pintar:
+            self._resaltados.add(tramo)
 
 
 #-----------------------------------
@@ -1080,8 +399,49 @@ class AetheryonDevCoreApp:
         self.rama_actual_var = ctk.StringVar(value="🌿 Rama: Sin repo")
         self.lista_archivos = []
         self.archivos_ignorados_count = 0
+        # Toda operación de git en segundo plano pasa por acá; los callbacks vuelven al hilo de Tk
+        self.trabajos = PlanificadorTrabajos(despachar=lambda funcion: self.root.after(0, funcion))
+        self.arranque = {}
+        self.sesion = SesionPersistida()
+        # Ruta cuya lista en pantalla viene de la sesión guardada y se está reescaneando
+        self.restaurando = None
+        MARCAS_ARRANQUE.append(("ventana", time.perf_counter()))
 
         self.setup_ui()
+        # Panel oculto: no tiene botón, solo el atajo
+        self.root.bind("<Control-Shift-P>", lambda evento: self.ver_rendimiento())
+        self.root.bind("<Control-Shift-p>", lambda evento: self.ver_rendimiento())
+        MARCAS_ARRANQUE.append(("setup_ui", time.perf_counter()))
+        
+        # El último proyecto se muestra como quedó, ya en el primer pintado
+        recientes = self.sesion.recientes()
+        if recientes:
+            self._mostrar_instantanea(recientes[0])
+        MARCAS_ARRANQUE.append(("sesión guardada", time.perf_counter()))
+        # Los redibujados de Tk son tareas idle encoladas antes: esto corre con la ventana ya pintada
+        self.root.after_idle(self._informar_arranque)
+
+    def _informar_arranque(self):
+        """Desglose del arranque en ms por fase (también en el panel de rendimiento)"""
+        MARCAS_ARRANQUE.append(("primer pintado", time.perf_counter()))
+        anterior = MARCAS_ARRANQUE[0][1]
+        for fase, marca in MARCAS_ARRANQUE[1:]:
+            self.arranque[fase] = (marca - anterior) * 1000
+            METRICAS.registrar(f"arranque.{fase}", marca - anterior)
+            anterior = marca
+        self.arranque["total"] = (anterior - MARCAS_ARRANQUE[0][1]) * 1000
+        print("⏱️ Arranque: " + " · ".join(f"{fase} {ms:.0f} ms" for fase, ms in self.arranque.items()))
+
+        if self.restaurando:
+            self._reconciliar_sesion(self.restaurando)
+
+        # asyncio (push, pull, fetch, log...) se importa fuera del hilo de Tk, ya con la ventana en pantalla
+        self.trabajos.enviar(self._preparar_bucle_asincrono, prioridad=PRIORIDAD_FONDO,
+                             descripcion="importar asyncio")
+
+    def _preparar_bucle_asincrono(self):
+        from aetheryon_async import bucle_asincrono
+        bucle_asincrono(despachar=lambda funcion: self.root.after(0, funcion))
 
     def setup_ui(self):
         main_frame = ctk.CTkFrame(self.root)
@@ -1102,6 +462,10 @@ class AetheryonDevCoreApp:
                      width=100, fg_color="#007ACC").grid(row=0, column=3, padx=3, pady=5)
         ctk.CTkButton(frame_proyecto, text="🔁 Refrescar", command=self.ver_archivos, 
                      width=100, fg_color="#00897B").grid(row=0, column=4, padx=3, pady=5)
+        ctk.CTkButton(frame_proyecto, text="💻 Terminal", command=self.abrir_terminal_en_rama, 
+                     width=100, fg_color="#424242").grid(row=0, column=5, padx=3, pady=5)
+        ctk.CTkButton(frame_proyecto, text="🕘 Recientes", command=self.ver_recientes, 
+                     width=100, fg_color="#5D4037").grid(row=0, column=6, padx=3, pady=5)
         
 
 
@@ -1139,22 +503,45 @@ class AetheryonDevCoreApp:
                     fg_color="#E65100", width=160, height=30,
                     font=("Arial", 10)).pack(side="left", padx=10)
 
+        ctk.CTkButton(frame_rama, text="🌳 Comparar Ramas", 
+                    command=self.comparar_ramas_completo,
+                    fg_color="#1565C0", width=140, height=30,
+                    font=("Arial", 10)).pack(side="left", padx=10)
+
         # SECCIÓN 4: ARCHIVOS
         frame_archivos = ctk.CTkFrame(main_frame)
         frame_archivos.pack(fill="both", expand=True, padx=5, pady=5)
         
-        ctk.CTkLabel(frame_archivos, text="📂 ARCHIVOS DEL PROYECTO", 
-                    font=("Arial", 14, "bold")).pack(pady=5)
+        self.label_archivos = ctk.CTkLabel(frame_archivos, text="📂 ARCHIVOS DEL PROYECTO", 
+                                           font=("Arial", 14, "bold"))
+        self.label_archivos.pack(pady=5)
+        self._color_label_archivos = self.label_archivos.cget("text_color")
         
         self.scrollable_frame = ctk.CTkScrollableFrame(frame_archivos, width=1000, height=280)
         self.scrollable_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
         # SECCIÓN 5: BOTONES ORGANIZADOS
-        tabview = ctk.CTkTabview(main_frame, height=120)
-        tabview.pack(fill="x", padx=5, pady=5)
-        
-        # TAB 1: Operaciones Básicas
-        tab_basico = tabview.add("⚡ Básico")
+        # Solo se arma la pestaña visible; las demás la primera vez que se abren
+        self.tabview = ctk.CTkTabview(main_frame, height=120, command=self._al_cambiar_pestaña)
+        self.tabview.pack(fill="x", padx=5, pady=5)
+        self._pestañas_pendientes = {
+            "⚡ Básico": self._construir_tab_basico,
+            "🌿 Ramas & Remotos": self._construir_tab_ramas,
+            "🔧 Avanzado": self._construir_tab_avanzado,
+            "📈 Estadísticas": self._construir_tab_estadisticas,
+            "🌐 GitHub": self._construir_tab_github,
+        }
+        for nombre in self._pestañas_pendientes:
+            self.tabview.add(nombre)
+        self._al_cambiar_pestaña()
+
+    def _al_cambiar_pestaña(self):
+        nombre = self.tabview.get()
+        construir = self._pestañas_pendientes.pop(nombre, None)
+        if construir:
+            construir(self.tabview.tab(nombre))
+
+    def _construir_tab_basico(self, tab_basico):
         frame_basico = ctk.CTkFrame(tab_basico, fg_color="transparent")
         frame_basico.pack(fill="x", padx=5, pady=5)
         
@@ -1168,10 +555,12 @@ class AetheryonDevCoreApp:
                      fg_color="#546E7A", width=120, height=35).grid(row=0, column=3, padx=3, pady=3)
         ctk.CTkButton(frame_basico, text="📜 Ver Log", command=self.ver_log, 
                      fg_color="#5D4037", width=120, height=35).grid(row=0, column=4, padx=3, pady=3)
+        ctk.CTkButton(frame_basico, text="↩️ Unstage", command=self.git_unstage, 
+                     fg_color="#8D6E63", width=120, height=35).grid(row=0, column=5, padx=3, pady=3)
+        ctk.CTkButton(frame_basico, text="🗑️ Descartar", command=self.descartar_cambios, 
+                     fg_color="#B71C1C", width=120, height=35).grid(row=0, column=6, padx=3, pady=3)
 
-
-        # TAB 2: Ramas y Remotos
-        tab_ramas = tabview.add("🌿 Ramas & Remotos")
+    def _construir_tab_ramas(self, tab_ramas):
         frame_ramas = ctk.CTkFrame(tab_ramas, fg_color="transparent")
         frame_ramas.pack(fill="x", padx=5, pady=5)
         
@@ -1187,10 +576,10 @@ class AetheryonDevCoreApp:
                      fg_color="#0277BD", width=110, height=35).grid(row=0, column=4, padx=3, pady=3)
         ctk.CTkButton(frame_ramas, text="🔀 Merge", command=self.merge_ramas, 
                      fg_color="#7B1FA2", width=110, height=35).grid(row=0, column=5, padx=3, pady=3)
+        ctk.CTkButton(frame_ramas, text="📦 Stashes", command=self.gestionar_stashes,
+                     fg_color="#FF6F00", width=110, height=35).grid(row=0, column=6, padx=3, pady=3)
 
-
-        # TAB 3: Historial y Avanzado
-        tab_avanzado = tabview.add("🔧 Avanzado")
+    def _construir_tab_avanzado(self, tab_avanzado):
         frame_avanzado = ctk.CTkFrame(tab_avanzado, fg_color="transparent")
         frame_avanzado.pack(fill="x", padx=5, pady=5)
         
@@ -1204,14 +593,21 @@ class AetheryonDevCoreApp:
                      fg_color="#E65100", width=140, height=35).grid(row=0, column=3, padx=3, pady=3)
         ctk.CTkButton(frame_avanzado, text="🚀 Crear Tag", command=self.crear_tag_version, 
                      fg_color="#BF360C", width=110, height=35).grid(row=0, column=4, padx=3, pady=3)
-        ctk.CTkButton(frame_ramas, text="🔀 Merge", command=self.merge_ramas, 
-                     fg_color="#7B1FA2", width=110, height=35).grid(row=0, column=5, padx=3, pady=3)
-        ctk.CTkButton(frame_ramas, text="📦 Stashes", command=self.gestionar_stashes,
-                     fg_color="#FF6F00", width=110, height=35).grid(row=0, column=6, padx=3, pady=3)
+        ctk.CTkButton(frame_avanzado, text="🔎 Buscar en Historial", command=self.buscar_en_historial, 
+                     fg_color="#00695C", width=160, height=35).grid(row=0, column=5, padx=3, pady=3)
+        ctk.CTkButton(frame_avanzado, text="🌳 Grafo", command=self.ver_grafo_commits, 
+                     fg_color="#1565C0", width=100, height=35).grid(row=0, column=6, padx=3, pady=3)
+        ctk.CTkButton(frame_avanzado, text="🔍 Blame", command=self.ver_blame_archivo, 
+                     fg_color="#4527A0", width=100, height=35).grid(row=0, column=7, padx=3, pady=3)
 
+    def _construir_tab_estadisticas(self, tab_estadisticas):
+        frame_estadisticas = ctk.CTkFrame(tab_estadisticas, fg_color="transparent")
+        frame_estadisticas.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkButton(frame_estadisticas, text="📈 Churn y Autoría", command=self.ver_estadisticas, 
+                     fg_color="#00838F", width=160, height=35).grid(row=0, column=0, padx=3, pady=3)
 
-        # TAB 4: GitHub
-        tab_github = tabview.add("🌐 GitHub")
+    def _construir_tab_github(self, tab_github):
         frame_github = ctk.CTkFrame(tab_github, fg_color="transparent")
         frame_github.pack(expand=True)
         
@@ -1227,15 +623,25 @@ class AetheryonDevCoreApp:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        ramas_info = self.proyecto.listar_ramas()
+        proyecto = self.proyecto
+        
+        def leer_ramas():
+            return proyecto.listar_ramas(), proyecto.get_rama_actual()
+        
+        self.trabajos.enviar(leer_ramas, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=self._elegir_rama_divergencias, descripcion="listar ramas")
+
+    def _elegir_rama_divergencias(self, resultado):
+        if isinstance(resultado, str):
+            messagebox.showerror("Error", f"Error al listar ramas:\n{resultado}")
+            return
+        ramas_info, rama_actual = resultado
         ramas = ramas_info.get('locales', [])
         
         if len(ramas) < 2:
             messagebox.showinfo("Pocas ramas", "Necesitás al menos 2 ramas para analizar divergencias.")
             return
         
-        rama_actual = self.proyecto.get_rama_actual()
-        
         # Seleccionar rama para comparar
         dialog = CTkChoiceDialog(
             parent=self.root,
@@ -1251,16 +657,21 @@ class AetheryonDevCoreApp:
         
         print(f"🔍 Analizando divergencias: {rama_actual} vs {rama_comparar}")
         
-        divergencias = self.proyecto.detectar_divergencia_ramas(rama_actual, rama_comparar)
+        def mostrar(divergencias):
+            if divergencias is None or isinstance(divergencias, str):
+                messagebox.showerror("Error", f"No se pudieron analizar las divergencias:\n{divergencias or 'detalle en la consola'}")
+            elif divergencias:
+                self._mostrar_analisis_divergencias(rama_actual, rama_comparar, divergencias)
+            else:
+                messagebox.showinfo("Sin divergencias", 
+                    f"✅ No se encontraron divergencias entre:\n\n"
+                    f"• {rama_actual}\n"
+                    f"• {rama_comparar}\n\n"
+                    "Las ramas están sincronizadas.")
         
-        if divergencias:
-            self._mostrar_analisis_divergencias(rama_actual, rama_comparar, divergencias)
-        else:
-            messagebox.showinfo("Sin divergencias", 
-                f"✅ No se encontraron divergencias entre:\n\n"
-                f"• {rama_actual}\n"
-                f"• {rama_comparar}\n\n"
-                "Las ramas están sincronizadas.")
+        self.trabajos.enviar(self.proyecto.detectar_divergencia_ramas, rama_actual, rama_comparar,
+                             prioridad=PRIORIDAD_INTERACTIVA, al_terminar=mostrar,
+                             descripcion=f"divergencias {rama_actual}..{rama_comparar}")
 
 
 
@@ -1268,11 +679,109 @@ class AetheryonDevCoreApp:
         ruta = filedialog.askdirectory()
         if ruta:
             self.path_var.set(ruta)
+            if self.proyecto:
+                self.proyecto.cerrar()
             self.proyecto = Proyecto(ruta)
             self.actualizar_rama_display()
             print(f"📁 Proyecto seleccionado: {ruta}")
             self.ver_archivos()
 
+    def ver_recientes(self):
+        recientes = self.sesion.recientes()
+        if not recientes:
+            messagebox.showinfo("Sin recientes", "Todavía no se abrió ningún proyecto.")
+            return
+        dialog = CTkChoiceDialog(parent=self.root, title="🕘 Proyectos recientes",
+                                 prompt="Abrir proyecto:", choices=recientes)
+        ruta = dialog.result
+        if not ruta:
+            return
+        if self.proyecto:
+            self.proyecto.cerrar()
+            self.proyecto = None
+        if self._mostrar_instantanea(ruta):
+            self._reconciliar_sesion(ruta)
+        else:
+            self.path_var.set(ruta)
+            self.proyecto = Proyecto(ruta)
+            self.actualizar_rama_display()
+            self.ver_archivos()
+
+    def _mostrar_instantanea(self, ruta):
+        """Pinta la última rama y lista de archivos guardadas, marcadas como desactualizadas"""
+        instantanea = self.sesion.instantanea(ruta)
+        if not instantanea:
+            return False
+        self.restaurando = ruta
+        self.path_var.set(ruta)
+        self.lista_archivos[:] = [tuple(par) for par in instantanea['archivos']]
+        self.archivos_ignorados_count = instantanea['ignorados']
+        self.archivos_data.clear()
+        
+        guardado = datetime.fromtimestamp(instantanea['guardado']).strftime('%Y-%m-%d %H:%M')
+        self.rama_actual_var.set(f"🌿 Rama: {instantanea['rama']} (⏳ guardada)")
+        self.label_archivos.configure(text=f"📂 ARCHIVOS DEL PROYECTO  ·  ⏳ estado del {guardado}, actualizando...",
+                                      text_color="#FFA500")
+        print(f"🕘 Mostrando el estado guardado de {ruta} ({guardado})")
+        self.actualizar_lista_archivos()
+        return True
+
+    def _reconciliar_sesion(self, ruta):
+        """Abre y reescanea el proyecto en segundo plano; al terminar reemplaza lo guardado"""
+        inicio = time.perf_counter()
+        
+        def abrir_y_escanear():
+            proyecto = Proyecto(ruta)
+            if not proyecto.repo:
+                return proyecto, None, None
+            return proyecto, proyecto.get_rama_actual(), proyecto.escanear_archivos()
+        
+        self.trabajos.enviar(abrir_y_escanear, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=lambda resultado: self._aplicar_reconciliacion(ruta, resultado, inicio),
+                             descripcion=f"reescanear {ruta}")
+
+    def _aplicar_reconciliacion(self, ruta, resultado, inicio):
+        if isinstance(resultado, str):
+            print(f"❌ No se pudo actualizar {ruta}: {resultado}")
+            self.label_archivos.configure(text="📂 ARCHIVOS DEL PROYECTO  ·  ⚠️ estado guardado, no se pudo actualizar")
+            return
+        proyecto, rama, escaneo = resultado
+        if self.restaurando != ruta or self.proyecto is not None:
+            # Mientras tanto se abrió otro proyecto
+            proyecto.cerrar()
+            return
+        
+        self.restaurando = None
+        self.proyecto = proyecto
+        self.label_archivos.configure(text="📂 ARCHIVOS DEL PROYECTO", text_color=self._color_label_archivos)
+        self.actualizar_rama_display()
+        if escaneo is None:
+            print(f"⚠️ {ruta} ya no es un repositorio Git")
+            self.sesion.olvidar(ruta)
+            self.lista_archivos.clear()
+            self.archivos_data.clear()
+            self.actualizar_lista_archivos()
+            return
+        
+        # Solo se vuelve a dibujar si algo cambió, conservando lo que ya estaba tildado
+        if escaneo['archivos'] != self.lista_archivos or escaneo['ignorados'] != self.archivos_ignorados_count:
+            seleccionados = {archivo for archivo, var in self.archivos_data.items() if var.get()}
+            self.lista_archivos[:] = escaneo['archivos']
+            self.archivos_ignorados_count = escaneo['ignorados']
+            self.archivos_data.clear()
+            self.actualizar_lista_archivos()
+            for archivo in seleccionados & self.archivos_data.keys():
+                self.archivos_data[archivo].set(True)
+        
+        segundos = time.perf_counter() - inicio
+        METRICAS.registrar("ui.reconciliar_sesion", segundos)
+        print(f"🔄 Estado de {ruta} actualizado en {segundos * 1000:.0f} ms")
+        self._guardar_sesion(rama, escaneo)
+
+    def _guardar_sesion(self, rama, escaneo):
+        self.trabajos.enviar(self.sesion.guardar_instantanea, self.proyecto.path, rama, escaneo,
+                             prioridad=PRIORIDAD_FONDO, descripcion="guardar sesión")
+
     def actualizar_rama_display(self):
         if self.proyecto:
             rama = self.proyecto.get_rama_actual()
@@ -1295,6 +804,8 @@ class AetheryonDevCoreApp:
                 "Este directorio no tiene un repositorio Git.\n"
                 "¿Querés inicializar uno antes de abrir VS Code?")
             if respuesta:
+                if self.proyecto:
+                    self.proyecto.cerrar()
                 self.proyecto = Proyecto(path)
                 self.proyecto.iniciar_git()
                 self.actualizar_rama_display()
@@ -1370,9 +881,21 @@ class AetheryonDevCoreApp:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        rama_actual = self.proyecto.get_rama_actual()
-        git_estado = self.proyecto.estado_archivos()
+        proyecto = self.proyecto
         
+        def leer_info():
+            return proyecto.get_rama_actual(), proyecto.estado_archivos(), proyecto.get_commits_detallados(5)
+        
+        def mostrar(resultado):
+            if isinstance(resultado, str):
+                messagebox.showerror("Error", f"Error al leer el estado de la rama:\n{resultado}")
+                return
+            self._mostrar_info_rama(*resultado)
+        
+        self.trabajos.enviar(leer_info, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar, descripcion="info de rama")
+
+    def _mostrar_info_rama(self, rama_actual, git_estado, commits):
         ventana_info = ctk.CTkToplevel(self.root)
         ventana_info.title(f"🌿 Información de Rama: {rama_actual}")
         ventana_info.geometry("700x550")
@@ -1415,7 +938,6 @@ class AetheryonDevCoreApp:
         
         # Últimos commits
         try:
-            commits = self.proyecto.get_commits_detallados(5)
             if commits:
                 ctk.CTkLabel(ventana_info, text="📜 Últimos 5 commits en esta rama:", 
                             font=("Arial", 12, "bold")).pack(pady=10)
@@ -1423,18 +945,18 @@ class AetheryonDevCoreApp:
                 scroll_commits = ctk.CTkScrollableFrame(ventana_info, width=650, height=180)
                 scroll_commits.pack(pady=5, padx=20)
                 
-                for commit in commits:
+                for commit, relativo in zip(commits, tiempos_relativos(commits)):
                     commit_frame = ctk.CTkFrame(scroll_commits, fg_color="#1E1E1E")
                     commit_frame.pack(fill="x", pady=2)
                     
-                    ctk.CTkLabel(commit_frame, text=commit['hash'], 
+                    ctk.CTkLabel(commit_frame, text=commit.hash, 
                                 font=("Courier", 9), width=80).pack(side="left", padx=5)
                     
-                    mensaje = commit['mensaje'][:50] + "..." if len(commit['mensaje']) > 50 else commit['mensaje']
+                    mensaje = commit.mensaje[:50] + "..." if len(commit.mensaje) > 50 else commit.mensaje
                     ctk.CTkLabel(commit_frame, text=mensaje, 
                                 font=("Arial", 9), width=350, anchor="w").pack(side="left", padx=5)
                     
-                    ctk.CTkLabel(commit_frame, text=commit['fecha_relativa'], 
+                    ctk.CTkLabel(commit_frame, text=relativo, 
                                 font=("Arial", 9), width=120, 
                                 text_color="#87CEEB").pack(side="left", padx=5)
         except Exception as e:
@@ -1477,11 +999,14 @@ class AetheryonDevCoreApp:
 
     def ver_archivos(self):
         if not self.proyecto:
+            if self.restaurando:
+                print("⏳ El proyecto ya se está actualizando")
+                return
             messagebox.showwarning("Sin proyecto", "Primero seleccioná un directorio de proyecto.")
             return
+        self.restaurando = None
+        self.label_archivos.configure(text="📂 ARCHIVOS DEL PROYECTO", text_color=self._color_label_archivos)
 
-        path = self.proyecto.path
-        
         if not self.proyecto.repo:
             respuesta = messagebox.askyesno("Sin Git", 
                 "Este directorio no tiene un repositorio Git. ¿Querés inicializar uno?")
@@ -1494,28 +1019,29 @@ class AetheryonDevCoreApp:
         print("📂 Escaneando archivos (ignorando dependencias)...")
         print("=" * 60)
         
-        git_estado = self.proyecto.estado_archivos()
+        proyecto = self.proyecto
+        
+        def escanear():
+            return proyecto.get_rama_actual(), proyecto.escanear_archivos()
+        
+        self.trabajos.enviar(escanear, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=lambda resultado: self._mostrar_escaneo(proyecto, resultado),
+                             descripcion="escanear archivos")
+
+    def _mostrar_escaneo(self, proyecto, resultado):
+        if self.proyecto is not proyecto:
+            # Mientras tanto se abrió otro proyecto
+            return
+        if isinstance(resultado, str):
+            messagebox.showerror("Error", f"Error al escanear archivos:\n{resultado}")
+            return
+        rama, escaneo = resultado
         
         self.lista_archivos.clear()
         self.archivos_data.clear()
-        self.archivos_ignorados_count = 0
-
-        archivos_encontrados = []
-        for root_dir, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if d not in CARPETAS_IGNORADAS]
-            
-            for file in files:
-                abs_path = os.path.join(root_dir, file)
-                rel_path = os.path.relpath(abs_path, path).replace('\\', '/')
-                
-                if self._archivo_en_carpeta_ignorada(rel_path):
-                    self.archivos_ignorados_count += 1
-                    continue
-                
-                archivos_encontrados.append(rel_path)
-
-        for rel_path in archivos_encontrados:
-            estado = self._determinar_estado_archivo(rel_path, git_estado)
+        self.archivos_ignorados_count = escaneo['ignorados']
+        
+        for rel_path, estado in escaneo['archivos']:
             self.lista_archivos.append((rel_path, estado))
             print(f"  → {rel_path:<50} [{estado}]")
 
@@ -1525,29 +1051,9 @@ class AetheryonDevCoreApp:
         print("=" * 60)
         
         self.actualizar_lista_archivos()
+        self._guardar_sesion(rama, escaneo)
 
-    def _archivo_en_carpeta_ignorada(self, ruta):
-        partes = ruta.split('/')
-        return any(carpeta in CARPETAS_IGNORADAS for carpeta in partes)
-
-    def _determinar_estado_archivo(self, rel_path, git_estado):
-        if rel_path in git_estado.get("untracked", []):
-            return "🆕 Untracked"
-        elif rel_path in git_estado.get("unstaged", []):
-            return "📝 Modificado"
-        elif rel_path in git_estado.get("staged", []):
-            return "✅ Staged"
-        else:
-            try:
-                if self.proyecto.repo and self.proyecto.repo.head.is_valid():
-                    commits = list(self.proyecto.repo.iter_commits(paths=rel_path, max_count=1))
-                    if commits:
-                        fecha = datetime.fromtimestamp(commits[0].committed_date).strftime('%Y-%m-%d %H:%M')
-                        return f"💾 Committed ({fecha})"
-                return "📄 Sin cambios"
-            except:
-                return "❓ Desconocido"
-
+    @medir("ui.actualizar_lista_archivos")
     def actualizar_lista_archivos(self):
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
@@ -1922,6 +1428,7 @@ class AetheryonDevCoreApp:
         ventana.wait_window()
         return resultado["accion"]
 
+    @medir("ui.gestionar_stashes")
     def gestionar_stashes(self):
         """
         Ventana para visualizar y gestionar stashes guardados
@@ -2161,8 +1668,14 @@ class AetheryonDevCoreApp:
             estado = estados_seleccionados.get(archivo, "")
             print(f"  → {archivo} [{estado}]")
         
-        resultado = self.proyecto.git_add(archivos_seleccionados)
-        if resultado == True:
+        self.trabajos.enviar(
+            self.proyecto.git_add, archivos_seleccionados, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._procesar_git_add(resultado, archivos_sin_cambios),
+            descripcion="add")
+
+    def _procesar_git_add(self, resultado, archivos_sin_cambios):
+        if not isinstance(resultado, str) and resultado['ok']:
+            archivos_seleccionados = resultado['ok']
             ventana_exito = ctk.CTkToplevel(self.root)
             ventana_exito.title("✅ Git Add Exitoso")
             ventana_exito.geometry("500x450")
@@ -2200,6 +1713,9 @@ class AetheryonDevCoreApp:
                                 font=("Courier", 8), anchor="w", 
                                 text_color="gray").pack(anchor="w", pady=1)
             
+            if resultado['fallidos']:
+                self._listar_rutas_fallidas(ventana_exito, resultado['fallidos'])
+            
             ctk.CTkLabel(ventana_exito, 
                         text="Los archivos ahora están en el staging area.\n¿Querés hacer commit ahora?", 
                         font=("Arial", 10)).pack(pady=10)
@@ -2222,14 +1738,93 @@ class AetheryonDevCoreApp:
             
             self.root.after(500, self.ver_archivos)
         else:
-            messagebox.showerror("Error Git Add", f"Error al añadir archivos:\n{resultado}")
+            messagebox.showerror("Error Git Add", f"Error al añadir archivos:\n{self._resumen_fallidos(resultado)}")
+
+    def _resumen_fallidos(self, resultado, maximo=8):
+        """Texto corto con las rutas que fallaron (o el error general si fue un str)"""
+        if isinstance(resultado, str):
+            return resultado
+        lineas = [f"• {ruta}: {mensaje.splitlines()[-1] if mensaje else ''}"
+                  for ruta, mensaje in list(resultado['fallidos'].items())[:maximo]]
+        if len(resultado['fallidos']) > maximo:
+            lineas.append(f"  ... y {len(resultado['fallidos']) - maximo} más")
+        return "\n".join(lineas)
+
+    def _listar_rutas_fallidas(self, ventana, fallidos):
+        ctk.CTkLabel(ventana, text=f"❌ {len(fallidos)} archivo(s) con error:", 
+                    font=("Arial", 9, "bold"), text_color="#FF6B6B").pack(pady=(10, 3))
+        scroll = ctk.CTkScrollableFrame(ventana, width=450, height=60)
+        scroll.pack(pady=3, padx=20)
+        for ruta, mensaje in fallidos.items():
+            ctk.CTkLabel(scroll, text=f"✗ {ruta}: {mensaje.splitlines()[-1] if mensaje else ''}", 
+                        font=("Courier", 8), anchor="w", 
+                        text_color="#FF6B6B").pack(anchor="w", pady=1)
+
+    def _rutas_seleccionadas(self):
+        return [archivo for archivo, var in self.archivos_data.items() if var.get()]
+
+    def git_unstage(self):
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        archivos = self._rutas_seleccionadas()
+        if not archivos:
+            messagebox.showinfo("Sin selección", "Seleccioná al menos un archivo para sacar del stage.")
+            return
+        
+        print(f"↩️ Sacando {len(archivos)} archivo(s) del stage...")
+        self.trabajos.enviar(
+            self.proyecto.git_unstage, archivos, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._informar_resultado_rutas("Unstage", "sacado(s) del stage", resultado),
+            descripcion="unstage")
+
+    def descartar_cambios(self):
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        archivos = self._rutas_seleccionadas()
+        if not archivos:
+            messagebox.showinfo("Sin selección", "Seleccioná al menos un archivo para descartar sus cambios.")
+            return
+        
+        if not messagebox.askyesno("Descartar cambios",
+            f"⚠️ Se van a perder los cambios sin stage de {len(archivos)} archivo(s):\n\n" +
+            "\n".join(f"  • {a}" for a in archivos[:5]) +
+            ("\n  ..." if len(archivos) > 5 else "") +
+            "\n\nEsta acción no se puede deshacer. ¿Continuar?"):
+            return
+        
+        print(f"🗑️ Descartando cambios de {len(archivos)} archivo(s)...")
+        self.trabajos.enviar(
+            self.proyecto.descartar_cambios, archivos, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._informar_resultado_rutas("Descartar cambios", "restaurado(s)", resultado),
+            descripcion="descartar cambios")
+
+    def _informar_resultado_rutas(self, titulo, accion, resultado):
+        if isinstance(resultado, str) or not resultado['ok']:
+            messagebox.showerror(f"Error {titulo}", f"❌ No se pudo aplicar:\n{self._resumen_fallidos(resultado)}")
+        elif resultado['fallidos']:
+            messagebox.showwarning(titulo,
+                f"✅ {len(resultado['ok'])} archivo(s) {accion}.\n\n"
+                f"❌ {len(resultado['fallidos'])} con error:\n{self._resumen_fallidos(resultado)}")
+        else:
+            messagebox.showinfo(titulo, f"✅ {len(resultado['ok'])} archivo(s) {accion}.")
+        self.ver_archivos()
 
     def git_commit(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        git_estado = self.proyecto.estado_archivos()
+        self.trabajos.enviar(self.proyecto.estado_archivos, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=self._mostrar_ventana_commit, descripcion="status para commit")
+
+    def _mostrar_ventana_commit(self, git_estado):
+        if isinstance(git_estado, str):
+            messagebox.showerror("Error", f"Error al leer el estado de los archivos:\n{git_estado}")
+            return
         archivos_staged = git_estado.get("staged", [])
         
         if not archivos_staged:
@@ -2311,11 +1906,20 @@ class AetheryonDevCoreApp:
                 "Procesando el commit..."
             )
             
-            def commit_thread():
-                resultado = self.proyecto.git_commit(mensaje)
-                self.root.after(0, lambda: self._procesar_commit(resultado, ventana_progreso, mensaje, archivos_staged))
+            proyecto = self.proyecto
             
-            threading.Thread(target=commit_thread, daemon=True).start()
+            def commitear():
+                # Devuelve el commit nuevo (ya en la cache) para mostrar su hash
+                resultado = proyecto.git_commit(mensaje)
+                if resultado != True:
+                    return resultado
+                commits = proyecto.get_commits_detallados(1)
+                return commits[0] if commits else True
+            
+            self.trabajos.enviar(
+                commitear, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                al_terminar=lambda resultado: self._procesar_commit(resultado, ventana_progreso, mensaje, archivos_staged),
+                descripcion="commit")
         
         ctk.CTkButton(button_frame, text="✅ Crear Commit", 
                      command=realizar_commit,
@@ -2330,7 +1934,7 @@ class AetheryonDevCoreApp:
     def _procesar_commit(self, resultado, ventana_progreso, mensaje, archivos_staged):
         ventana_progreso.destroy()
         
-        if resultado == True:
+        if not isinstance(resultado, str):
             ventana_exito = ctk.CTkToplevel(self.root)
             ventana_exito.title("✅ Commit Exitoso")
             ventana_exito.geometry("500x350")
@@ -2347,13 +1951,9 @@ class AetheryonDevCoreApp:
             ctk.CTkLabel(ventana_exito, text=f"📊 Archivos commiteados: {len(archivos_staged)}", 
                         font=("Arial", 10)).pack(pady=5)
             
-            try:
-                ultimo_commit = list(self.proyecto.repo.iter_commits(max_count=1))[0]
-                commit_hash = ultimo_commit.hexsha[:8]
-                ctk.CTkLabel(ventana_exito, text=f"🔹 Hash: {commit_hash}", 
+            if isinstance(resultado, RegistroCommit):
+                ctk.CTkLabel(ventana_exito, text=f"🔹 Hash: {resultado.hash}", 
                             font=("Courier", 10), text_color="#87CEEB").pack(pady=5)
-            except:
-                pass
             
             ctk.CTkLabel(ventana_exito, text="¿Querés hacer push al repositorio remoto?", 
                         font=("Arial", 10)).pack(pady=10)
@@ -2385,11 +1985,15 @@ class AetheryonDevCoreApp:
             return
             
         print("⬆️ Haciendo push...")
-        resultado = self.proyecto.push()
-        if resultado == True:
-            messagebox.showinfo("Push exitoso", "✅ Push realizado correctamente.")
-        else:
-            messagebox.showerror("Error Push", f"Error al hacer push:\n{resultado}")
+        
+        def terminar(resultado):
+            if resultado == True:
+                messagebox.showinfo("Push exitoso", "✅ Push realizado correctamente.")
+            else:
+                messagebox.showerror("Error Push", f"Error al hacer push:\n{resultado}")
+        
+        self.trabajos.enviar(self.proyecto.push, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=terminar, descripcion="push")
 
     def pull(self):
         if not self.proyecto or not self.proyecto.repo:
@@ -2397,51 +2001,61 @@ class AetheryonDevCoreApp:
             return
             
         print("⬇️ Haciendo pull...")
-        resultado = self.proyecto.pull()
-        if resultado == True:
-            messagebox.showinfo("Pull exitoso", "✅ Pull realizado correctamente.")
-            self.actualizar_rama_display()
-            self.ver_archivos()
-        else:
-            messagebox.showerror("Error Pull", f"Error al hacer pull:\n{resultado}")
+        
+        def terminar(resultado):
+            if resultado == True:
+                messagebox.showinfo("Pull exitoso", "✅ Pull realizado correctamente.")
+                self.actualizar_rama_display()
+                self.ver_archivos()
+            else:
+                messagebox.showerror("Error Pull", f"Error al hacer pull:\n{resultado}")
+        
+        self.trabajos.enviar(self.proyecto.pull, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=terminar, descripcion="pull")
 
     def ver_log(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
             
-        log = self.proyecto.get_git_log(10)
-        if isinstance(log, str) and not log.startswith("error"):
-            ventana_log = ctk.CTkToplevel(self.root)
-            ventana_log.title("📜 Log de Commits")
-            ventana_log.geometry("700x400")
-            ventana_log.attributes('-topmost', True)
-            
-            text_widget = ctk.CTkTextbox(ventana_log, font=("Courier", 10))
-            text_widget.pack(fill="both", expand=True, padx=10, pady=10)
-            text_widget.insert("1.0", log)
-            text_widget.configure(state="disabled")
-        else:
-            messagebox.showerror("Error", f"Error al obtener log:\n{log}")
+        def mostrar(log):
+            if isinstance(log, str) and not log.startswith("error"):
+                ventana_log = ctk.CTkToplevel(self.root)
+                ventana_log.title("📜 Log de Commits")
+                ventana_log.geometry("700x400")
+                ventana_log.attributes('-topmost', True)
+                
+                text_widget = ctk.CTkTextbox(ventana_log, font=("Courier", 10))
+                text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+                text_widget.insert("1.0", log)
+                text_widget.configure(state="disabled")
+            else:
+                messagebox.showerror("Error", f"Error al obtener log:\n{log}")
+        
+        self.trabajos.enviar(self.proyecto.get_git_log, 10, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar, descripcion="log")
 
     def ver_status(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
             
-        status = self.proyecto.get_git_status()
-        if isinstance(status, str) and not status.startswith("error"):
-            ventana_status = ctk.CTkToplevel(self.root)
-            ventana_status.title("🔍 Status del Repositorio")
-            ventana_status.geometry("600x300")
-            ventana_status.attributes('-topmost', True)
-            
-            text_widget = ctk.CTkTextbox(ventana_status, font=("Courier", 9))
-            text_widget.pack(fill="both", expand=True, padx=10, pady=10)
-            text_widget.insert("1.0", status)
-            text_widget.configure(state="disabled")
-        else:
-            messagebox.showerror("Error", f"Error al obtener status:\n{status}")
+        def mostrar(status):
+            if isinstance(status, str) and not status.startswith("error"):
+                ventana_status = ctk.CTkToplevel(self.root)
+                ventana_status.title("🔍 Status del Repositorio")
+                ventana_status.geometry("600x300")
+                ventana_status.attributes('-topmost', True)
+                
+                text_widget = ctk.CTkTextbox(ventana_status, font=("Courier", 9))
+                text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+                text_widget.insert("1.0", status)
+                text_widget.configure(state="disabled")
+            else:
+                messagebox.showerror("Error", f"Error al obtener status:\n{status}")
+        
+        self.trabajos.enviar(self.proyecto.get_git_status, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar, descripcion="status")
 
     # ==================== RAMAS Y REMOTOS ====================
 
@@ -2460,20 +2074,38 @@ class AetheryonDevCoreApp:
         nombre = dialog.result
         if nombre:
             print(f"🧪 Creando rama: {nombre}")
-            resultado = self.proyecto.crear_rama(nombre)
-            if resultado == True:
-                self.actualizar_rama_display()
-                messagebox.showinfo("Rama creada", f"✅ Rama '{nombre}' creada y activa.")
-                self.ver_archivos()
-            else:
-                messagebox.showerror("Error", f"Error al crear rama:\n{resultado}")
+            
+            def terminar(resultado):
+                if resultado == True:
+                    self.actualizar_rama_display()
+                    messagebox.showinfo("Rama creada", f"✅ Rama '{nombre}' creada y activa.")
+                    self.ver_archivos()
+                else:
+                    messagebox.showerror("Error", f"Error al crear rama:\n{resultado}")
+            
+            self.trabajos.enviar(self.proyecto.crear_rama, nombre, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                                 al_terminar=terminar, descripcion=f"crear rama {nombre}")
 
     def cambiar_rama(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        ramas_info = self.proyecto.listar_ramas()
+        proyecto = self.proyecto
+        
+        def leer_ramas():
+            return proyecto.listar_ramas(), proyecto.get_rama_actual()
+        
+        def mostrar(resultado):
+            if isinstance(resultado, str):
+                messagebox.showerror("Error", f"Error al listar ramas:\n{resultado}")
+                return
+            self._mostrar_selector_ramas(*resultado)
+        
+        self.trabajos.enviar(leer_ramas, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar, descripcion="listar ramas")
+
+    def _mostrar_selector_ramas(self, ramas_info, rama_actual):
         ramas_locales = ramas_info.get('locales', [])
         
         if not ramas_locales:
@@ -2490,7 +2122,6 @@ class AetheryonDevCoreApp:
         ctk.CTkLabel(ventana_ramas, text="🔀 Seleccionar Rama", 
                     font=("Arial", 16, "bold")).pack(pady=15)
         
-        rama_actual = self.proyecto.get_rama_actual()
         ctk.CTkLabel(ventana_ramas, text=f"📍 Rama actual: {rama_actual}", 
                     font=("Arial", 12), text_color="#90EE90").pack(pady=5)
         
@@ -2555,31 +2186,43 @@ class AetheryonDevCoreApp:
 
     def _cambiar_rama_con_analisis(self, rama_destino):
         """Cambia de rama y analiza divergencias automáticamente"""
-        rama_origen = self.proyecto.get_rama_actual()
-        
-        print(f"🔀 Cambiando de {rama_origen} → {rama_destino}")
-        print(f"🔍 Analizando divergencias entre ramas...")
+        proyecto = self.proyecto
         
-        # Detectar divergencias ANTES de cambiar
-        divergencias = self.proyecto.detectar_divergencia_ramas(rama_origen, rama_destino)
-        
-        # Cambiar de rama
-        resultado = self.proyecto.cambiar_rama(rama_destino)
+        def cambiar():
+            rama_origen = proyecto.get_rama_actual()
+            print(f"🔀 Cambiando de {rama_origen} → {rama_destino}")
+            print("🔍 Analizando divergencias entre ramas...")
+            
+            # Detectar divergencias ANTES de cambiar
+            divergencias = proyecto.detectar_divergencia_ramas(rama_origen, rama_destino)
+            
+            # Cambiar de rama
+            return rama_origen, divergencias, proyecto.cambiar_rama(rama_destino)
         
-        if resultado == True:
-            self.actualizar_rama_display()
-            self.ver_archivos()
+        def terminar(resultado):
+            if isinstance(resultado, str):
+                messagebox.showerror("Error", f"Error al cambiar de rama:\n{resultado}")
+                return
+            rama_origen, divergencias, resultado = resultado
             
-            # Si hay divergencias, mostrar análisis
-            if divergencias:
-                self._mostrar_analisis_divergencias(rama_origen, rama_destino, divergencias)
+            if resultado == True:
+                self.actualizar_rama_display()
+                self.ver_archivos()
+                
+                # Si hay divergencias, mostrar análisis
+                if divergencias:
+                    self._mostrar_analisis_divergencias(rama_origen, rama_destino, divergencias)
+                else:
+                    messagebox.showinfo("Cambio exitoso", 
+                        f"✅ Cambiado a la rama '{rama_destino}'.\n\n"
+                        "✨ No se detectaron divergencias entre ramas.")
             else:
-                messagebox.showinfo("Cambio exitoso", 
-                    f"✅ Cambiado a la rama '{rama_destino}'.\n\n"
-                    "✨ No se detectaron divergencias entre ramas.")
-        else:
-            messagebox.showerror("Error", f"Error al cambiar de rama:\n{resultado}")
+                messagebox.showerror("Error", f"Error al cambiar de rama:\n{resultado}")
+        
+        self.trabajos.enviar(cambiar, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=terminar, descripcion=f"checkout {rama_destino}")
 
+    @medir("ui._mostrar_analisis_divergencias")
     def _mostrar_analisis_divergencias(self, rama_origen, rama_destino, divergencias):
         """Muestra ventana con análisis detallado de divergencias"""
         ventana_div = ctk.CTkToplevel(self.root)
@@ -2707,12 +2350,20 @@ class AetheryonDevCoreApp:
                     command=lambda: [ventana_div.destroy(), self.ver_commits_detallados()],
                     fg_color="#00897B", width=180, height=40).pack(side="left", padx=5)
         
+        ctk.CTkButton(button_frame, text="🌳 Comparar Árboles", 
+                    command=lambda: self.comparar_ramas_completo(rama_origen, rama_destino),
+                    fg_color="#1565C0", width=160, height=40).pack(side="left", padx=5)
+        
         ctk.CTkButton(button_frame, text="✅ Continuar Sin Merge", 
                     command=ventana_div.destroy,
                     fg_color="gray", width=180, height=40).pack(side="left", padx=5)
 
-    def _comparar_archivo_entre_ramas(self, archivo, rama1, rama2, info):
-        """Muestra comparación de un archivo entre dos ramas"""
+    @medir("ui._comparar_archivo_entre_ramas")
+    def _comparar_archivo_entre_ramas(self, archivo, rama1, rama2, info, ruta_anterior=None):
+        """
+        Diff lado a lado de un archivo entre dos ramas, con las regiones sin cambios
+        plegadas. `ruta_anterior` es el nombre en rama1 si el archivo se renombró.
+        """
         ventana_comp = ctk.CTkToplevel(self.root)
         ventana_comp.title(f"🔍 Comparar: {archivo}")
         ventana_comp.geometry("1100x700")
@@ -2735,51 +2386,532 @@ class AetheryonDevCoreApp:
         ctk.CTkLabel(info_frame, text=info_text, 
                     font=("Arial", 10), justify="left").pack(pady=8, padx=10)
         
-        # Contenido de ambas versiones
+        # Algoritmo y navegador de hunks
+        frame_opciones = ctk.CTkFrame(ventana_comp, fg_color="transparent")
+        frame_opciones.pack(fill="x", padx=20)
+        
+        ctk.CTkLabel(frame_opciones, text="Algoritmo:", font=("Arial", 10)).pack(side="left", padx=5)
+        selector_algoritmo = ctk.CTkOptionMenu(frame_opciones, values=list(ALGORITMOS_DIFF),
+                                               command=lambda _: calcular(), width=120)
+        selector_algoritmo.pack(side="left", padx=5)
+        label_estado = ctk.CTkLabel(frame_opciones, text="⏳ Calculando diff...", font=("Arial", 10))
+        label_estado.pack(side="left", padx=10)
+        
+        ctk.CTkButton(frame_opciones, text="⬇️ Siguiente", width=100, 
+                     command=lambda: ir_a_hunk(1)).pack(side="right", padx=5)
+        label_hunk = ctk.CTkLabel(frame_opciones, text="", font=("Arial", 10), width=90)
+        label_hunk.pack(side="right")
+        ctk.CTkButton(frame_opciones, text="⬆️ Anterior", width=100, 
+                     command=lambda: ir_a_hunk(-1)).pack(side="right", padx=5)
+        
+        # Las dos versiones comparten la barra vertical y siempre tienen las mismas
+        # líneas: los huecos de un lado se rellenan para que los cambios queden alineados
         contenido_frame = ctk.CTkFrame(ventana_comp)
         contenido_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
-        # Rama 1
-        frame_rama1 = ctk.CTkFrame(contenido_frame)
-        frame_rama1.pack(side="left", fill="both", expand=True, padx=5)
+        textos = []
+        
+        def desplazar(*args):
+            for texto in textos:
+                texto.yview(*args)
+        
+        def al_desplazar(origen, primero, ultimo):
+            barra.set(primero, ultimo)
+            for texto in textos:
+                if texto is not origen:
+                    texto.yview("moveto", primero)
+        
+        barra = ctk.CTkScrollbar(contenido_frame, command=desplazar)
+        barra.pack(side="right", fill="y")
+        
+        for rama, ruta in ((rama1, ruta_anterior or archivo), (rama2, archivo)):
+            frame_rama = ctk.CTkFrame(contenido_frame)
+            frame_rama.pack(side="left", fill="both", expand=True, padx=5)
+            
+            frame_titulo = ctk.CTkFrame(frame_rama, fg_color="transparent")
+            frame_titulo.pack(fill="x", pady=5)
+            ctk.CTkLabel(frame_titulo, text=f"📄 Versión en {rama}", 
+                        font=("Arial", 11, "bold")).pack(side="left", padx=5)
+            ctk.CTkButton(frame_titulo, text="👁️ Ver completo", width=110, height=24, fg_color="#00897B",
+                         command=lambda r=rama, a=ruta: self._ver_contenido_archivo(a, r)).pack(side="right", padx=5)
+            
+            texto = ctk.CTkTextbox(frame_rama, font=("Courier", 9), wrap="none", activate_scrollbars=False)
+            barra_horizontal = ctk.CTkScrollbar(frame_rama, orientation="horizontal", command=texto.xview)
+            barra_horizontal.pack(side="bottom", fill="x")
+            texto.pack(fill="both", expand=True)
+            texto.configure(xscrollcommand=barra_horizontal.set,
+                            yscrollcommand=lambda primero, ultimo, t=texto: al_desplazar(t, primero, ultimo))
+            texto.tag_config("eliminada", background="#4A1F1F")
+            texto.tag_config("agregada", background="#1F4A2A")
+            texto.tag_config("relleno", background="#262626")
+            texto.tag_config("encabezado", foreground="#87CEEB", background="#1E3A5F")
+            texto.tag_config("plegado", foreground="gray")
+            textos.append(texto)
+        
+        ANCHO_NUMERO = 6
+        estado = {"total_hunks": 0, "actual": -1, "regiones": {}, "lineas_izq": None}
+        
+        # El código empieza después de "   123 │ "
+        lenguaje = lenguaje_de_archivo(archivo)
+        resaltadores = [ResaltadorSintaxis(texto, lenguaje, ANCHO_NUMERO + 3, "│ ") for texto in textos] if lenguaje else []
+        
+        def formatear(numero, contenido):
+            if numero is None:
+                return " " * ANCHO_NUMERO + " │"
+            return f"{numero:>{ANCHO_NUMERO}} │ {contenido}"
+        
+        def cargar_textos(contenidos, marcas):
+            """Carga ambos lados de una vez y aplica las etiquetas por tramos de líneas iguales"""
+            for texto, lineas, marcas_lado in zip(textos, contenidos, marcas):
+                texto.configure(state="normal")
+                texto.delete("1.0", "end")
+                texto.insert("1.0", "\n".join(lineas))
+                inicio = anterior = etiquetas = None
+                for linea, etiquetas_linea in marcas_lado + [(None, None)]:
+                    if etiquetas and etiquetas_linea == etiquetas and linea == anterior + 1:
+                        anterior = linea
+                        continue
+                    if etiquetas:
+                        for etiqueta in etiquetas:
+                            texto.tag_add(etiqueta, f"{inicio}.0", f"{anterior}.end +1c")
+                    inicio = anterior = linea
+                    etiquetas = etiquetas_linea
+                texto.configure(state="disabled")
+            for resaltador in resaltadores:
+                resaltador.invalidar()
+        
+        def mostrar(algoritmo, resultado):
+            if not ventana_comp.winfo_exists() or selector_algoritmo.get() != algoritmo:
+                return
+            if isinstance(resultado, str):
+                label_estado.configure(text=f"❌ Error: {resultado[:150]}", text_color="#FF6B6B")
+                return
+            if resultado['binario']:
+                label_estado.configure(text="📦 Archivo binario: no se puede comparar línea a línea",
+                                       text_color="orange")
+                cargar_textos((["[Archivo binario]"], ["[Archivo binario]"]), ([], []))
+                return
+            
+            hunks = resultado['hunks']
+            contenidos = ([], [])
+            marcas = ([], [])
+            estado["regiones"] = {}
+            
+            def agregar(texto_izq, texto_der, etiquetas_izq=None, etiquetas_der=None):
+                for lado, contenido, etiquetas in ((0, texto_izq, etiquetas_izq), (1, texto_der, etiquetas_der)):
+                    contenidos[lado].append(contenido)
+                    if etiquetas:
+                        marcas[lado].append((len(contenidos[lado]), etiquetas))
+            
+            def plegar(desde_izq, hasta_izq, desde_der):
+                # hasta_izq None: hasta el final del archivo
+                region = f"region{len(estado['regiones'])}"
+                estado["regiones"][region] = (desde_izq, hasta_izq, desde_der)
+                cantidad = f"{hasta_izq - desde_izq + 1} líneas" if hasta_izq else "Resto del archivo"
+                linea = f"{'':>{ANCHO_NUMERO}} ⋯ {cantidad} sin cambios (click para expandir) ⋯"
+                agregar(linea, linea, ("plegado", region), ("plegado", region))
+            
+            siguiente_izq = siguiente_der = 1
+            agregadas = eliminadas = 0
+            for indice, (a, b, c, d, encabezado, filas) in enumerate(hunks):
+                primera_izq = a if b else a + 1
+                if primera_izq > siguiente_izq:
+                    plegar(siguiente_izq, primera_izq - 1, siguiente_der)
+                
+                cabecera = f"@@ -{a},{b} +{c},{d} @@ {encabezado}".rstrip()
+                agregar(cabecera, cabecera, ("encabezado", f"hunk{indice}"), ("encabezado", f"hunk{indice}"))
+                for num_izq, texto_izq, num_der, texto_der, tipo in filas:
+                    if tipo == 'igual':
+                        agregar(formatear(num_izq, texto_izq), formatear(num_der, texto_der))
+                        continue
+                    eliminadas += num_izq is not None
+                    agregadas += num_der is not None
+                    agregar(formatear(num_izq, texto_izq), formatear(num_der, texto_der),
+                            ("eliminada",) if num_izq is not None else ("relleno",),
+                            ("agregada",) if num_der is not None else ("relleno",))
+                siguiente_izq = a + b if b else a + 1
+                siguiente_der = c + d if d else c + 1
+            
+            if hunks and not resultado['nuevo'] and not resultado['eliminado']:
+                plegar(siguiente_izq, None, siguiente_der)
+            
+            cargar_textos(contenidos, marcas)
+            for region in estado["regiones"]:
+                for texto in textos:
+                    texto.tag_bind(region, "<Button-1>", lambda e, r=region: expandir(r))
+            
+            estado["total_hunks"] = len(hunks)
+            estado["actual"] = -1
+            if hunks:
+                label_estado.configure(text=f"✅ {len(hunks)} hunk(s) · +{agregadas} / −{eliminadas} líneas",
+                                       text_color="#90EE90")
+                ir_a_hunk(1)
+            else:
+                label_estado.configure(text="✅ Sin diferencias entre las ramas", text_color="#90EE90")
+                label_hunk.configure(text="")
+        
+        def expandir(region):
+            """Reemplaza la línea plegada por el contenido real, leído recién ahora"""
+            if region not in estado["regiones"]:
+                return
+            desde_izq, hasta_izq, desde_der = estado["regiones"].pop(region)
+            if estado["lineas_izq"] is None:
+                estado["lineas_izq"] = self.proyecto.get_lineas_archivo_en_rama(ruta_anterior or archivo, rama1) or []
+            origen = estado["lineas_izq"]
+            hasta = len(origen) if hasta_izq is None else min(hasta_izq, len(origen))
+            cantidad = max(0, hasta - desde_izq + 1)
+            bloques = (
+                "".join(formatear(desde_izq + k, origen[desde_izq - 1 + k]) + "\n" for k in range(cantidad)),
+                "".join(formatear(desde_der + k, origen[desde_izq - 1 + k]) + "\n" for k in range(cantidad)),
+            )
+            linea = None
+            for texto, bloque in zip(textos, bloques):
+                rango = texto.tag_ranges(region)
+                if not rango:
+                    continue
+                linea = int(str(rango[0]).split('.')[0])
+                texto.configure(state="normal")
+                texto.delete(f"{linea}.0", f"{linea}.end +1c")
+                texto.insert(f"{linea}.0", bloque)
+                texto.configure(state="disabled")
+            if linea:
+                for resaltador in resaltadores:
+                    resaltador.invalidar(linea)
+        
+        def ir_a_hunk(paso):
+            total = estado["total_hunks"]
+            if not total:
+                return
+            estado["actual"] = max(0, min(total - 1, estado["actual"] + paso))
+            label_hunk.configure(text=f"Hunk {estado['actual'] + 1}/{total}")
+            rango = textos[0].tag_ranges(f"hunk{estado['actual']}")
+            if rango:
+                linea = int(str(rango[0]).split('.')[0])
+                lineas = int(textos[0].index("end-1c").split('.')[0])
+                desplazar("moveto", max(0, linea - 4) / lineas)
+        
+        def calcular():
+            algoritmo = selector_algoritmo.get()
+            label_estado.configure(text="⏳ Calculando diff...", text_color="white")
+            
+            self.trabajos.enviar(self.proyecto.get_diff_lado_a_lado, archivo, rama1, rama2, algoritmo,
+                                 ruta_anterior=ruta_anterior, prioridad=PRIORIDAD_INTERACTIVA,
+                                 al_terminar=lambda resultado: mostrar(algoritmo, resultado),
+                                 descripcion=f"diff {archivo}")
+        
+        calcular()
+        
+        # Botones
+        button_frame = ctk.CTkFrame(ventana_comp)
+        button_frame.pack(pady=10)
+        
+        ctk.CTkButton(button_frame, text="❌ Cerrar", 
+                    command=ventana_comp.destroy,
+                    fg_color="gray", width=120).pack()
+
+    @medir("ui.comparar_ramas_completo")
+    def comparar_ramas_completo(self, rama1=None, rama2=None):
+        """
+        Todos los archivos que difieren entre dos ramas, con +/− por archivo. El diff
+        de cada archivo se carga al expandirlo y los siguientes se precargan en segundo plano.
+        """
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        rama1 = rama1 or self.proyecto.get_rama_actual()
+        if not rama2:
+            ramas_info = self.proyecto.listar_ramas()
+            opciones = [r for r in ramas_info['locales'] if r != rama1]
+            opciones += [f"origin/{r}" for r in ramas_info['remotas']]
+            if not opciones:
+                messagebox.showinfo("Pocas ramas", "No hay otras ramas para comparar.")
+                return
+            rama2 = CTkChoiceDialog(
+                parent=self.root,
+                title="🌳 Comparar Ramas",
+                prompt=f"Comparar {rama1} con:",
+                choices=opciones
+            ).result
+            if not rama2:
+                return
+        
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title(f"🌳 {rama1} ↔ {rama2}")
+        ventana.geometry("1100x750")
+        ventana.transient(self.root)
+        
+        ctk.CTkLabel(ventana, text=f"🌳 Comparación: {rama1} → {rama2}", 
+                    font=("Arial", 16, "bold")).pack(pady=10)
+        label_resumen = ctk.CTkLabel(ventana, text="⏳ Comparando árboles...", font=("Arial", 11))
+        label_resumen.pack(pady=3)
+        
+        scroll = ctk.CTkScrollableFrame(ventana, width=1050, height=550)
+        scroll.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        # El archivo que se expande va con prioridad interactiva; la precarga de los siguientes, de fondo
+        estado = {"archivos": [], "filas": [], "abiertos": {}, "trabajos": {}, "cerrada": False}
+        iconos = {'A': "🟢", 'M': "🟡", 'D': "🔴", 'R': "🔵", 'C': "🔵", 'T': "🟣"}
+        
+        def diff_de(indice, prioridad):
+            # Un solo cálculo por archivo aunque se pida al expandir y al precargar
+            trabajo = estado["trabajos"].get(indice)
+            if trabajo is None:
+                trabajo = self.trabajos.enviar(self.proyecto.precargar_diff, estado["archivos"][indice],
+                                               rama1, rama2, prioridad=prioridad,
+                                               descripcion=f"diff {estado['archivos'][indice]['ruta']}")
+                estado["trabajos"][indice] = trabajo
+            else:
+                self.trabajos.priorizar(trabajo, prioridad)
+            return trabajo
+        
+        def pintar_diff(indice, caja, resultado):
+            if estado["cerrada"] or estado["abiertos"].get(indice) is not caja:
+                return
+            
+            lineas, marcas = [], []
+            if isinstance(resultado, str):
+                lineas.append(f"❌ Error: {resultado}")
+            elif resultado['binario']:
+                lineas.append("📦 Archivo binario")
+            elif not resultado['hunks']:
+                lineas.append("Sin cambios de contenido (solo renombre o permisos)")
+            
+            def agregar(texto, etiqueta=None):
+                lineas.append(texto)
+                if etiqueta:
+                    marcas.append((len(lineas), etiqueta))
+            
+            for a, b, c, d, encabezado, filas in ([] if isinstance(resultado, str) else resultado['hunks']):
+                agregar(f"@@ -{a},{b} +{c},{d} @@ {encabezado}".rstrip(), "encabezado")
+                pendientes = []
+                # Cada bloque de cambios se muestra como en un diff unificado: primero lo eliminado
+                for fila in filas + [(None, None, None, None, 'igual')]:
+                    if fila[4] != 'igual':
+                        pendientes.append(fila)
+                        continue
+                    for num_izq, texto_izq, _, _, _ in pendientes:
+                        if num_izq is not None:
+                            agregar(f"-{texto_izq}", "eliminada")
+                    for _, _, num_der, texto_der, _ in pendientes:
+                        if num_der is not None:
+                            agregar(f"+{texto_der}", "agregada")
+                    pendientes.clear()
+                    if fila[0] is not None:
+                        agregar(f" {fila[1]}")
+                if len(lineas) > MAX_LINEAS_DIFF_EN_LINEA:
+                    break
+            if len(lineas) > MAX_LINEAS_DIFF_EN_LINEA:
+                del lineas[MAX_LINEAS_DIFF_EN_LINEA:]
+                marcas = [m for m in marcas if m[0] <= MAX_LINEAS_DIFF_EN_LINEA]
+                lineas.append("⋯ Diff recortado: usá 🔍 para verlo completo ⋯")
+            
+            caja.configure(state="normal", height=min(len(lineas), 25) * 15 + 12)
+            caja.delete("1.0", "end")
+            caja.insert("1.0", "\n".join(lineas))
+            for linea, etiqueta in marcas:
+                caja.tag_add(etiqueta, f"{linea}.0", f"{linea}.end +1c")
+            caja.configure(state="disabled")
+        
+        def alternar(indice):
+            fila, boton = estado["filas"][indice]
+            caja = estado["abiertos"].pop(indice, None)
+            if caja:
+                caja.destroy()
+                boton.configure(text="▸")
+                return
+            
+            boton.configure(text="▾")
+            caja = ctk.CTkTextbox(fila, font=("Courier", 9), wrap="none", height=40)
+            caja.pack(fill="x", padx=5, pady=(0, 5))
+            caja.tag_config("eliminada", background="#4A1F1F")
+            caja.tag_config("agregada", background="#1F4A2A")
+            caja.tag_config("encabezado", foreground="#87CEEB")
+            caja.insert("1.0", "⏳ Cargando diff...")
+            caja.configure(state="disabled")
+            estado["abiertos"][indice] = caja
+            
+            diff_de(indice, PRIORIDAD_INTERACTIVA).cuando_termine(
+                lambda resultado: pintar_diff(indice, caja, resultado))
+            # Los archivos que siguen en la lista suelen ser los próximos en abrirse
+            for vecino in range(indice + 1, min(indice + 1 + ARCHIVOS_PRECARGA, len(estado["archivos"]))):
+                diff_de(vecino, PRIORIDAD_FONDO)
+        
+        def abrir_lado_a_lado(entrada):
+            info = {
+                rama1: {'hash': (entrada['blob_antes'] or '')[:8], 'fecha': entrada['ruta_anterior'] or entrada['ruta']},
+                rama2: {'hash': (entrada['blob_despues'] or '')[:8], 'fecha': entrada['ruta']},
+            }
+            self._comparar_archivo_entre_ramas(entrada['ruta'], rama1, rama2, info,
+                                               ruta_anterior=entrada['ruta_anterior'])
+        
+        def mostrar_lista(resultado):
+            if estado["cerrada"] or not ventana.winfo_exists():
+                return
+            if isinstance(resultado, str):
+                label_resumen.configure(text=f"❌ Error: {resultado[:150]}", text_color="#FF6B6B")
+                return
+            
+            archivos = resultado['archivos']
+            estado["archivos"] = archivos
+            if not archivos:
+                label_resumen.configure(text="✅ Las dos ramas tienen el mismo contenido", text_color="#90EE90")
+                return
+            label_resumen.configure(
+                text=f"📂 {len(archivos)} archivo(s) · +{resultado['agregadas']} / −{resultado['eliminadas']} líneas",
+                text_color="white")
+            
+            for indice, entrada in enumerate(archivos[:MAX_ARCHIVOS_COMPARACION]):
+                fila = ctk.CTkFrame(scroll, fg_color="#1E1E1E")
+                fila.pack(fill="x", pady=1)
+                cabecera = ctk.CTkFrame(fila, fg_color="transparent")
+                cabecera.pack(fill="x")
+                
+                boton = ctk.CTkButton(cabecera, text="▸", width=28, height=24, fg_color="#37474F",
+                                      command=lambda i=indice: alternar(i))
+                boton.pack(side="left", padx=3, pady=2)
+                estado["filas"].append((fila, boton))
+                
+                ruta = entrada['ruta']
+                if entrada['ruta_anterior']:
+                    ruta = f"{entrada['ruta_anterior']} → {ruta}"
+                ctk.CTkLabel(cabecera, text=f"{iconos.get(entrada['estado'], '⚪')} {ruta}", 
+                            font=("Courier", 10), anchor="w", width=750).pack(side="left", padx=5)
+                if entrada['agregadas'] is not None:
+                    lineas = f"+{entrada['agregadas']} −{entrada['eliminadas']}"
+                else:
+                    lineas = "bin"
+                ctk.CTkLabel(cabecera, text=lineas, font=("Courier", 10), width=110,
+                            text_color="#90EE90").pack(side="left", padx=5)
+                ctk.CTkButton(cabecera, text="🔍", width=30, height=24, fg_color="#1E90FF",
+                             command=lambda e=entrada: abrir_lado_a_lado(e)).pack(side="left", padx=3)
+            
+            if len(archivos) > MAX_ARCHIVOS_COMPARACION:
+                ctk.CTkLabel(scroll, text=f"⋯ y {len(archivos) - MAX_ARCHIVOS_COMPARACION} archivo(s) más",
+                            font=("Arial", 10), text_color="gray").pack(pady=5)
+        
+        def cerrar():
+            estado["cerrada"] = True
+            for trabajo in estado["trabajos"].values():
+                trabajo.cancelar()
+            ventana.destroy()
+        
+        self.trabajos.enviar(self.proyecto.comparar_arboles_ramas, rama1, rama2, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar_lista, descripcion=f"comparar {rama1}..{rama2}")
+        
+        frame_btn = ctk.CTkFrame(ventana)
+        frame_btn.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_btn, text="❌ Cerrar", command=cerrar, 
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        ventana.protocol("WM_DELETE_WINDOW", cerrar)
+
+    def _ver_contenido_archivo(self, archivo, rama):
+        """
+        Contenido de un archivo en una rama. Antes de leerlo se consulta tamaño y
+        tipo: los binarios solo muestran el resumen y los archivos grandes piden
+        confirmación o se limitan a las primeras líneas. El texto se inserta por bloques.
+        """
+        info = self.proyecto.get_info_archivo_en_rama(archivo, rama)
+        if info is None:
+            messagebox.showinfo("Sin archivo", f"'{archivo}' no existe en '{rama}'.")
+            return
+        if isinstance(info, str):
+            messagebox.showerror("Error", f"No se pudo leer el archivo:\n{info}")
+            return
+        
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title(f"📄 {archivo} @ {rama}")
+        ventana.geometry("1000x650")
+        ventana.transient(self.root)
+        
+        ctk.CTkLabel(ventana, text=f"📄 {archivo}", font=("Arial", 14, "bold")).pack(pady=10)
         
-        ctk.CTkLabel(frame_rama1, text=f"📄 Versión en {rama1}", 
-                    font=("Arial", 11, "bold")).pack(pady=5)
+        tipo = "📦 binario" if info['binario'] else f"📝 texto ({info['codificacion']})"
+        frame_info = ctk.CTkFrame(ventana, fg_color="#2B2B2B")
+        frame_info.pack(fill="x", padx=10, pady=5)
+        ctk.CTkLabel(frame_info, text=f"📍 {rama}   🔹 {info['sha']}   💾 {tamaño_legible(info['tamaño'])}   {tipo}",
+                    font=("Courier", 10)).pack(side="left", padx=10, pady=8)
+        label_estado = ctk.CTkLabel(frame_info, text="", font=("Arial", 10))
+        label_estado.pack(side="right", padx=10)
         
-        text_rama1 = ctk.CTkTextbox(frame_rama1, font=("Courier", 9), wrap="none")
-        text_rama1.pack(fill="both", expand=True)
+        frame_acciones = ctk.CTkFrame(ventana, fg_color="transparent")
+        frame_acciones.pack(fill="x", padx=10)
         
-        contenido1 = self.proyecto.get_contenido_archivo_en_rama(archivo, rama1)
-        if contenido1:
-            text_rama1.insert("1.0", contenido1)
-        else:
-            text_rama1.insert("1.0", "[Archivo no disponible en esta rama]")
-        text_rama1.configure(state="disabled")
+        texto = ctk.CTkTextbox(ventana, font=("Courier", 10), wrap="none")
+        texto.pack(fill="both", expand=True, padx=10, pady=5)
         
-        # Rama 2
-        frame_rama2 = ctk.CTkFrame(contenido_frame)
-        frame_rama2.pack(side="left", fill="both", expand=True, padx=5)
+        lenguaje = lenguaje_de_archivo(archivo)
+        resaltador = ResaltadorSintaxis(texto, lenguaje) if lenguaje and not info['binario'] else None
         
-        ctk.CTkLabel(frame_rama2, text=f"📄 Versión en {rama2}", 
-                    font=("Arial", 11, "bold")).pack(pady=5)
+        estado = {"cerrada": False}
         
-        text_rama2 = ctk.CTkTextbox(frame_rama2, font=("Courier", 9), wrap="none")
-        text_rama2.pack(fill="both", expand=True)
+        def agregar(bloque):
+            if estado["cerrada"] or not ventana.winfo_exists():
+                return
+            ultima = int(texto.index("end-1c").split('.')[0])
+            texto.configure(state="normal")
+            texto.insert("end", bloque)
+            texto.configure(state="disabled")
+            if resaltador:
+                resaltador.invalidar(ultima)
+        
+        def terminar(error, max_lineas):
+            if estado["cerrada"] or not ventana.winfo_exists():
+                return
+            if error:
+                label_estado.configure(text=f"❌ Error: {error[:100]}", text_color="#FF6B6B")
+            elif max_lineas:
+                label_estado.configure(text=f"✂️ Primeras {max_lineas} líneas", text_color="orange")
+            else:
+                label_estado.configure(text="✅ Cargado completo", text_color="#90EE90")
+        
+        def cargar(max_lineas=None):
+            for widget in frame_acciones.winfo_children():
+                widget.destroy()
+            texto.configure(state="normal")
+            texto.delete("1.0", "end")
+            texto.configure(state="disabled")
+            if resaltador:
+                resaltador.invalidar()
+            label_estado.configure(text="⏳ Cargando...", text_color="white")
+            
+            def leer():
+                error = None
+                try:
+                    for bloque in self.proyecto.iterar_contenido_archivo(info, max_lineas):
+                        if estado["cerrada"]:
+                            break
+                        self.root.after(0, lambda b=bloque: agregar(b))
+                except OSError as e:
+                    error = str(e)
+                self.root.after(0, lambda: terminar(error, max_lineas))
+            
+            threading.Thread(target=leer, daemon=True).start()
+        
+        def cerrar():
+            estado["cerrada"] = True
+            ventana.destroy()
         
-        contenido2 = self.proyecto.get_contenido_archivo_en_rama(archivo, rama2)
-        if contenido2:
-            text_rama2.insert("1.0", contenido2)
+        if info['binario']:
+            texto.insert("1.0", "[Archivo binario: no se muestra el contenido]")
+            texto.configure(state="disabled")
+        elif info['tamaño'] > UMBRAL_ARCHIVO_GRANDE:
+            texto.configure(state="disabled")
+            ctk.CTkLabel(frame_acciones, 
+                        text=f"⚠️ El archivo pesa {tamaño_legible(info['tamaño'])}: cargarlo entero puede tardar.",
+                        font=("Arial", 11), text_color="orange").pack(side="left", padx=5, pady=5)
+            ctk.CTkButton(frame_acciones, text=f"📄 Primeras {LINEAS_VISTA_PREVIA} líneas", width=170,
+                         command=lambda: cargar(LINEAS_VISTA_PREVIA)).pack(side="right", padx=5)
+            ctk.CTkButton(frame_acciones, text="⚠️ Cargar igual", width=130, fg_color="#D32F2F",
+                         command=cargar).pack(side="right", padx=5)
         else:
-            text_rama2.insert("1.0", "[Archivo no disponible en esta rama]")
-        text_rama2.configure(state="disabled")
-        
-        # Botones
-        button_frame = ctk.CTkFrame(ventana_comp)
-        button_frame.pack(pady=10)
+            cargar()
         
-        ctk.CTkButton(button_frame, text="❌ Cerrar", 
-                    command=ventana_comp.destroy,
-                    fg_color="gray", width=120).pack()
+        frame_btn = ctk.CTkFrame(ventana)
+        frame_btn.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_btn, text="❌ Cerrar", command=cerrar, 
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        ventana.protocol("WM_DELETE_WINDOW", cerrar)
 
 
     def fetch(self):
@@ -2788,14 +2920,23 @@ class AetheryonDevCoreApp:
             return
         
         print("🔄 Haciendo fetch...")
-        resultado = self.proyecto.fetch()
         
-        if resultado == True:
-            messagebox.showinfo("Fetch exitoso", 
-                "✅ Fetch realizado correctamente.\n\n"
-                "Se actualizaron las referencias remotas.")
-        else:
-            messagebox.showerror("Error Fetch", f"Error al hacer fetch:\n{resultado}")
+        def terminar(resultado):
+            if isinstance(resultado, str):
+                messagebox.showerror("Error Fetch", f"Error al hacer fetch:\n{resultado}")
+                return
+            errores = {remoto: r for remoto, r in resultado.items() if r is not True}
+            if not errores:
+                messagebox.showinfo("Fetch exitoso", 
+                    "✅ Fetch realizado correctamente.\n\n"
+                    f"Se actualizaron las referencias remotas ({', '.join(resultado)}).")
+            else:
+                detalle = "\n\n".join(f"❌ {remoto}:\n{error}" for remoto, error in errores.items())
+                messagebox.showerror("Error Fetch", f"Error al hacer fetch:\n\n{detalle}")
+        
+        # Todos los remotos a la vez (asyncio), como una sola escritura para el planificador
+        self.trabajos.enviar(self.proyecto.fetch_remotos, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=terminar, descripcion="fetch")
 
 
 # ======================= Metodos Merge =======================
@@ -2922,11 +3063,10 @@ class AetheryonDevCoreApp:
             f"Fusionando rama '{rama_origen}'...\nEsto puede tomar unos momentos."
         )
         
-        def merge_thread():
-            resultado = self.proyecto.merge_rama(rama_origen)
-            self.root.after(0, lambda: self._procesar_resultado_merge(resultado, rama_origen, ventana_progreso))
-        
-        threading.Thread(target=merge_thread, daemon=True).start()
+        self.trabajos.enviar(
+            self.proyecto.merge_rama, rama_origen, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._procesar_resultado_merge(resultado, rama_origen, ventana_progreso),
+            descripcion=f"merge {rama_origen}")
 
     def _procesar_resultado_merge(self, resultado, rama_origen, ventana_progreso):
         """Procesa el resultado del merge"""
@@ -2981,18 +3121,20 @@ class AetheryonDevCoreApp:
                 messagebox.showerror("Error en Merge", 
                     f"Error al realizar el merge:\n\n{resultado}")
 
-    def _gestionar_merge_en_progreso(self):
-        """Gestiona un merge con conflictos"""
+    def _gestionar_merge_en_progreso(self, operacion="merge"):
+        """Gestiona un merge (o un cherry-pick, operacion="cherry-pick") con conflictos"""
         conflictos = self.proyecto.get_conflictos()
+        es_cherry_pick = operacion == "cherry-pick"
+        nombre_operacion = "Cherry Pick" if es_cherry_pick else "Merge"
         
         ventana_conflictos = ctk.CTkToplevel(self.root)
-        ventana_conflictos.title("⚠️ Conflictos de Merge")
+        ventana_conflictos.title(f"⚠️ Conflictos de {nombre_operacion}")
         ventana_conflictos.geometry("800x600")
         ventana_conflictos.transient(self.root)
         ventana_conflictos.attributes('-topmost', True)
         ventana_conflictos.grab_set()
         
-        ctk.CTkLabel(ventana_conflictos, text="⚠️ Merge con Conflictos", 
+        ctk.CTkLabel(ventana_conflictos, text=f"⚠️ {nombre_operacion} con Conflictos", 
                     font=("Arial", 16, "bold"), text_color="orange").pack(pady=15)
         
         info_frame = ctk.CTkFrame(ventana_conflictos, fg_color="#3D2B1F")
@@ -3010,7 +3152,7 @@ class AetheryonDevCoreApp:
         ctk.CTkLabel(instrucciones, 
                     text="📋 Opciones para resolver conflictos:\n\n"
                         "• 'Ours': Mantener la versión de tu rama actual\n"
-                        "• 'Theirs': Aceptar la versión de la rama que estás fusionando\n"
+                        f"• 'Theirs': Aceptar la versión {'del commit que estás aplicando' if es_cherry_pick else 'de la rama que estás fusionando'}\n"
                         "• Manual: Editar el archivo manualmente en tu editor", 
                     font=("Arial", 9), text_color="#87CEEB", 
                     justify="left").pack(pady=8, padx=10)
@@ -3038,7 +3180,7 @@ class AetheryonDevCoreApp:
                     archivos_resueltos[arch] = 'ours'
                     messagebox.showinfo("Resuelto", f"✅ Conflicto resuelto (manteniendo tu versión):\n{arch}")
                     ventana_conflictos.destroy()
-                    self._gestionar_merge_en_progreso()
+                    self._gestionar_merge_en_progreso(operacion)
                 else:
                     messagebox.showerror("Error", f"Error resolviendo conflicto:\n{resultado}")
             
@@ -3048,7 +3190,7 @@ class AetheryonDevCoreApp:
                     archivos_resueltos[arch] = 'theirs'
                     messagebox.showinfo("Resuelto", f"✅ Conflicto resuelto (aceptando versión entrante):\n{arch}")
                     ventana_conflictos.destroy()
-                    self._gestionar_merge_en_progreso()
+                    self._gestionar_merge_en_progreso(operacion)
                 else:
                     messagebox.showerror("Error", f"Error resolviendo conflicto:\n{resultado}")
             
@@ -3087,7 +3229,7 @@ class AetheryonDevCoreApp:
         
         def refrescar():
             ventana_conflictos.destroy()
-            self._gestionar_merge_en_progreso()
+            self._gestionar_merge_en_progreso(operacion)
         
         def continuar_merge():
             conflictos_restantes = self.proyecto.get_conflictos()
@@ -3098,15 +3240,26 @@ class AetheryonDevCoreApp:
                     "Debés resolver todos los conflictos antes de continuar.")
                 return
             
-            respuesta = messagebox.askyesno("Continuar Merge", 
-                "¿Todos los conflictos fueron resueltos?\n\n"
-                "Esto completará el merge y creará un commit de merge.")
+            if es_cherry_pick:
+                respuesta = messagebox.askyesno("Continuar Cherry Pick", 
+                    "¿Todos los conflictos fueron resueltos?\n\n"
+                    "Se creará el commit y se seguirá con los commits restantes.")
+            else:
+                respuesta = messagebox.askyesno("Continuar Merge", 
+                    "¿Todos los conflictos fueron resueltos?\n\n"
+                    "Esto completará el merge y creará un commit de merge.")
             
             if not respuesta:
                 return
             
             ventana_conflictos.destroy()
             
+            if es_cherry_pick:
+                # El secuenciador sigue con los commits que quedaban en la lista
+                self._ejecutar_cherry_pick(self.proyecto.continuar_cherry_pick,
+                                           self.proyecto.get_cherry_picks_pendientes())
+                return
+            
             resultado = self.proyecto.continuar_merge()
             
             if resultado == True:
@@ -3118,40 +3271,57 @@ class AetheryonDevCoreApp:
             else:
                 messagebox.showerror("Error", f"Error completando merge:\n{resultado}")
         
+        def saltar():
+            respuesta = messagebox.askyesno("Saltar Commit", 
+                "¿Saltar el commit en conflicto?\n\n"
+                "Se descartan sus cambios y se sigue con los commits restantes.")
+            
+            if not respuesta:
+                return
+            
+            ventana_conflictos.destroy()
+            self._ejecutar_cherry_pick(self.proyecto.saltar_cherry_pick,
+                                       self.proyecto.get_cherry_picks_pendientes())
+        
         def abortar():
-            respuesta = messagebox.askyesno("Abortar Merge", 
-                "⚠️ ¿Abortar el merge?\n\n"
-                "Esto descartará todos los cambios del merge\n"
+            respuesta = messagebox.askyesno(f"Abortar {nombre_operacion}", 
+                f"⚠️ ¿Abortar el {nombre_operacion.lower()}?\n\n"
+                "Esto descartará todos los cambios en curso\n"
                 "y volverá al estado anterior.")
             
             if not respuesta:
                 return
             
-            resultado = self.proyecto.abortar_merge()
+            if es_cherry_pick:
+                resultado = self.proyecto.abortar_cherry_pick()
+            else:
+                resultado = self.proyecto.abortar_merge()
             
             if resultado == True:
-                messagebox.showinfo("Merge Abortado", 
-                    "✅ El merge fue abortado.\n\n"
-                    "Tu repositorio volvió al estado anterior al merge.")
+                messagebox.showinfo(f"{nombre_operacion} Abortado", 
+                    f"✅ El {nombre_operacion.lower()} fue abortado.\n\n"
+                    "Tu repositorio volvió al estado anterior.")
                 ventana_conflictos.destroy()
                 self.actualizar_rama_display()
                 self.ver_archivos()
             else:
-                messagebox.showerror("Error", f"Error abortando merge:\n{resultado}")
+                messagebox.showerror("Error", f"Error abortando {nombre_operacion.lower()}:\n{resultado}")
         
         ctk.CTkButton(button_frame, text="🔄 Refrescar", 
                     command=refrescar,
                     fg_color="#00897B", width=120, height=35).pack(side="left", padx=5)
         
-        ctk.CTkButton(frame_proyecto, text="💻 Terminal", command=self.abrir_terminal_en_rama, 
-                    width=100, fg_color="#424242").grid(row=0, column=5, padx=3, pady=5)
-
-        ctk.CTkButton(button_frame, text="✅ Continuar Merge", 
+        ctk.CTkButton(button_frame, text=f"✅ Continuar {nombre_operacion}", 
                     command=continuar_merge,
                     fg_color="green", hover_color="darkgreen", 
                     width=150, height=35, font=("Arial", 11, "bold")).pack(side="left", padx=5)
         
-        ctk.CTkButton(button_frame, text="❌ Abortar Merge", 
+        if es_cherry_pick:
+            ctk.CTkButton(button_frame, text="⏭️ Saltar Commit", 
+                        command=saltar,
+                        fg_color="#F57C00", width=130, height=35).pack(side="left", padx=5)
+        
+        ctk.CTkButton(button_frame, text=f"❌ Abortar {nombre_operacion}", 
                     command=abortar,
                     fg_color="red", hover_color="darkred", 
                     width=130, height=35).pack(side="left", padx=5)
@@ -3209,6 +3379,7 @@ class AetheryonDevCoreApp:
         ventana_progreso.destroy()
         messagebox.showerror("Error", f"Error inesperado:\n{error}")
 
+    @medir("ui._mostrar_ventana_commits_archivo")
     def _mostrar_ventana_commits_archivo(self, archivo, commits):
         ventana = ctk.CTkToplevel(self.root)
         ventana.title(f"📂 Historial: {archivo}")
@@ -3230,6 +3401,7 @@ class AetheryonDevCoreApp:
         header.pack(fill="x", pady=2)
         ctk.CTkLabel(header, text="Hash", font=("Arial", 10, "bold"), width=80).pack(side="left", padx=2)
         ctk.CTkLabel(header, text="Cambios", font=("Arial", 10, "bold"), width=120).pack(side="left", padx=2)
+        ctk.CTkLabel(header, text="+/−", font=("Arial", 10, "bold"), width=70).pack(side="left", padx=2)
         ctk.CTkLabel(header, text="Mensaje", font=("Arial", 10, "bold"), width=250).pack(side="left", padx=2)
         ctk.CTkLabel(header, text="Autor", font=("Arial", 10, "bold"), width=120).pack(side="left", padx=2)
         ctk.CTkLabel(header, text="Fecha", font=("Arial", 10, "bold"), width=130).pack(side="left", padx=2)
@@ -3238,16 +3410,34 @@ class AetheryonDevCoreApp:
             cframe = ctk.CTkFrame(scrollable, fg_color="#1E1E1E")
             cframe.pack(fill="x", pady=1)
             
-            ctk.CTkLabel(cframe, text=commit['hash'], font=("Courier", 9), width=80).pack(side="left", padx=2)
-            ctk.CTkLabel(cframe, text=commit['cambios'], font=("Arial", 9), width=120).pack(side="left", padx=2)
-            msg = commit['mensaje'][:35] + "..." if len(commit['mensaje']) > 35 else commit['mensaje']
+            ctk.CTkLabel(cframe, text=commit.hash, font=("Courier", 9), width=80).pack(side="left", padx=2)
+            ctk.CTkLabel(cframe, text=commit.cambios, font=("Arial", 9), width=120).pack(side="left", padx=2)
+            if commit.lineas_agregadas is not None:
+                lineas = f"+{commit.lineas_agregadas} −{commit.lineas_eliminadas}"
+            else:
+                lineas = "bin" if commit.tipo_cambio else ""
+            ctk.CTkLabel(cframe, text=lineas, font=("Courier", 9), width=70,
+                        text_color="#90EE90").pack(side="left", padx=2)
+            msg = commit.mensaje[:35] + "..." if len(commit.mensaje) > 35 else commit.mensaje
             ctk.CTkLabel(cframe, text=msg, font=("Arial", 9), width=250, anchor="w").pack(side="left", padx=2)
-            autor = commit['autor'].split('<')[0].strip()
+            autor = commit.autor.split('<')[0].strip()
             ctk.CTkLabel(cframe, text=autor, font=("Arial", 9), width=120, anchor="w").pack(side="left", padx=2)
-            ctk.CTkLabel(cframe, text=commit['fecha'], font=("Arial", 9), width=130).pack(side="left", padx=2)
+            ctk.CTkLabel(cframe, text=commit.fecha, font=("Arial", 9), width=130).pack(side="left", padx=2)
+            
+            # Nombre que tenía el archivo en ese commit (historial a través de renombres)
+            if commit.ruta_anterior:
+                ctk.CTkLabel(cframe, text=f"{commit.ruta_anterior} → {commit.ruta}", 
+                            font=("Courier", 8), text_color="#FFB74D").pack(side="left", padx=2)
+            elif commit.ruta and commit.ruta != archivo:
+                ctk.CTkLabel(cframe, text=f"como {commit.ruta}", 
+                            font=("Courier", 8), text_color="#FFB74D").pack(side="left", padx=2)
         
         frame_btn = ctk.CTkFrame(ventana)
         frame_btn.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_btn, text="🔍 Blame", command=lambda: self.ver_blame_archivo(archivo), 
+                     fg_color="#4527A0", width=100).pack(side="left", padx=5)
+        ctk.CTkButton(frame_btn, text="👁️ Ver contenido", command=lambda: self._ver_contenido_archivo(archivo, "HEAD"), 
+                     fg_color="#00897B", width=120).pack(side="left", padx=5)
         ctk.CTkButton(frame_btn, text="❌ Cerrar", command=ventana.destroy, 
                      fg_color="gray", width=100).pack(side="right", padx=5)
 
@@ -3258,13 +3448,52 @@ class AetheryonDevCoreApp:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        commits = self.proyecto.get_commits_detallados(30)
-        if not commits:
-            messagebox.showinfo("Sin commits", "No hay commits en este repositorio.")
-            return
+        def mostrar(commits):
+            if isinstance(commits, str):
+                messagebox.showerror("Error", f"Error al obtener commits:\n{commits}")
+            elif not commits:
+                messagebox.showinfo("Sin commits", "No hay commits en este repositorio.")
+            else:
+                self._mostrar_ventana_commits_detallados(commits)
+        
+        self.trabajos.enviar(self.proyecto.get_commits_detallados, 30, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=mostrar, descripcion="historial")
+
+    def _crear_buscador_commits(self, ventana, parent, al_cambiar):
+        """
+        Caja de búsqueda sobre el índice de commits. Llama a `al_cambiar` con la
+        lista de resultados, o con None cuando la búsqueda queda vacía.
+        """
+        entry = ctk.CTkEntry(parent, width=340, 
+                            placeholder_text="🔎 Buscar: mensaje, autor:nombre, ruta:archivo, hash")
+        entry.pack(side="right", padx=10, pady=5)
         
-        self._mostrar_ventana_commits_detallados(commits)
+        pendiente = {"id": None, "texto": ""}
+        
+        def ejecutar():
+            pendiente["id"] = None
+            texto = entry.get().strip()
+            if texto == pendiente["texto"]:
+                return
+            pendiente["texto"] = texto
+            if not texto:
+                al_cambiar(None)
+                return
+            resultados = self.proyecto.buscar_commits(texto, max_count=200)
+            print(f"🔎 Búsqueda '{texto}': {len(resultados)} commit(s)")
+            al_cambiar(resultados)
+        
+        def programar(_evento=None):
+            # Espera a que el usuario deje de escribir antes de consultar el índice
+            if pendiente["id"]:
+                ventana.after_cancel(pendiente["id"])
+            pendiente["id"] = ventana.after(250, ejecutar)
+        
+        entry.bind("<KeyRelease>", programar)
+        entry.bind("<Return>", lambda e: ejecutar())
+        return entry
 
+    @medir("ui._mostrar_ventana_commits_detallados")
     def _mostrar_ventana_commits_detallados(self, commits):
         ventana = ctk.CTkToplevel(self.root)
         ventana.title("🕐 Historial de Commits")
@@ -3274,8 +3503,9 @@ class AetheryonDevCoreApp:
         
         frame_info = ctk.CTkFrame(ventana, fg_color="#2B2B2B")
         frame_info.pack(fill="x", padx=10, pady=10)
-        ctk.CTkLabel(frame_info, text=f"📊 Total de commits: {len(commits)}", 
-                    font=("Arial", 12, "bold")).pack(side="left", padx=10)
+        label_total = ctk.CTkLabel(frame_info, text=f"📊 Total de commits: {len(commits)}", 
+                    font=("Arial", 12, "bold"))
+        label_total.pack(side="left", padx=10)
         
         scrollable_commits = ctk.CTkScrollableFrame(ventana, width=900, height=350)
         scrollable_commits.pack(fill="both", expand=True, padx=10, pady=5)
@@ -3290,28 +3520,47 @@ class AetheryonDevCoreApp:
         
         commit_vars = {}
         selected_commit = {"data": None}
+        filas = []
         
         def select_commit(commit_data):
             selected_commit["data"] = commit_data
         
-        for commit in commits:
-            commit_frame = ctk.CTkFrame(scrollable_commits, fg_color="#1E1E1E")
-            commit_frame.pack(fill="x", pady=1)
-            
-            radio_var = ctk.StringVar(value="")
-            radio = ctk.CTkRadioButton(commit_frame, text="", variable=radio_var, value=commit['hash'],
-                                       command=lambda c=commit: select_commit(c), width=20)
-            radio.pack(side="left", padx=2)
-            commit_vars[commit['hash']] = (radio_var, commit)
+        def mostrar_commits(lista):
+            for fila in filas:
+                fila.destroy()
+            filas.clear()
+            commit_vars.clear()
             
-            ctk.CTkLabel(commit_frame, text=commit['hash'], font=("Courier", 9), width=80).pack(side="left", padx=2)
-            mensaje_corto = commit['mensaje'][:45] + "..." if len(commit['mensaje']) > 45 else commit['mensaje']
-            ctk.CTkLabel(commit_frame, text=mensaje_corto, font=("Arial", 9), width=300, anchor="w").pack(side="left", padx=2)
-            autor_corto = commit['autor'].split('<')[0].strip()
-            ctk.CTkLabel(commit_frame, text=autor_corto, font=("Arial", 9), width=150, anchor="w").pack(side="left", padx=2)
-            ctk.CTkLabel(commit_frame, text=commit['fecha'], font=("Arial", 9), width=130).pack(side="left", padx=2)
-            ctk.CTkLabel(commit_frame, text=commit['fecha_relativa'], font=("Arial", 9), 
-                        width=100, text_color="#87CEEB").pack(side="left", padx=2)
+            for commit, relativo in zip(lista, tiempos_relativos(lista)):
+                commit_frame = ctk.CTkFrame(scrollable_commits, fg_color="#1E1E1E")
+                commit_frame.pack(fill="x", pady=1)
+                filas.append(commit_frame)
+                
+                radio_var = ctk.StringVar(value="")
+                radio = ctk.CTkRadioButton(commit_frame, text="", variable=radio_var, value=commit.hash,
+                                           command=lambda c=commit: select_commit(c), width=20)
+                radio.pack(side="left", padx=2)
+                commit_vars[commit.hash] = (radio_var, commit)
+                
+                ctk.CTkLabel(commit_frame, text=commit.hash, font=("Courier", 9), width=80).pack(side="left", padx=2)
+                mensaje_corto = commit.mensaje[:45] + "..." if len(commit.mensaje) > 45 else commit.mensaje
+                ctk.CTkLabel(commit_frame, text=mensaje_corto, font=("Arial", 9), width=300, anchor="w").pack(side="left", padx=2)
+                autor_corto = commit.autor.split('<')[0].strip()
+                ctk.CTkLabel(commit_frame, text=autor_corto, font=("Arial", 9), width=150, anchor="w").pack(side="left", padx=2)
+                ctk.CTkLabel(commit_frame, text=commit.fecha, font=("Arial", 9), width=130).pack(side="left", padx=2)
+                ctk.CTkLabel(commit_frame, text=relativo, font=("Arial", 9), 
+                            width=100, text_color="#87CEEB").pack(side="left", padx=2)
+        
+        def al_buscar(resultados):
+            if resultados is None:
+                mostrar_commits(commits)
+                label_total.configure(text=f"📊 Total de commits: {len(commits)}")
+            else:
+                mostrar_commits(resultados)
+                label_total.configure(text=f"🔎 Resultados: {len(resultados)}")
+        
+        self._crear_buscador_commits(ventana, frame_info, al_buscar)
+        mostrar_commits(commits)
         
         frame_botones = ctk.CTkFrame(ventana)
         frame_botones.pack(fill="x", padx=10, pady=10)
@@ -3324,14 +3573,14 @@ class AetheryonDevCoreApp:
             commit = selected_commit["data"]
             detalles = f"""📋 DETALLES DEL COMMIT
             
-🔹 Hash: {commit['hash_completo']}
-🔹 Hash corto: {commit['hash']}
-📝 Mensaje: {commit['mensaje']}
-👤 Autor: {commit['autor']}
-📅 Fecha: {commit['fecha']}
-⏰ Hace: {commit['fecha_relativa']}"""
+🔹 Hash: {commit.hash_completo}
+🔹 Hash corto: {commit.hash}
+📝 Mensaje: {commit.mensaje}
+👤 Autor: {commit.autor}
+📅 Fecha: {commit.fecha}
+⏰ Hace: {tiempos_relativos([commit])[0]}"""
             
-            messagebox.showinfo(f"Commit {commit['hash']}", detalles)
+            messagebox.showinfo(f"Commit {commit.hash}", detalles)
         
         def reset_soft():
             if not selected_commit["data"]:
@@ -3340,12 +3589,12 @@ class AetheryonDevCoreApp:
             
             commit = selected_commit["data"]
             respuesta = messagebox.askyesno("Reset Soft", 
-                f"¿Volver al commit {commit['hash']}?\n\n"
-                f"'{commit['mensaje']}'\n\n"
+                f"¿Volver al commit {commit.hash}?\n\n"
+                f"'{commit.mensaje}'\n\n"
                 "RESET SOFT: Mantiene los cambios en staging area.")
             
             if respuesta:
-                resultado = self.proyecto.reset_to_commit(commit['hash_completo'], "soft")
+                resultado = self.proyecto.reset_to_commit(commit.hash_completo, "soft")
                 if resultado == True:
                     messagebox.showinfo("Reset exitoso", "✅ Reset soft realizado.")
                     ventana.destroy()
@@ -3361,8 +3610,8 @@ class AetheryonDevCoreApp:
             
             commit = selected_commit["data"]
             respuesta = messagebox.askyesno("Reset Hard - ¡PELIGRO!", 
-                f"¿Volver al commit {commit['hash']}?\n\n"
-                f"'{commit['mensaje']}'\n\n"
+                f"¿Volver al commit {commit.hash}?\n\n"
+                f"'{commit.mensaje}'\n\n"
                 "⚠️ RESET HARD: ¡ELIMINA TODOS LOS CAMBIOS!\n"
                 "Esta acción NO se puede deshacer.\n\n"
                 "¿Estás seguro?")
@@ -3375,7 +3624,7 @@ class AetheryonDevCoreApp:
                     "¿Continuar con RESET HARD?")
                 
                 if respuesta2:
-                    resultado = self.proyecto.reset_to_commit(commit['hash_completo'], "hard")
+                    resultado = self.proyecto.reset_to_commit(commit.hash_completo, "hard")
                     if resultado == True:
                         messagebox.showinfo("Reset exitoso", "✅ Reset hard realizado.")
                         ventana.destroy()
@@ -3393,12 +3642,505 @@ class AetheryonDevCoreApp:
         ctk.CTkButton(frame_botones, text="❌ Cerrar", command=ventana.destroy, 
                      fg_color="gray", width=100).pack(side="right", padx=5)
 
+    def buscar_en_historial(self):
+        """Busca en qué commits se agregó o quitó un texto (pickaxe -S / -G)"""
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title("🔎 Buscar en el Historial")
+        ventana.geometry("1000x650")
+        ventana.transient(self.root)
+        
+        ctk.CTkLabel(ventana, text="🔎 Buscar en el Contenido del Historial", 
+                    font=("Arial", 16, "bold")).pack(pady=10)
+        ctk.CTkLabel(ventana, 
+                    text="Encuentra los commits que agregaron o quitaron un texto (-S) o que tocaron líneas que coinciden con una regex (-G)", 
+                    font=("Arial", 10), text_color="gray").pack(pady=2)
+        
+        frame_busqueda = ctk.CTkFrame(ventana, fg_color="#2B2B2B")
+        frame_busqueda.pack(fill="x", padx=10, pady=8)
+        
+        entry_patron = ctk.CTkEntry(frame_busqueda, width=320, placeholder_text="Texto o regex a buscar")
+        entry_patron.grid(row=0, column=0, padx=5, pady=5)
+        entry_ruta = ctk.CTkEntry(frame_busqueda, width=200, placeholder_text="Ruta (opcional)")
+        entry_ruta.grid(row=0, column=1, padx=5, pady=5)
+        
+        modo_var = ctk.StringVar(value="-S texto")
+        ctk.CTkSegmentedButton(frame_busqueda, values=["-S texto", "-S regex", "-G regex"], 
+                              variable=modo_var).grid(row=0, column=2, padx=5, pady=5)
+        todas_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame_busqueda, text="Todas las ramas", variable=todas_var).grid(row=0, column=3, padx=5, pady=5)
+        
+        frame_estado = ctk.CTkFrame(ventana, fg_color="transparent")
+        frame_estado.pack(fill="x", padx=10)
+        label_estado = ctk.CTkLabel(frame_estado, text="", font=("Arial", 11))
+        label_estado.pack(side="left", padx=5)
+        progreso = ctk.CTkProgressBar(frame_estado, width=300)
+        progreso.set(0)
+        progreso.pack(side="right", padx=5)
+        
+        scrollable = ctk.CTkScrollableFrame(ventana, width=950, height=380)
+        scrollable.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        header = ctk.CTkFrame(scrollable, fg_color="#1E3A5F")
+        header.pack(fill="x", pady=2)
+        ctk.CTkLabel(header, text="Hash", font=("Arial", 10, "bold"), width=80).pack(side="left", padx=2)
+        ctk.CTkLabel(header, text="Mensaje", font=("Arial", 10, "bold"), width=300).pack(side="left", padx=2)
+        ctk.CTkLabel(header, text="Autor", font=("Arial", 10, "bold"), width=130).pack(side="left", padx=2)
+        ctk.CTkLabel(header, text="Fecha", font=("Arial", 10, "bold"), width=130).pack(side="left", padx=2)
+        ctk.CTkLabel(header, text="Archivos", font=("Arial", 10, "bold"), width=250).pack(side="left", padx=2)
+        
+        estado = {"busqueda": None, "filas": [], "encontrados": 0}
+        
+        def agregar_resultados(busqueda, commits):
+            # Resultados de una búsqueda ya reemplazada o cerrada se descartan
+            if busqueda is not estado["busqueda"] or not ventana.winfo_exists():
+                return
+            for commit in commits:
+                fila = ctk.CTkFrame(scrollable, fg_color="#1E1E1E")
+                fila.pack(fill="x", pady=1)
+                estado["filas"].append(fila)
+                
+                ctk.CTkLabel(fila, text=commit.hash, font=("Courier", 9), width=80).pack(side="left", padx=2)
+                asunto = commit.mensaje.split('\n')[0]
+                asunto = asunto[:45] + "..." if len(asunto) > 45 else asunto
+                ctk.CTkLabel(fila, text=asunto, font=("Arial", 9), width=300, anchor="w").pack(side="left", padx=2)
+                ctk.CTkLabel(fila, text=commit.autor, font=("Arial", 9), width=130, anchor="w").pack(side="left", padx=2)
+                ctk.CTkLabel(fila, text=commit.fecha, font=("Arial", 9), width=130).pack(side="left", padx=2)
+                archivos = ", ".join(commit.archivos[:3])
+                if len(commit.archivos) > 3:
+                    archivos += f" (+{len(commit.archivos) - 3})"
+                ctk.CTkLabel(fila, text=archivos, font=("Arial", 9), width=250, anchor="w", 
+                            text_color="#87CEEB").pack(side="left", padx=2)
+            estado["encontrados"] += len(commits)
+            label_estado.configure(text=f"🔎 {estado['encontrados']} commit(s) encontrados...")
+        
+        def actualizar_progreso(busqueda, listos, total):
+            if busqueda is estado["busqueda"] and ventana.winfo_exists():
+                progreso.set(listos / total if total else 1)
+        
+        def terminar(busqueda, total, error):
+            if busqueda is not estado["busqueda"] or not ventana.winfo_exists():
+                return
+            boton_buscar.configure(state="normal")
+            boton_cancelar.configure(state="disabled")
+            if error:
+                label_estado.configure(text=f"❌ Error: {error[:120]}", text_color="#FF6B6B")
+            elif busqueda.cancelada:
+                label_estado.configure(text=f"⏹️ Búsqueda cancelada ({total} commit(s))", text_color="orange")
+            else:
+                progreso.set(1)
+                label_estado.configure(text=f"✅ {total} commit(s) encontrados", text_color="#90EE90")
+        
+        def iniciar_busqueda():
+            patron = entry_patron.get()
+            if not patron:
+                messagebox.showwarning("Sin patrón", "Escribí el texto a buscar.", parent=ventana)
+                return
+            if estado["busqueda"]:
+                estado["busqueda"].cancelar()
+            for fila in estado["filas"]:
+                fila.destroy()
+            estado["filas"].clear()
+            estado["encontrados"] = 0
+            
+            modo = modo_var.get()
+            busqueda = self.proyecto.buscar_en_historial(
+                patron, modo='G' if modo.startswith('-G') else 'S', regex=modo == "-S regex",
+                todas_las_ramas=todas_var.get(), ruta=entry_ruta.get().strip() or None)
+            estado["busqueda"] = busqueda
+            print(f"🔎 Buscando '{patron}' en el historial ({modo})")
+            
+            progreso.set(0)
+            label_estado.configure(text="⏳ Buscando...", text_color="white")
+            boton_buscar.configure(state="disabled")
+            boton_cancelar.configure(state="normal")
+            
+            # Los callbacks llegan desde hilos de trabajo: se pasan al hilo de Tk con after
+            busqueda.iniciar(
+                lambda commits: self.root.after(0, lambda: agregar_resultados(busqueda, commits)),
+                lambda listos, total: self.root.after(0, lambda: actualizar_progreso(busqueda, listos, total)),
+                lambda total, error: self.root.after(0, lambda: terminar(busqueda, total, error)))
+        
+        def cancelar_busqueda():
+            if estado["busqueda"]:
+                estado["busqueda"].cancelar()
+        
+        def cerrar():
+            cancelar_busqueda()
+            ventana.destroy()
+        
+        frame_botones = ctk.CTkFrame(ventana)
+        frame_botones.pack(fill="x", padx=10, pady=10)
+        boton_buscar = ctk.CTkButton(frame_botones, text="🔎 Buscar", command=iniciar_busqueda, 
+                                    fg_color="#00695C", width=130)
+        boton_buscar.pack(side="left", padx=5)
+        boton_cancelar = ctk.CTkButton(frame_botones, text="⏹️ Cancelar", command=cancelar_busqueda, 
+                                      fg_color="#C62828", width=130, state="disabled")
+        boton_cancelar.pack(side="left", padx=5)
+        ctk.CTkButton(frame_botones, text="❌ Cerrar", command=cerrar, 
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        
+        entry_patron.bind("<Return>", lambda e: iniciar_busqueda())
+        ventana.protocol("WM_DELETE_WINDOW", cerrar)
+        entry_patron.focus()
+
+    @medir("ui.ver_grafo_commits")
+    def ver_grafo_commits(self):
+        """Historial como grafo de ramas y merges, dibujado en un solo Canvas"""
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        ALTO_FILA = 22
+        ANCHO_CARRIL = 14
+        MARGEN = 10
+        TAM_PAGINA = 400
+        COLORES = ["#4FC3F7", "#81C784", "#FFB74D", "#E57373", "#BA68C8", "#4DB6AC", "#F06292", "#DCE775"]
+        
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title("🌳 Grafo de Commits")
+        ventana.geometry("1100x700")
+        ventana.transient(self.root)
+        
+        ctk.CTkLabel(ventana, text="🌳 Grafo de Commits", font=("Arial", 16, "bold")).pack(pady=10)
+        
+        frame_opciones = ctk.CTkFrame(ventana, fg_color="#2B2B2B")
+        frame_opciones.pack(fill="x", padx=10, pady=5)
+        todas_var = ctk.BooleanVar(value=False)
+        label_estado = ctk.CTkLabel(frame_opciones, text="", font=("Arial", 11))
+        
+        frame_grafo = ctk.CTkFrame(ventana)
+        frame_grafo.pack(fill="both", expand=True, padx=10, pady=5)
+        canvas = ctk.CTkCanvas(frame_grafo, bg="#1E1E1E", highlightthickness=0)
+        
+        label_detalle = ctk.CTkLabel(ventana, text="Hacé click en un commit para ver el detalle", 
+                                    font=("Courier", 10), text_color="gray", anchor="w", justify="left")
+        label_detalle.pack(fill="x", padx=15, pady=5)
+        
+        estado = {"sesion": None, "primera": 0, "seleccion": None}
+        
+        def x_carril(j):
+            return MARGEN + j * ANCHO_CARRIL + ANCHO_CARRIL // 2
+        
+        def filas_visibles():
+            return max(1, canvas.winfo_height() // ALTO_FILA + 1)
+        
+        def dibujar():
+            sesion = estado["sesion"]
+            if not sesion or not canvas.winfo_exists():
+                return
+            commits = sesion["commits"]
+            filas = sesion["disposicion"].filas
+            visibles = filas_visibles()
+            estado["primera"] = max(0, min(estado["primera"], len(commits) - visibles + 1))
+            primera = estado["primera"]
+            tramo = commits[primera:primera + visibles]
+            
+            canvas.delete("all")
+            
+            # El texto arranca después de la columna más a la derecha de las filas visibles
+            ancho = 1
+            for columna, pasantes, entrantes, salientes in filas[primera:primera + len(tramo)]:
+                ancho = max(ancho, columna + 1, *(j + 1 for j in pasantes + entrantes + salientes))
+            x_texto = MARGEN + ancho * ANCHO_CARRIL + 10
+            
+            for k, (commit, relativo) in enumerate(zip(tramo, tiempos_relativos(tramo))):
+                columna, pasantes, entrantes, salientes = filas[primera + k]
+                y0 = k * ALTO_FILA
+                yc = y0 + ALTO_FILA // 2
+                y1 = y0 + ALTO_FILA
+                
+                if commit.sha == estado["seleccion"]:
+                    canvas.create_rectangle(0, y0, canvas.winfo_width(), y1, fill="#1E3A5F", outline="")
+                
+                for j in pasantes:
+                    canvas.create_line(x_carril(j), y0, x_carril(j), y1, fill=COLORES[j % len(COLORES)], width=2)
+                for i in entrantes:
+                    canvas.create_line(x_carril(i), y0, x_carril(columna), yc, fill=COLORES[i % len(COLORES)], width=2)
+                for j in salientes:
+                    canvas.create_line(x_carril(columna), yc, x_carril(j), y1, fill=COLORES[j % len(COLORES)], width=2)
+                
+                color = COLORES[columna % len(COLORES)]
+                xc = x_carril(columna)
+                # Los merges se dibujan huecos
+                canvas.create_oval(xc - 4, yc - 4, xc + 4, yc + 4, outline=color, width=2,
+                                   fill="#1E1E1E" if len(commit.padres) > 1 else color)
+                
+                x = x_texto
+                canvas.create_text(x, yc, text=commit.hash, anchor="w", fill="#87CEEB", font=("Courier", 9))
+                x += 70
+                refs = sesion["refs"].get(commit.sha)
+                if refs:
+                    id_refs = canvas.create_text(x, yc, text=f"[{refs}]", anchor="w", 
+                                                 fill="#FFB74D", font=("Arial", 9, "bold"))
+                    x = canvas.bbox(id_refs)[2] + 6
+                canvas.create_text(x, yc, text=commit.asunto[:90], anchor="w", fill="white", font=("Arial", 9))
+                ancho_canvas = canvas.winfo_width()
+                canvas.create_text(ancho_canvas - 130, yc, text=commit.autor[:22], anchor="e", 
+                                   fill="#B0BEC5", font=("Arial", 9))
+                canvas.create_text(ancho_canvas - 10, yc, text=relativo, anchor="e", 
+                                   fill="#87CEEB", font=("Arial", 9))
+            
+            total = len(commits)
+            if total:
+                barra.set(primera / total, min(1.0, (primera + visibles) / total))
+            else:
+                barra.set(0, 1)
+            
+            # Se pide la siguiente página antes de llegar al final de lo cargado
+            if not sesion["completo"] and primera + visibles * 2 >= total:
+                cargar_pagina(sesion)
+        
+        def cargar_pagina(sesion):
+            if sesion["cargando"] or sesion["completo"]:
+                return
+            sesion["cargando"] = True
+            
+            def leer():
+                try:
+                    pagina = list(itertools.islice(sesion["log"], TAM_PAGINA))
+                    error = None
+                except Exception as e:
+                    pagina, error = [], str(e)
+                self.root.after(0, lambda: recibir_pagina(sesion, pagina, error))
+            
+            threading.Thread(target=leer, daemon=True).start()
+        
+        def recibir_pagina(sesion, pagina, error):
+            sesion["cargando"] = False
+            if sesion["cerrada"] or not ventana.winfo_exists():
+                sesion["log"].close()
+                return
+            
+            for commit, refs in pagina:
+                sesion["commits"].append(commit)
+                if refs:
+                    sesion["refs"][commit.sha] = refs
+            sesion["disposicion"].agregar_pagina(commit for commit, _ in pagina)
+            
+            if error or len(pagina) < TAM_PAGINA:
+                sesion["completo"] = True
+                sesion["log"].close()
+            
+            if error:
+                label_estado.configure(text=f"❌ Error: {error[:100]}", text_color="#FF6B6B")
+            else:
+                fin = "" if sesion["completo"] else " (cargando más al desplazar)"
+                label_estado.configure(text=f"📊 {len(sesion['commits'])} commits{fin}", text_color="white")
+            dibujar()
+        
+        def cerrar_sesion():
+            sesion = estado["sesion"]
+            if sesion:
+                sesion["cerrada"] = True
+                if not sesion["cargando"]:
+                    sesion["log"].close()
+        
+        def reiniciar():
+            cerrar_sesion()
+            estado["primera"] = 0
+            estado["sesion"] = {
+                "log": self.proyecto.iterar_log_grafo(todas_var.get()),
+                "disposicion": DisposicionGrafo(),
+                "commits": [],
+                "refs": {},
+                "cargando": False,
+                "completo": False,
+                "cerrada": False,
+            }
+            label_estado.configure(text="⏳ Cargando historial...", text_color="white")
+            canvas.delete("all")
+            cargar_pagina(estado["sesion"])
+        
+        def desplazar(*args):
+            sesion = estado["sesion"]
+            if not sesion:
+                return
+            if args[0] == "moveto":
+                estado["primera"] = int(float(args[1]) * len(sesion["commits"]))
+            elif args[0] == "scroll":
+                paso = filas_visibles() - 1 if args[2] == "pages" else 3
+                estado["primera"] += int(args[1]) * paso
+            dibujar()
+        
+        def rueda(evento):
+            if getattr(evento, "num", None) == 4 or evento.delta > 0:
+                desplazar("scroll", -1, "units")
+            else:
+                desplazar("scroll", 1, "units")
+        
+        def click(evento):
+            sesion = estado["sesion"]
+            indice = estado["primera"] + evento.y // ALTO_FILA
+            if not sesion or indice >= len(sesion["commits"]):
+                return
+            commit = sesion["commits"][indice]
+            estado["seleccion"] = commit.sha
+            padres = " ".join(p[:4].hex() for p in commit.padres) or "—"
+            label_detalle.configure(
+                text=f"🔹 {commit.hash_completo}   👤 {commit.autor}   📅 {commit.fecha}   ⬆️ Padres: {padres}\n📝 {commit.asunto}",
+                text_color="white")
+            dibujar()
+        
+        def cerrar():
+            cerrar_sesion()
+            ventana.destroy()
+        
+        ctk.CTkCheckBox(frame_opciones, text="Todas las ramas", variable=todas_var, 
+                       command=reiniciar).pack(side="left", padx=10, pady=5)
+        label_estado.pack(side="left", padx=10)
+        
+        barra = ctk.CTkScrollbar(frame_grafo, command=desplazar)
+        barra.pack(side="right", fill="y")
+        canvas.pack(side="left", fill="both", expand=True)
+        
+        canvas.bind("<Configure>", lambda e: dibujar())
+        canvas.bind("<MouseWheel>", rueda)
+        canvas.bind("<Button-4>", rueda)
+        canvas.bind("<Button-5>", rueda)
+        canvas.bind("<Button-1>", click)
+        
+        frame_botones = ctk.CTkFrame(ventana)
+        frame_botones.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_botones, text="❌ Cerrar", command=cerrar, 
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        ventana.protocol("WM_DELETE_WINDOW", cerrar)
+        
+        reiniciar()
+
+    @medir("ui.ver_blame_archivo")
+    def ver_blame_archivo(self, archivo=None):
+        """Blame del archivo en HEAD, pintando la autoría de cada línea a medida que llega"""
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        
+        if not archivo:
+            archivo = CTkInputDialog(
+                parent=self.root,
+                title="🔍 Blame",
+                prompt="Nombre del archivo (ruta relativa):",
+                initialvalue="README.md"
+            ).result
+            if not archivo:
+                return
+        
+        info = self.proyecto.get_info_archivo_en_rama(archivo, "HEAD")
+        if isinstance(info, dict):
+            if info['binario']:
+                messagebox.showinfo("Archivo binario", f"'{archivo}' es binario: no tiene blame por líneas.")
+                return
+            if info['tamaño'] > UMBRAL_ARCHIVO_GRANDE and not messagebox.askyesno("Archivo grande",
+                    f"'{archivo}' pesa {tamaño_legible(info['tamaño'])}. El blame puede tardar.\n\n¿Continuar?"):
+                return
+        
+        # Columna de anotación: hash, autor y fecha antes del código
+        ANCHO_ANOTACION = 36
+        pendiente = "⏳".ljust(ANCHO_ANOTACION - 2) + "│ "
+        
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title(f"🔍 Blame: {archivo}")
+        ventana.geometry("1100x700")
+        ventana.transient(self.root)
+        
+        ctk.CTkLabel(ventana, text=f"🔍 Blame: {archivo}", font=("Arial", 14, "bold")).pack(pady=10)
+        label_estado = ctk.CTkLabel(ventana, text="⏳ Cargando archivo...", font=("Arial", 11))
+        label_estado.pack(pady=3)
+        
+        texto = ctk.CTkTextbox(ventana, font=("Courier", 10), wrap="none")
+        texto.pack(fill="both", expand=True, padx=10, pady=5)
+        texto.tag_config("anotacion", foreground="#87CEEB")
+        
+        estado = {"total": 0, "atribuidas": 0}
+        
+        def cargar(lineas):
+            if not ventana.winfo_exists():
+                return
+            estado["total"] = len(lineas)
+            texto.configure(state="normal")
+            texto.delete("1.0", "end")
+            texto.insert("1.0", "".join(pendiente + linea + "\n" for linea in lineas))
+            texto.configure(state="disabled")
+            label_estado.configure(text=f"⏳ Calculando autoría de {len(lineas)} líneas...")
+        
+        def pintar(tramos):
+            if not ventana.winfo_exists():
+                return
+            texto.configure(state="normal")
+            for inicio, cantidad, sha, _ in tramos:
+                autor, timestamp, _resumen = blame.commits.get(sha, ("", 0, ""))
+                fecha = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d') if timestamp else ""
+                # Solo la primera línea del tramo lleva la anotación completa
+                primera = f"{sha[:8]} {autor[:14]:<14} {fecha:<10}"[:ANCHO_ANOTACION - 2].ljust(ANCHO_ANOTACION - 2) + "│ "
+                resto = " " * (ANCHO_ANOTACION - 2) + "│ "
+                for k in range(cantidad):
+                    linea = inicio + k
+                    texto.delete(f"{linea}.0", f"{linea}.{ANCHO_ANOTACION}")
+                    texto.insert(f"{linea}.0", primera if k == 0 else resto, "anotacion")
+                estado["atribuidas"] += cantidad
+            texto.configure(state="disabled")
+            label_estado.configure(text=f"⏳ {estado['atribuidas']}/{estado['total']} líneas atribuidas...")
+        
+        def terminar(desde_cache, error):
+            if not ventana.winfo_exists():
+                return
+            if error:
+                label_estado.configure(text=f"❌ Error: {error[:150]}", text_color="#FF6B6B")
+            elif blame.cancelada:
+                label_estado.configure(text="⏹️ Blame cancelado", text_color="orange")
+            elif desde_cache:
+                label_estado.configure(text=f"✅ {estado['total']} líneas (desde la cache)", text_color="#90EE90")
+            else:
+                reutilizadas = f" · {blame.reutilizadas} reutilizadas del blame anterior" if blame.reutilizadas else ""
+                label_estado.configure(
+                    text=f"✅ {estado['total']} líneas · {len(blame.commits)} commits{reutilizadas}", 
+                    text_color="#90EE90")
+        
+        def cerrar():
+            blame.cancelar()
+            ventana.destroy()
+        
+        frame_btn = ctk.CTkFrame(ventana)
+        frame_btn.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_btn, text="❌ Cerrar", command=cerrar, 
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        ventana.protocol("WM_DELETE_WINDOW", cerrar)
+        
+        print(f"🔍 Blame de {archivo}")
+        blame = self.proyecto.blame_archivo(archivo)
+        # Los callbacks llegan desde el hilo del blame: se pasan al hilo de Tk con after
+        blame.iniciar(
+            lambda lineas: self.root.after(0, lambda: cargar(lineas)),
+            lambda tramos: self.root.after(0, lambda: pintar(tramos)),
+            lambda desde_cache, error: self.root.after(0, lambda: terminar(desde_cache, error)))
+
+    @medir("ui.cherry_pick")
     def cherry_pick(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
             return
         
-        commits = self.proyecto.get_commits_detallados(50)
+        # Un cherry-pick detenido por conflictos se retoma desde la ventana de conflictos
+        if self.proyecto.hay_cherry_pick_en_progreso():
+            self._gestionar_merge_en_progreso("cherry-pick")
+            return
+        
+        proyecto = self.proyecto
+        
+        def leer_commits():
+            return proyecto.get_commits_detallados(50), proyecto.get_rama_actual(), proyecto.listar_ramas()
+        
+        self.trabajos.enviar(leer_commits, prioridad=PRIORIDAD_INTERACTIVA,
+                             al_terminar=self._mostrar_ventana_cherry_pick, descripcion="commits para cherry-pick")
+
+    def _mostrar_ventana_cherry_pick(self, resultado):
+        if isinstance(resultado, str):
+            messagebox.showerror("Error", f"Error al obtener commits:\n{resultado}")
+            return
+        commits, rama_actual, ramas_info = resultado
         if not commits:
             messagebox.showinfo("Sin commits", "No hay commits disponibles.")
             return
@@ -3413,7 +4155,6 @@ class AetheryonDevCoreApp:
         ctk.CTkLabel(ventana_cherry, text="🍒 Cherry Pick - Aplicar Commits", 
                     font=("Arial", 16, "bold")).pack(pady=15)
         
-        rama_actual = self.proyecto.get_rama_actual()
         ctk.CTkLabel(ventana_cherry, 
                     text=f"Se aplicarán los commits seleccionados a la rama: {rama_actual}", 
                     font=("Arial", 11), text_color="#90EE90").pack(pady=5)
@@ -3424,8 +4165,9 @@ class AetheryonDevCoreApp:
         
         frame_info = ctk.CTkFrame(ventana_cherry, fg_color="#2B2B2B")
         frame_info.pack(fill="x", padx=10, pady=5)
-        ctk.CTkLabel(frame_info, text=f"📊 Total commits: {len(commits)}", 
-                    font=("Arial", 11)).pack(side="left", padx=10)
+        label_total = ctk.CTkLabel(frame_info, text=f"📊 Total commits: {len(commits)}", 
+                    font=("Arial", 11))
+        label_total.pack(side="left", padx=10)
         
         scrollable_cherry = ctk.CTkScrollableFrame(ventana_cherry, width=900, height=350)
         scrollable_cherry.pack(fill="both", expand=True, padx=10, pady=5)
@@ -3448,23 +4190,82 @@ class AetheryonDevCoreApp:
                 if commit in commits_seleccionados:
                     commits_seleccionados.remove(commit)
         
-        for commit in commits:
-            commit_frame = ctk.CTkFrame(scrollable_cherry, fg_color="#1E1E1E")
-            commit_frame.pack(fill="x", pady=1)
-            
-            var = ctk.BooleanVar()
-            checkbox = ctk.CTkCheckBox(commit_frame, text="", variable=var, width=30,
-                                       command=lambda c=commit, v=var: toggle_commit(c, v))
-            checkbox.pack(side="left", padx=2)
+        filas = []
+        
+        def mostrar_commits(lista):
+            # La selección se conserva entre búsquedas
+            for fila in filas:
+                fila.destroy()
+            filas.clear()
+            
+            for commit, relativo in zip(lista, tiempos_relativos(lista)):
+                commit_frame = ctk.CTkFrame(scrollable_cherry, fg_color="#1E1E1E")
+                commit_frame.pack(fill="x", pady=1)
+                filas.append(commit_frame)
+            
+                var = ctk.BooleanVar(value=commit in commits_seleccionados)
+                checkbox = ctk.CTkCheckBox(commit_frame, text="", variable=var, width=30,
+                                           command=lambda c=commit, v=var: toggle_commit(c, v))
+                checkbox.pack(side="left", padx=2)
+            
+                ctk.CTkLabel(commit_frame, text=commit.hash, font=("Courier", 9), width=80).pack(side="left", padx=2)
+                mensaje = commit.mensaje[:50] + "..." if len(commit.mensaje) > 50 else commit.mensaje
+                ctk.CTkLabel(commit_frame, text=mensaje, font=("Arial", 9), width=350, anchor="w").pack(side="left", padx=2)
+                autor = commit.autor.split('<')[0].strip()
+                ctk.CTkLabel(commit_frame, text=autor, font=("Arial", 9), width=150, anchor="w").pack(side="left", padx=2)
+                ctk.CTkLabel(commit_frame, text=commit.fecha, font=("Arial", 9), width=130).pack(side="left", padx=2)
+                ctk.CTkLabel(commit_frame, text=relativo, font=("Arial", 9), 
+                            width=100, text_color="#87CEEB").pack(side="left", padx=2)
+        
+        # Lista que se muestra cuando la búsqueda está vacía: el historial reciente
+        # o los candidatos de la rama origen elegida
+        base = {"commits": commits, "texto": f"📊 Total commits: {len(commits)}"}
+        
+        def al_buscar(resultados):
+            if resultados is None:
+                mostrar_commits(base["commits"])
+                label_total.configure(text=base["texto"])
+            else:
+                mostrar_commits(resultados)
+                label_total.configure(text=f"🔎 Resultados: {len(resultados)}")
+        
+        historial_actual = "📜 Historial actual"
+        origenes = [r for r in ramas_info['locales'] if r != rama_actual]
+        origenes += [f"origin/{r}" for r in ramas_info['remotas']]
+        
+        def mostrar_candidatos(rama, resultado):
+            if not ventana_cherry.winfo_exists() or selector_origen.get() != rama:
+                return
+            if isinstance(resultado, str):
+                messagebox.showerror("Error", f"No se pudieron comparar las ramas:\n{resultado}", parent=ventana_cherry)
+                return
+            ocultos = resultado['equivalentes'] + resultado['sin_cambios']
+            base["commits"] = resultado['candidatos']
+            base["texto"] = f"📊 Pendientes de {rama}: {len(resultado['candidatos'])}"
+            if ocultos:
+                base["texto"] += f" · {ocultos} ya aplicados ocultos"
+            mostrar_commits(base["commits"])
+            label_total.configure(text=base["texto"])
+        
+        def al_elegir_origen(rama):
+            if rama == historial_actual:
+                base["commits"] = commits
+                base["texto"] = f"📊 Total commits: {len(commits)}"
+                mostrar_commits(commits)
+                label_total.configure(text=base["texto"])
+                return
+            label_total.configure(text=f"⏳ Comparando con {rama}...")
             
-            ctk.CTkLabel(commit_frame, text=commit['hash'], font=("Courier", 9), width=80).pack(side="left", padx=2)
-            mensaje = commit['mensaje'][:50] + "..." if len(commit['mensaje']) > 50 else commit['mensaje']
-            ctk.CTkLabel(commit_frame, text=mensaje, font=("Arial", 9), width=350, anchor="w").pack(side="left", padx=2)
-            autor = commit['autor'].split('<')[0].strip()
-            ctk.CTkLabel(commit_frame, text=autor, font=("Arial", 9), width=150, anchor="w").pack(side="left", padx=2)
-            ctk.CTkLabel(commit_frame, text=commit['fecha'], font=("Arial", 9), width=130).pack(side="left", padx=2)
-            ctk.CTkLabel(commit_frame, text=commit['fecha_relativa'], font=("Arial", 9), 
-                        width=100, text_color="#87CEEB").pack(side="left", padx=2)
+            self.trabajos.enviar(self.proyecto.get_candidatos_cherry_pick, rama, prioridad=PRIORIDAD_INTERACTIVA,
+                                 al_terminar=lambda resultado: mostrar_candidatos(rama, resultado),
+                                 descripcion=f"candidatos cherry-pick {rama}")
+        
+        selector_origen = ctk.CTkOptionMenu(frame_info, values=[historial_actual] + origenes,
+                                            command=al_elegir_origen, width=180)
+        selector_origen.pack(side="left", padx=10)
+        
+        self._crear_buscador_commits(ventana_cherry, frame_info, al_buscar)
+        mostrar_commits(commits)
         
         def aplicar_cherry_pick():
             if not commits_seleccionados:
@@ -3480,60 +4281,41 @@ class AetheryonDevCoreApp:
             
             ventana_cherry.destroy()
             
-            exitos = []
-            errores = []
-            
-            for commit in commits_seleccionados:
-                print(f"🍒 Cherry-picking: {commit['hash']} - {commit['mensaje']}")
-                resultado = self.proyecto.cherry_pick_commit(commit['hash_completo'])
-                
-                if resultado == True:
-                    exitos.append(commit['hash'])
-                else:
-                    errores.append((commit['hash'], resultado))
-            
-            ventana_resultado = ctk.CTkToplevel(self.root)
-            ventana_resultado.title("🍒 Resultado Cherry Pick")
-            ventana_resultado.geometry("600x400")
-            ventana_resultado.transient(self.root)
-            ventana_resultado.attributes('-topmost', True)
-            ventana_resultado.grab_set()
-            
-            if errores:
-                ctk.CTkLabel(ventana_resultado, text="⚠️ Cherry Pick Completado con Errores", 
-                            font=("Arial", 14, "bold"), text_color="orange").pack(pady=15)
-            else:
-                ctk.CTkLabel(ventana_resultado, text="✅ Cherry Pick Exitoso", 
-                            font=("Arial", 14, "bold"), text_color="green").pack(pady=15)
+            # Del más viejo al más nuevo, en una sola corrida del secuenciador
+            ordenados = sorted(commits_seleccionados, key=lambda c: c.timestamp)
+            hashes = [c.hash_completo for c in ordenados]
+            self._ejecutar_cherry_pick(
+                lambda al_progreso: self.proyecto.cherry_pick_commits(hashes, al_progreso), len(hashes))
+        
+        def aplicar_rango():
+            rango = CTkInputDialog(
+                parent=ventana_cherry,
+                title="📏 Cherry Pick de un Rango",
+                prompt="Rango de commits (ej: abc1234..def5678 o main..feature):",
+                initialvalue="main..feature"
+            ).result
+            
+            if not rango:
+                return
+            if '..' not in rango:
+                messagebox.showwarning("Rango inválido", "Usá la forma desde..hasta (el primero no se incluye).",
+                                       parent=ventana_cherry)
+                return
             
-            ctk.CTkLabel(ventana_resultado, text=f"✅ Exitosos: {len(exitos)} | ❌ Errores: {len(errores)}", 
-                        font=("Arial", 12)).pack(pady=5)
+            hashes = self.proyecto.listar_rango(rango)
+            if not hashes:
+                messagebox.showinfo("Rango vacío", f"No hay commits en '{rango}'.", parent=ventana_cherry)
+                return
             
-            scroll_result = ctk.CTkScrollableFrame(ventana_resultado, width=550, height=250)
-            scroll_result.pack(pady=10, padx=20)
-            
-            if exitos:
-                ctk.CTkLabel(scroll_result, text="✅ Commits aplicados:", 
-                            font=("Arial", 11, "bold"), text_color="green").pack(anchor="w", pady=5)
-                for hash_commit in exitos:
-                    ctk.CTkLabel(scroll_result, text=f"  ✓ {hash_commit}", 
-                                font=("Courier", 9), text_color="#90EE90").pack(anchor="w", pady=1)
-            
-            if errores:
-                ctk.CTkLabel(scroll_result, text="❌ Commits con errores:", 
-                            font=("Arial", 11, "bold"), text_color="red").pack(anchor="w", pady=5)
-                for hash_commit, error in errores:
-                    ctk.CTkLabel(scroll_result, text=f"  ✗ {hash_commit}", 
-                                font=("Courier", 9), text_color="#FF6B6B").pack(anchor="w", pady=1)
-                    ctk.CTkLabel(scroll_result, text=f"     {str(error)[:80]}", 
-                                font=("Arial", 8), text_color="gray").pack(anchor="w", pady=1)
-            
-            ctk.CTkButton(ventana_resultado, text="✅ Cerrar", 
-                         command=ventana_resultado.destroy,
-                         fg_color="green", width=120).pack(pady=15)
+            respuesta = messagebox.askyesno("Confirmar Cherry Pick",
+                f"¿Aplicar los {len(hashes)} commit(s) de '{rango}' a la rama '{rama_actual}'?",
+                parent=ventana_cherry)
+            if not respuesta:
+                return
             
-            self.actualizar_rama_display()
-            self.ver_archivos()
+            ventana_cherry.destroy()
+            self._ejecutar_cherry_pick(
+                lambda al_progreso: self.proyecto.cherry_pick_commits(hashes, al_progreso), len(hashes))
         
         button_frame = ctk.CTkFrame(ventana_cherry, fg_color="transparent")
         button_frame.pack(pady=15)
@@ -3542,10 +4324,63 @@ class AetheryonDevCoreApp:
                      command=aplicar_cherry_pick,
                      fg_color="#D32F2F", hover_color="#B71C1C", 
                      width=180, height=40, font=("Arial", 12, "bold")).pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="📏 Rango...", 
+                     command=aplicar_rango,
+                     fg_color="#AD1457", width=120, height=40).pack(side="left", padx=5)
         ctk.CTkButton(button_frame, text="❌ Cancelar", 
                      command=ventana_cherry.destroy,
                      fg_color="gray", width=120, height=40).pack(side="left", padx=5)
 
+    def _ejecutar_cherry_pick(self, funcion, total):
+        """
+        Corre un cherry-pick (nuevo, --continue o --skip) en segundo plano mostrando
+        el progreso commit a commit. Si se frena por conflictos abre la ventana de conflictos.
+        """
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title("🍒 Cherry Pick en Progreso")
+        ventana.geometry("650x420")
+        ventana.transient(self.root)
+        ventana.attributes('-topmost', True)
+        
+        ctk.CTkLabel(ventana, text="🍒 Aplicando commits...", font=("Arial", 14, "bold")).pack(pady=15)
+        label_progreso = ctk.CTkLabel(ventana, text=f"0 / {total}", font=("Arial", 12))
+        label_progreso.pack(pady=5)
+        barra = ctk.CTkProgressBar(ventana, width=500)
+        barra.set(0)
+        barra.pack(pady=5)
+        
+        registro = ctk.CTkTextbox(ventana, font=("Courier", 9), height=220)
+        registro.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        def progreso(aplicados, linea):
+            if not ventana.winfo_exists():
+                return
+            label_progreso.configure(text=f"{aplicados} / {total}")
+            barra.set(min(1.0, aplicados / total) if total else 1)
+            registro.insert("end", f"✓ {linea}\n")
+            registro.see("end")
+        
+        def terminar(resultado):
+            if ventana.winfo_exists():
+                ventana.destroy()
+            self.actualizar_rama_display()
+            self.ver_archivos()
+            
+            if resultado == True:
+                messagebox.showinfo("Cherry Pick Exitoso", 
+                    f"✅ Se aplicaron los commits a la rama '{self.proyecto.get_rama_actual()}'.")
+            elif self.proyecto.hay_cherry_pick_en_progreso():
+                messagebox.showwarning("Conflictos", 
+                    "⚠️ El cherry-pick se detuvo por conflictos.\n\n"
+                    "Resolvelos y elegí continuar, saltar el commit o abortar.")
+                self._gestionar_merge_en_progreso("cherry-pick")
+            else:
+                messagebox.showerror("Error Cherry Pick", f"Error al aplicar los commits:\n{resultado}")
+        
+        self.trabajos.enviar(
+            funcion, lambda aplicados, linea: self.root.after(0, lambda: progreso(aplicados, linea)),
+            escritura=True, prioridad=PRIORIDAD_INTERACTIVA, al_terminar=terminar, descripcion="cherry-pick")
+
     def ver_commits_por_archivo(self):
         if not self.proyecto or not self.proyecto.repo:
             messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
@@ -3561,12 +4396,115 @@ class AetheryonDevCoreApp:
         if not archivo_seleccionado:
             return
         
-        commits = self.proyecto.get_commits_por_archivo(archivo_seleccionado, 30)
-        if not commits:
-            messagebox.showinfo("Sin commits", f"No hay commits que afecten el archivo '{archivo_seleccionado}'.")
+        def mostrar(commits):
+            if isinstance(commits, str):
+                messagebox.showerror("Error", f"Error al obtener commits:\n{commits}")
+            elif not commits:
+                messagebox.showinfo("Sin commits", f"No hay commits que afecten el archivo '{archivo_seleccionado}'.")
+            else:
+                self._mostrar_ventana_commits_archivo(archivo_seleccionado, commits)
+        
+        self.trabajos.enviar(self.proyecto.get_commits_por_archivo, archivo_seleccionado, 30,
+                             prioridad=PRIORIDAD_INTERACTIVA, al_terminar=mostrar,
+                             descripcion=f"historial de {archivo_seleccionado}")
+
+    # ==================== ESTADÍSTICAS ====================
+
+    @medir("ui.ver_estadisticas")
+    def ver_estadisticas(self):
+        """Dashboard de churn y autoría de la rama actual"""
+        if not self.proyecto or not self.proyecto.repo:
+            messagebox.showwarning("Sin Git", "No hay repositorio Git inicializado.")
+            return
+        if cargar_numpy() is None:
+            messagebox.showinfo("NumPy no instalado", 
+                               "El dashboard de estadísticas necesita NumPy.\n\nInstalalo con: pip install numpy")
             return
         
-        self._mostrar_ventana_commits_archivo(archivo_seleccionado, commits)
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title("📈 Estadísticas del Repositorio")
+        ventana.geometry("1000x700")
+        ventana.transient(self.root)
+        
+        rama = self.proyecto.get_rama_actual()
+        ctk.CTkLabel(ventana, text=f"📈 Estadísticas - Rama: {rama}", 
+                    font=("Arial", 16, "bold")).pack(pady=10)
+        label_resumen = ctk.CTkLabel(ventana, text="⏳ Analizando historial (la primera vez puede tardar)...", 
+                                    font=("Arial", 12))
+        label_resumen.pack(pady=5)
+        
+        def tabla(parent, columnas, filas):
+            scroll = ctk.CTkScrollableFrame(parent)
+            scroll.pack(fill="both", expand=True, padx=5, pady=5)
+            header = ctk.CTkFrame(scroll, fg_color="#1E3A5F")
+            header.pack(fill="x", pady=2)
+            for titulo, ancho in columnas:
+                ctk.CTkLabel(header, text=titulo, font=("Arial", 10, "bold"), width=ancho).pack(side="left", padx=2)
+            for fila in filas:
+                frame = ctk.CTkFrame(scroll, fg_color="#1E1E1E")
+                frame.pack(fill="x", pady=1)
+                for valor, (_, ancho) in zip(fila, columnas):
+                    ctk.CTkLabel(frame, text=str(valor), font=("Arial", 9), width=ancho, 
+                                anchor="w").pack(side="left", padx=2)
+        
+        def grafico_semanas(parent, semanas):
+            canvas = ctk.CTkCanvas(parent, bg="#1E1E1E", highlightthickness=0, height=380)
+            canvas.pack(fill="both", expand=True, padx=5, pady=5)
+            
+            def dibujar(_evento=None):
+                canvas.delete("all")
+                if not semanas:
+                    return
+                ancho = canvas.winfo_width()
+                alto = canvas.winfo_height()
+                maximo = max(mas + menos for _, _, mas, menos in semanas) or 1
+                paso = (ancho - 40) / len(semanas)
+                base = alto - 30
+                for k, (inicio, commits, mas, menos) in enumerate(semanas):
+                    x0 = 20 + k * paso
+                    x1 = x0 + max(1, paso - 2)
+                    y_mas = base - (base - 20) * mas / maximo
+                    y_menos = y_mas - (base - 20) * menos / maximo
+                    canvas.create_rectangle(x0, y_mas, x1, base, fill="#81C784", outline="")
+                    canvas.create_rectangle(x0, y_menos, x1, y_mas, fill="#E57373", outline="")
+                    if k % max(1, len(semanas) // 8) == 0:
+                        canvas.create_text(x0, base + 12, anchor="w", fill="gray", font=("Arial", 8),
+                                           text=datetime.fromtimestamp(inicio).strftime('%Y-%m-%d'))
+                canvas.create_text(20, 10, anchor="w", fill="white", font=("Arial", 9),
+                                   text=f"🟩 agregadas  🟥 eliminadas  (máx. {maximo} líneas/semana)")
+            
+            canvas.bind("<Configure>", dibujar)
+        
+        def mostrar(resultado):
+            if not ventana.winfo_exists():
+                return
+            if isinstance(resultado, str):
+                label_resumen.configure(text=f"❌ Error: {resultado[:150]}", text_color="#FF6B6B")
+                return
+            
+            label_resumen.configure(
+                text=f"📊 {resultado['commits']} commits · 👥 {resultado['autores']} autores · "
+                     f"📂 {resultado['archivos']} archivos · +{resultado['agregadas']} / −{resultado['eliminadas']} líneas")
+            
+            pestañas = ctk.CTkTabview(ventana)
+            pestañas.pack(fill="both", expand=True, padx=10, pady=5)
+            
+            tabla(pestañas.add("🔥 Archivos calientes"),
+                  [("Archivo", 450), ("Commits", 80), ("+ Agregadas", 100), ("− Eliminadas", 100)],
+                  resultado['archivos_calientes'])
+            tabla(pestañas.add("👥 Autores"),
+                  [("Autor", 300), ("Commits", 80), ("+ Agregadas", 100), ("− Eliminadas", 100)],
+                  resultado['por_autor'])
+            grafico_semanas(pestañas.add("📅 Por semana"), resultado['por_semana'])
+            tabla(pestañas.add("🚌 Bus factor"),
+                  [("Directorio", 300), ("Bus factor", 90), ("Autor principal", 250), ("% líneas", 80)],
+                  [(d, f"{'⚠️ ' if factor == 1 else ''}{factor}", autor, f"{porcentaje}%")
+                   for d, factor, autor, porcentaje in resultado['bus_factor']])
+        
+        self.trabajos.enviar(self.proyecto.get_estadisticas, al_terminar=mostrar, descripcion="estadísticas")
+        
+        ctk.CTkButton(ventana, text="❌ Cerrar", command=ventana.destroy, 
+                     fg_color="gray", width=100).pack(side="bottom", pady=10)
 
     # ==================== TAGS ====================
 
@@ -3654,20 +4592,20 @@ class AetheryonDevCoreApp:
             tframe = ctk.CTkFrame(scrollable_tags, fg_color="#1E1E1E")
             tframe.pack(fill="x", pady=1)
             
-            radio = ctk.CTkRadioButton(tframe, text="", value=tag['nombre'],
+            radio = ctk.CTkRadioButton(tframe, text="", value=tag.nombre,
                                        command=lambda t=tag: select_tag(t), width=20)
             radio.pack(side="left", padx=2)
             
-            ctk.CTkLabel(tframe, text=tag['nombre'], font=("Arial", 9, "bold"), 
+            ctk.CTkLabel(tframe, text=tag.nombre, font=("Arial", 9, "bold"), 
                         width=100, text_color="#FFD700").pack(side="left", padx=2)
-            ctk.CTkLabel(tframe, text=tag['hash'], font=("Courier", 9), width=80).pack(side="left", padx=2)
-            msg_t = tag['mensaje_tag'][:25] + "..." if len(tag['mensaje_tag']) > 25 else tag['mensaje_tag']
+            ctk.CTkLabel(tframe, text=tag.commit.hash, font=("Courier", 9), width=80).pack(side="left", padx=2)
+            msg_t = tag.mensaje_tag[:25] + "..." if len(tag.mensaje_tag) > 25 else tag.mensaje_tag
             ctk.CTkLabel(tframe, text=msg_t, font=("Arial", 9), width=150).pack(side="left", padx=2)
-            msg_c = tag['mensaje_commit'][:35] + "..." if len(tag['mensaje_commit']) > 35 else tag['mensaje_commit']
+            msg_c = tag.commit.mensaje[:35] + "..." if len(tag.commit.mensaje) > 35 else tag.commit.mensaje
             ctk.CTkLabel(tframe, text=msg_c, font=("Arial", 9), width=200, anchor="w").pack(side="left", padx=2)
-            autor = tag['autor'].split('<')[0].strip()
+            autor = tag.commit.autor.split('<')[0].strip()
             ctk.CTkLabel(tframe, text=autor, font=("Arial", 9), width=120, anchor="w").pack(side="left", padx=2)
-            ctk.CTkLabel(tframe, text=tag['fecha'], font=("Arial", 9), width=130).pack(side="left", padx=2)
+            ctk.CTkLabel(tframe, text=tag.commit.fecha, font=("Arial", 9), width=130).pack(side="left", padx=2)
         
         frame_btn = ctk.CTkFrame(ventana_tags)
         frame_btn.pack(fill="x", padx=10, pady=10)
@@ -3679,15 +4617,15 @@ class AetheryonDevCoreApp:
             
             tag = selected_tag["data"]
             respuesta = messagebox.askyesno("Eliminar Tag", 
-                f"¿Eliminar el tag '{tag['nombre']}'?\n\n"
-                f"Hash: {tag['hash']}\n"
-                f"Fecha: {tag['fecha']}\n\n"
+                f"¿Eliminar el tag '{tag.nombre}'?\n\n"
+                f"Hash: {tag.commit.hash}\n"
+                f"Fecha: {tag.commit.fecha}\n\n"
                 "⚠️ Esta acción no se puede deshacer.")
             
             if respuesta:
-                resultado = self.proyecto.eliminar_tag(tag['nombre'])
+                resultado = self.proyecto.eliminar_tag(tag.nombre)
                 if resultado == True:
-                    messagebox.showinfo("Tag eliminado", f"✅ Tag '{tag['nombre']}' eliminado.")
+                    messagebox.showinfo("Tag eliminado", f"✅ Tag '{tag.nombre}' eliminado.")
                     ventana_tags.destroy()
                     self.gestionar_tags()
                 else:
@@ -3745,20 +4683,21 @@ class AetheryonDevCoreApp:
         )
         
         def clonar():
-            try:
-                proyecto_temp = Proyecto(".")
-                resultado = proyecto_temp.clonar_repo(url, directorio_destino)
-                self.root.after(0, lambda: self._procesar_clonado(resultado, directorio_destino, ventana_progreso))
-            except Exception as e:
-                self.root.after(0, lambda: self._manejar_error(e, ventana_progreso))
+            return Proyecto(".").clonar_repo(url, directorio_destino)
         
-        threading.Thread(target=clonar, daemon=True).start()
+        # No toca el repositorio abierto: corre como lectura, en paralelo con el resto
+        self.trabajos.enviar(
+            clonar, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._procesar_clonado(resultado, directorio_destino, ventana_progreso),
+            descripcion=f"clone {url}")
 
     def _procesar_clonado(self, resultado, directorio_destino, ventana_progreso):
         ventana_progreso.destroy()
         
         if resultado == True:
             self.path_var.set(directorio_destino)
+            if self.proyecto:
+                self.proyecto.cerrar()
             self.proyecto = Proyecto(directorio_destino)
             self.actualizar_rama_display()
             
@@ -3801,14 +4740,102 @@ class AetheryonDevCoreApp:
             "Esto puede tomar unos segundos...\n(Inicializando repo, commit inicial, creando en GitHub)"
         )
         
-        def crear_repo():
+        self.trabajos.enviar(
+            self.proyecto.crear_repo_gh, nombre, visibilidad, escritura=True, prioridad=PRIORIDAD_INTERACTIVA,
+            al_terminar=lambda resultado: self._procesar_resultado_repo(resultado, ventana_progreso, nombre),
+            descripcion=f"crear repo GitHub {nombre}")
+
+    def ver_rendimiento(self):
+        """Panel ⏱ Performance (Ctrl+Shift+P): latencias por operación y procesos de git"""
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title("⏱ Performance")
+        ventana.geometry("1000x600")
+        ventana.attributes('-topmost', True)
+        
+        label_estado = ctk.CTkLabel(ventana, text="", font=("Arial", 11))
+        label_estado.pack(pady=5)
+        texto = ctk.CTkTextbox(ventana, font=("Courier", 10), wrap="none")
+        texto.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        def refrescar():
+            if not ventana.winfo_exists():
+                return
+            resumen = METRICAS.resumen()
+            lineas = []
+            if self.arranque:
+                lineas += ["Arranque: " + " · ".join(f"{fase} {ms:.0f} ms" for fase, ms in self.arranque.items()), ""]
+            lineas += [f"{'Operación':<48}{'llamadas':>9}{'total ms':>11}{'p50':>9}{'p95':>9}{'p99':>9}{'máx':>9}"]
+            for nombre, fila in sorted(resumen['operaciones'].items(), key=lambda par: -par[1]['total_ms']):
+                lineas.append(f"{nombre[:47]:<48}{fila['llamadas']:>9}{fila['total_ms']:>11.1f}"
+                              f"{fila['p50_ms']:>9.1f}{fila['p95_ms']:>9.1f}{fila['p99_ms']:>9.1f}{fila['max_ms']:>9.1f}")
+            lineas += ["", f"{'Proceso':<48}{'procesos':>9}{'total ms':>11}{'leído':>12}"]
+            for comando, datos in sorted(resumen['subprocesos'].items(), key=lambda par: -par[1]['procesos']):
+                lineas.append(f"{comando[:47]:<48}{datos['procesos']:>9}{datos['total_ms']:>11.1f}"
+                              f"{tamaño_legible(datos['bytes']):>12}")
+            
+            posicion = texto.yview()[0]
+            texto.configure(state="normal")
+            texto.delete("1.0", "end")
+            texto.insert("1.0", "\n".join(lineas))
+            texto.configure(state="disabled")
+            texto.yview_moveto(posicion)
+            
+            procesos = sum(datos['procesos'] for datos in resumen['subprocesos'].values())
+            desde = datetime.fromtimestamp(resumen['desde']).strftime('%H:%M:%S')
+            label_estado.configure(text=f"Desde {desde} · {len(resumen['operaciones'])} operaciones · "
+                                        f"{procesos} procesos de git")
+            ventana.after(1000, refrescar)
+        
+        def reiniciar():
+            METRICAS.reiniciar()
+        
+        def exportar():
+            ruta = filedialog.asksaveasfilename(parent=ventana, defaultextension=".json",
+                                                initialfile="aetheryon-metricas.json",
+                                                filetypes=[("JSON", "*.json")])
+            if not ruta:
+                return
             try:
-                resultado = self.proyecto.crear_repo_gh(nombre, visibilidad)
-                self.root.after(0, lambda: self._procesar_resultado_repo(resultado, ventana_progreso, nombre))
-            except Exception as e:
-                self.root.after(0, lambda: self._manejar_error(e, ventana_progreso))
+                METRICAS.exportar_json(ruta)
+                print(f"💾 Métricas exportadas a {ruta}")
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo guardar:\n{e}", parent=ventana)
+        
+        def alternar_traza():
+            if not TRAZADOR.activo:
+                TRAZADOR.iniciar()
+                boton_traza.configure(text="⏹ Detener traza", fg_color="#C62828")
+                print("🔴 Grabando traza...")
+                return
+            eventos = TRAZADOR.detener()
+            boton_traza.configure(text="🔴 Grabar traza", fg_color="#6A1B9A")
+            ruta = filedialog.asksaveasfilename(parent=ventana, defaultextension=".json",
+                                                initialfile="aetheryon-traza.json",
+                                                filetypes=[("Chrome Trace / Perfetto", "*.json")])
+            if not ruta:
+                return
+            try:
+                TRAZADOR.exportar_json(ruta)
+                messagebox.showinfo("Traza guardada",
+                    f"✅ {eventos} eventos guardados en:\n{ruta}\n\n"
+                    "Abrila en ui.perfetto.dev o chrome://tracing", parent=ventana)
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo guardar:\n{e}", parent=ventana)
         
-        threading.Thread(target=crear_repo, daemon=True).start()
+        frame_btn = ctk.CTkFrame(ventana)
+        frame_btn.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(frame_btn, text="🧹 Reiniciar", command=reiniciar,
+                     fg_color="#546E7A", width=110).pack(side="left", padx=5)
+        ctk.CTkButton(frame_btn, text="💾 Exportar JSON", command=exportar,
+                     fg_color="#1E90FF", width=140).pack(side="left", padx=5)
+        boton_traza = ctk.CTkButton(frame_btn, text="🔴 Grabar traza", command=alternar_traza,
+                                    fg_color="#6A1B9A", width=140)
+        if TRAZADOR.activo:
+            boton_traza.configure(text="⏹ Detener traza", fg_color="#C62828")
+        boton_traza.pack(side="left", padx=5)
+        ctk.CTkButton(frame_btn, text="❌ Cerrar", command=ventana.destroy,
+                     fg_color="gray", width=100).pack(side="right", padx=5)
+        refrescar()
 
     def _procesar_resultado_repo(self, resultado, ventana_progreso, nombre):
         ventana_progreso.destroy()
@@ -3829,6 +4856,19 @@ class AetheryonDevCoreApp:
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--verificar-backends":
+        _imprimir_verificacion_backends(sys.argv[2] if len(sys.argv) > 2 else ".")
+        sys.exit(0)
+    # AETHERYON_TRAZA=archivo.json graba toda la sesión y la guarda al salir
+    if os.environ.get("AETHERYON_TRAZA"):
+        TRAZADOR.iniciar()
+        atexit.register(TRAZADOR.exportar_json, os.environ["AETHERYON_TRAZA"])
     root = ctk.CTk()
     app = AetheryonDevCoreApp(root)
+    if len(sys.argv) > 1 and sys.argv[1] == "--medir-arranque":
+        # Sale apenas se pinta la ventana e imprime el desglose en JSON (para comparar corridas)
+        def salir_tras_pintar():
+            print(json.dumps(app.arranque))
+            root.destroy()
+        root.after_idle(salir_tras_pintar)
     root.mainloop()
\ No newline at end of file
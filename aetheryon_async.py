@@ -0,0 +1,241 @@
+"""
+Fachada asyncio de Proyecto (AsyncProyecto) y el loop en segundo plano que la
+conecta con Tk. Va aparte de aetheryon_core porque importar asyncio es caro y
+solo lo necesitan push, pull, fetch, log, status y commit.
+"""
+import asyncio
+import threading
+
+from aetheryon_core import (
+    FLAGS_SUBPROCESO, METRICAS, TRAZADOR, ErrorGit, ErrorGitAusente, ErrorTiempoGit,
+    _error_de_git, _subcomando_git, medir_subproceso,
+)
+
+# Segundos sin respuesta antes de cortar git; las operaciones de red tienen más margen
+TIMEOUT_GIT = 60
+TIMEOUT_GIT_RED = 300
+
+# Límite de una línea de salida en streaming (mensajes de commit muy largos)
+LIMITE_LINEA_ASYNC = 1 << 24
+
+FORMATO_LOG_ASYNC = '%H%x1f%an%x1f%ct%x1f%s'
+
+
+class BucleAsincrono:
+    """
+    Loop de asyncio en un hilo propio. Desde Tk (o cualquier hilo) se le pasan
+    corrutinas con `enviar`, y los resultados vuelven con `despachar`; el código
+    sincrónico puede esperarlas con `ejecutar`.
+    """
+
+    def __init__(self, despachar=None):
+        self.despachar = despachar or (lambda funcion: funcion())
+        self.loop = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self._correr, name="aetheryon-asyncio", daemon=True)
+        self._hilo.start()
+
+    def _correr(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def enviar(self, corrutina, al_terminar=None, al_error=None):
+        """Programa la corrutina; callbacks en el hilo de Tk. Devuelve un concurrent.futures.Future"""
+        futuro = asyncio.run_coroutine_threadsafe(corrutina, self.loop)
+
+        def listo(futuro):
+            if futuro.cancelled():
+                return
+            error = futuro.exception()
+            if error is None:
+                if al_terminar:
+                    self.despachar(lambda: al_terminar(futuro.result()))
+            elif al_error:
+                self.despachar(lambda: al_error(error))
+            else:
+                print(f"❌ Error en operación asíncrona: {error}")
+
+        futuro.add_done_callback(listo)
+        return futuro
+
+    def ejecutar(self, corrutina, timeout=None):
+        """Espera el resultado desde un hilo que no sea el del loop (propaga las excepciones)"""
+        if threading.current_thread() is self._hilo:
+            raise RuntimeError("ejecutar() no se puede llamar desde el propio loop")
+        return asyncio.run_coroutine_threadsafe(corrutina, self.loop).result(timeout)
+
+    def cerrar(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_bucle_asincrono = None
+_lock_bucle_asincrono = threading.Lock()
+
+
+def bucle_asincrono(despachar=None):
+    """Loop compartido por todos los proyectos; la app le indica cómo volver al hilo de Tk"""
+    global _bucle_asincrono
+    with _lock_bucle_asincrono:
+        if _bucle_asincrono is None:
+            _bucle_asincrono = BucleAsincrono(despachar)
+        elif despachar:
+            _bucle_asincrono.despachar = despachar
+        return _bucle_asincrono
+
+
+class AsyncProyecto:
+    """
+    Operaciones de git como corrutinas sobre asyncio.create_subprocess_exec.
+
+    A diferencia de Proyecto, los errores se lanzan como excepciones tipadas
+    (ErrorGit y derivadas) y cada llamada tiene timeout: si git no responde se
+    mata el proceso. Al ser corrutinas se pueden combinar con asyncio.gather,
+    por ejemplo hacer fetch de varios remotos mientras se calcula el status.
+    """
+
+    def __init__(self, path, bucle=None):
+        self.path = path
+        self.bucle = bucle or bucle_asincrono()
+
+    async def _lanzar(self, comando, entrada=False):
+        try:
+            return await asyncio.create_subprocess_exec(
+                *comando, cwd=self.path,
+                stdin=asyncio.subprocess.PIPE if entrada else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                limit=LIMITE_LINEA_ASYNC, creationflags=FLAGS_SUBPROCESO)
+        except FileNotFoundError as e:
+            raise ErrorGitAusente(comando, None, str(e))
+
+    @staticmethod
+    async def _matar(proceso):
+        if proceso.returncode is None:
+            try:
+                proceso.kill()
+            except ProcessLookupError:
+                pass
+            # Un hijo de git (ssh, hooks) puede seguir con los pipes abiertos: no se lo espera para siempre
+            try:
+                await asyncio.wait_for(proceso.wait(), 2)
+            except asyncio.TimeoutError:
+                pass
+
+    async def git(self, *args, entrada=None, timeout=TIMEOUT_GIT):
+        """stdout de git en bytes. ErrorGit si falla, ErrorTiempoGit si pasa el timeout"""
+        comando = ['git', *args]
+        with medir_subproceso(comando) as medicion:
+            proceso = await self._lanzar(comando, entrada is not None)
+            try:
+                stdout, stderr = await asyncio.wait_for(proceso.communicate(entrada), timeout)
+            except asyncio.TimeoutError:
+                await self._matar(proceso)
+                raise ErrorTiempoGit(comando, None, f"Sin respuesta después de {timeout} s")
+            except asyncio.CancelledError:
+                await self._matar(proceso)
+                raise
+            medicion.bytes = len(stdout)
+        if proceso.returncode != 0:
+            raise _error_de_git(comando, proceso.returncode, stdout, stderr)
+        return stdout
+
+    async def texto(self, *args, timeout=TIMEOUT_GIT):
+        salida = await self.git(*args, timeout=timeout)
+        return salida.decode('utf-8', 'replace').rstrip('\n')
+
+    async def lineas(self, *args, separador=b'\n', timeout=TIMEOUT_GIT):
+        """
+        Genera la salida de git registro a registro a medida que llega. El timeout
+        cuenta desde el último dato recibido, así un log largo no se corta.
+        """
+        comando = ['git', *args]
+        METRICAS.registrar_subproceso(comando)
+        TRAZADOR.instante(_subcomando_git(comando), 'git', argv=' '.join(comando)[:500])
+        proceso = await self._lanzar(comando)
+        # stderr se lee aparte para que un pipe lleno no trabe a git
+        stderr = asyncio.ensure_future(proceso.stderr.read())
+        terminado = False
+        try:
+            while True:
+                try:
+                    registro = await asyncio.wait_for(proceso.stdout.readuntil(separador), timeout)
+                except asyncio.IncompleteReadError as e:
+                    if e.partial:
+                        yield e.partial.decode('utf-8', 'replace')
+                    break
+                except asyncio.TimeoutError:
+                    raise ErrorTiempoGit(comando, None, f"Sin datos después de {timeout} s")
+                METRICAS.sumar_bytes(comando, len(registro))
+                yield registro[:-len(separador)].decode('utf-8', 'replace')
+            codigo = await proceso.wait()
+            terminado = True
+            if codigo != 0:
+                raise _error_de_git(comando, codigo, b'', await stderr)
+        finally:
+            if not terminado:
+                stderr.cancel()
+                await self._matar(proceso)
+
+    async def rama_actual(self):
+        try:
+            return await self.texto('symbolic-ref', '--short', '-q', 'HEAD')
+        except ErrorGit:
+            return "HEAD detached"
+
+    async def ramas(self):
+        salida = await self.texto('for-each-ref', '--format=%(refname:short)', 'refs/heads')
+        return salida.splitlines()
+
+    async def remotos(self):
+        salida = await self.texto('remote')
+        return salida.splitlines()
+
+    async def status(self):
+        """Entradas de `status --porcelain`: dicts con indice, arbol, ruta y ruta_anterior"""
+        entradas = []
+        registros = self.lineas('status', '--porcelain=v1', '-z', separador=b'\0')
+        async for registro in registros:
+            entrada = {'indice': registro[0], 'arbol': registro[1], 'ruta': registro[3:], 'ruta_anterior': None}
+            # En renombres y copias la ruta original viene en el registro siguiente
+            if entrada['indice'] in 'RC':
+                entrada['ruta_anterior'] = await registros.__anext__()
+            entradas.append(entrada)
+        return entradas
+
+    async def status_texto(self):
+        return await self.texto('status')
+
+    async def log(self, max_count=10):
+        return await self.texto('log', '--oneline', f'--max-count={max_count}')
+
+    async def iterar_log(self, rango='HEAD', max_count=None):
+        """Genera los commits de a uno (hash, autor, fecha, mensaje) mientras git los produce"""
+        args = ['log', f'--format={FORMATO_LOG_ASYNC}', rango]
+        if max_count:
+            args.insert(1, f'--max-count={max_count}')
+        async for linea in self.lineas(*args):
+            sha, autor, fecha, mensaje = linea.split('\x1f', 3)
+            yield {'hash': sha, 'autor': autor, 'fecha': int(fecha), 'mensaje': mensaje}
+
+    async def fetch(self, remoto=None, timeout=TIMEOUT_GIT_RED):
+        await self.git('fetch', *([remoto] if remoto else []), timeout=timeout)
+
+    async def fetch_remotos(self, remotos=None, timeout=TIMEOUT_GIT_RED):
+        """Fetch de todos los remotos en paralelo: {remoto: True o ErrorGit}"""
+        remotos = remotos or await self.remotos()
+        if not remotos:
+            raise ErrorGit(['git', 'fetch'], None, "No hay remotos configurados")
+        resultados = await asyncio.gather(*(self.fetch(remoto, timeout) for remoto in remotos),
+                                          return_exceptions=True)
+        for resultado in resultados:
+            # Los errores que no son de git (cancelación, bugs) no se tapan
+            if isinstance(resultado, BaseException) and not isinstance(resultado, ErrorGit):
+                raise resultado
+        return {remoto: resultado or True for remoto, resultado in zip(remotos, resultados)}
+
+    async def push(self, timeout=TIMEOUT_GIT_RED):
+        await self.git('push', timeout=timeout)
+
+    async def pull(self, timeout=TIMEOUT_GIT_RED):
+        await self.git('pull', timeout=timeout)
+
+    async def commit(self, mensaje):
+        await self.git('commit', '-F', '-', entrada=mensaje.encode('utf-8'))
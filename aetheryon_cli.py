@@ -0,0 +1,164 @@
+"""
+Modo línea de comandos de AETHERYON: abre un repo con Proyecto, corre una
+operación e imprime el resultado en JSON, sin importar tkinter ni customtkinter.
+
+    python -m aetheryon_cli [--repo RUTA] status
+    python -m aetheryon_cli ramas
+    python -m aetheryon_cli divergencia main feature
+    python -m aetheryon_cli historial --max 50
+    python -m aetheryon_cli benchmark --repeticiones 3
+
+La salida siempre es un objeto {'comando', 'repo', 'duracion_ms', 'resultado'}
+o {'comando', 'repo', 'error'} con código de salida 1. Los mensajes de progreso
+de Proyecto van a stderr para no ensuciar el JSON.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+from aetheryon_core import Proyecto, RegistroCommit, RegistroTag
+
+
+#-----------------------------------
+# Conversión a JSON
+#-----------------------------------
+
+def _commit_a_dict(commit):
+    datos = {
+        'hash': commit.hash_completo,
+        'padres': [p.hex() for p in commit.padres],
+        'autor': commit.autor,
+        'fecha': commit.fecha,
+        'timestamp': commit.timestamp,
+        'mensaje': commit.mensaje,
+    }
+    if commit.ruta is not None:
+        datos.update({'tipo_cambio': commit.tipo_cambio, 'ruta': commit.ruta,
+                      'ruta_anterior': commit.ruta_anterior})
+    return datos
+
+
+def _a_json(valor):
+    """default= de json.dumps: registros livianos, conjuntos y lo demás como texto"""
+    if isinstance(valor, RegistroCommit):
+        return _commit_a_dict(valor)
+    if isinstance(valor, RegistroTag):
+        return {'nombre': valor.nombre, 'mensaje_tag': valor.mensaje_tag,
+                'commit': _commit_a_dict(valor.commit) if valor.commit else None}
+    if isinstance(valor, (set, frozenset, tuple)):
+        return list(valor)
+    if isinstance(valor, bytes):
+        return valor.hex()
+    return str(valor)
+
+
+#-----------------------------------
+# Comandos
+#-----------------------------------
+
+def _status(proyecto, args):
+    return {'rama': proyecto.get_rama_actual(), 'archivos': proyecto.estado_archivos()}
+
+
+def _archivos(proyecto, args):
+    escaneo = proyecto.escanear_archivos()
+    if isinstance(escaneo, str):
+        return escaneo
+    return {'archivos': [{'ruta': ruta, 'estado': estado} for ruta, estado in escaneo['archivos']],
+            'ignorados': escaneo['ignorados']}
+
+
+def _ramas(proyecto, args):
+    return {'actual': proyecto.get_rama_actual(), 'ramas': proyecto.listar_ramas()}
+
+
+def _benchmark(proyecto, args):
+    # Importado acá: el resto de los comandos no necesita la suite
+    from benchmarks.correr import medir_repo
+    return medir_repo(proyecto.path, repeticiones=args.repeticiones,
+                      al_progreso=lambda nombre: print(f"⏱️ {nombre}", file=sys.stderr))
+
+
+COMANDOS = {
+    'status': _status,
+    'archivos': _archivos,
+    'ramas': _ramas,
+    'divergencia': lambda p, a: p.detectar_divergencia_ramas(a.rama1, a.rama2),
+    'historial': lambda p, a: p.get_commits_detallados(max_count=a.max),
+    'archivo-historial': lambda p, a: p.get_commits_por_archivo(a.ruta, max_count=a.max),
+    'tags': lambda p, a: p.get_tags(),
+    'stashes': lambda p, a: p.listar_stashes(),
+    'merge': lambda p, a: p.analizar_merge_previo(a.rama),
+    'comparar': lambda p, a: p.comparar_arboles_ramas(a.rama1, a.rama2),
+    'estadisticas': lambda p, a: p.get_estadisticas(),
+    'benchmark': _benchmark,
+}
+
+
+def _crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m aetheryon_cli",
+                                     description="Operaciones de AETHERYON sobre un repo, con salida JSON")
+    parser.add_argument('--repo', default='.', help="ruta del repositorio (por defecto, el directorio actual)")
+    parser.add_argument('--indentar', type=int, default=None, help="indentación del JSON")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    sub.add_parser('status', help="rama actual y estado de los archivos")
+    sub.add_parser('archivos', help="todos los archivos del árbol con su estado")
+    sub.add_parser('ramas', help="ramas locales y la actual")
+    for nombre, ayuda in (('divergencia', "archivos cuyo último cambio difiere entre dos ramas"),
+                          ('comparar', "archivos que difieren entre dos ramas")):
+        p = sub.add_parser(nombre, help=ayuda)
+        p.add_argument('rama1')
+        p.add_argument('rama2')
+    p = sub.add_parser('historial', help="últimos commits de la rama actual")
+    p.add_argument('--max', type=int, default=20)
+    p = sub.add_parser('archivo-historial', help="commits que tocaron un archivo")
+    p.add_argument('ruta')
+    p.add_argument('--max', type=int, default=20)
+    sub.add_parser('tags', help="tags con su commit")
+    sub.add_parser('stashes', help="stashes guardados")
+    p = sub.add_parser('merge', help="análisis previo de mergear una rama en la actual")
+    p.add_argument('rama')
+    sub.add_parser('estadisticas', help="churn y autoría de la rama actual")
+    p = sub.add_parser('benchmark', help="suite de benchmarks sobre el repo")
+    p.add_argument('--repeticiones', type=int, default=5)
+    return parser
+
+
+def main(argv=None):
+    args = _crear_parser().parse_args(argv)
+    repo = os.path.abspath(args.repo)
+    salida = {'comando': args.comando, 'repo': repo}
+    codigo = 0
+
+    inicio = time.perf_counter()
+    # Proyecto informa con print(); a stderr para que stdout sea solo JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        proyecto = Proyecto(repo)
+        try:
+            if not proyecto.es_repositorio:
+                resultado = f"{repo} no es un repositorio Git"
+            else:
+                resultado = COMANDOS[args.comando](proyecto, args)
+        except Exception as e:
+            resultado = str(e)
+        finally:
+            proyecto.cerrar()
+
+    # Los métodos de Proyecto devuelven un str cuando fallan
+    if isinstance(resultado, str) or resultado is None:
+        salida['error'] = resultado or "La operación falló (detalle en stderr)"
+        codigo = 1
+    else:
+        salida['duracion_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+        salida['resultado'] = resultado
+
+    print(json.dumps(salida, default=_a_json, ensure_ascii=False, indent=args.indentar))
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4158 @@
+"""
+Núcleo de AETHERYON Dev Core: todo lo que habla con git (Proyecto, caches,
+planificador, métricas) sin depender de la interfaz. Lo usan la app de
+CustomTkinter, la línea de comandos y los benchmarks.
+"""
+import os
+import io
+from datetime import datetime
+import threading
+import time
+import subprocess
+import sqlite3
+import codecs
+import heapq
+import itertools
+import functools
+import inspect
+import json
+from collections import OrderedDict, deque
+
+# numpy y pygit2 son opcionales y tardan en importarse: se cargan la primera vez
+# que se necesitan (cargar_numpy / cargar_pygit2) y quedan en estas globales
+np = None
+pygit2 = None
+_opcionales_probados = set()
+
+
+def cargar_numpy():
+    """El módulo numpy, o None si no está instalado"""
+    global np
+    if 'numpy' not in _opcionales_probados:
+        _opcionales_probados.add('numpy')
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+def cargar_pygit2():
+    """El módulo pygit2, o None si no está instalado"""
+    global pygit2
+    if 'pygit2' not in _opcionales_probados:
+        _opcionales_probados.add('pygit2')
+        try:
+            import pygit2
+        except ImportError:
+            pygit2 = None
+    return pygit2
+
+
+# GitPython tarda en importarse (y al cargarse prueba el binario de git): lo
+# importa cargar_git() la primera vez que un Proyecto usa su `repo`, y reemplaza
+# estas globales. Hasta entonces GitCommandError es un reemplazo propio, así los
+# `except GitCommandError` del módulo funcionan sin haberlo importado; los
+# errores se lanzan con _error_comando_git, que siempre usa la clase de GitPython.
+Repo = Git = GitMedido = RepoMedido = None
+_lock_git = threading.Lock()
+
+
+class GitCommandError(Exception):
+    """Reemplazo de git.GitCommandError mientras GitPython no está cargado"""
+
+#-----------------------------------
+# CONFIGURACIÓN DE CARPETAS A IGNORAR
+#-----------------------------------
+
+CARPETAS_IGNORADAS = {
+    '.git', 'node_modules', 'venv', 'env', '.venv', '__pycache__',
+    '.pytest_cache', '.mypy_cache', 'dist', 'build', '.next', '.nuxt',
+    'target', 'vendor', '.idea', '.vscode',
+}
+
+GITIGNORE_TEMPLATE = """# Dependencias
+node_modules/
+venv/
+env/
+.venv/
+__pycache__/
+*.pyc
+*.pyo
+*.pyd
+
+# Build & Distribución
+dist/
+build/
+*.egg-info/
+.next/
+.nuxt/
+target/
+
+# IDEs
+.idea/
+.vscode/
+*.swp
+*.swo
+
+# Sistema
+.DS_Store
+Thumbs.db
+*.log
+
+# Archivos de entorno
+.env
+.env.local
+"""
+
+
+#-----------------------------------
+# Métricas de rendimiento
+#-----------------------------------
+
+# Duraciones recientes por operación para los percentiles (las viejas se descartan)
+MUESTRAS_METRICAS = 2048
+
+PERCENTILES_METRICAS = (50, 95, 99)
+
+
+class MetricasRendimiento:
+    """
+    Cuenta llamadas, duraciones, procesos de git y bytes leídos. Cada registro
+    es un append bajo un lock, barato para dejarlo siempre activo; los
+    percentiles se calculan recién al mostrarlos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.activo = True
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self._operaciones = {}
+            self._subprocesos = {}
+            self.inicio = time.time()
+
+    def registrar(self, operacion, segundos):
+        with self._lock:
+            datos = self._operaciones.get(operacion)
+            if datos is None:
+                datos = self._operaciones[operacion] = {
+                    'llamadas': 0, 'total': 0.0, 'maximo': 0.0,
+                    'muestras': deque(maxlen=MUESTRAS_METRICAS)}
+            datos['llamadas'] += 1
+            datos['total'] += segundos
+            datos['maximo'] = max(datos['maximo'], segundos)
+            datos['muestras'].append(segundos)
+
+    def registrar_subproceso(self, argv, segundos=0.0, bytes_leidos=0):
+        """Un proceso de git lanzado; se agrupa por subcomando (log, diff-tree, cat-file...)"""
+        comando = _subcomando_git(argv)
+        with self._lock:
+            datos = self._subprocesos.setdefault(comando, {'procesos': 0, 'total': 0.0, 'bytes': 0})
+            datos['procesos'] += 1
+            datos['total'] += segundos
+            datos['bytes'] += bytes_leidos
+
+    def sumar_bytes(self, argv, bytes_leidos):
+        """Bytes leídos de un proceso que ya estaba abierto (cat-file --batch, streaming)"""
+        comando = _subcomando_git(argv)
+        with self._lock:
+            datos = self._subprocesos.setdefault(comando, {'procesos': 0, 'total': 0.0, 'bytes': 0})
+            datos['bytes'] += bytes_leidos
+
+    def resumen(self):
+        """{'operaciones': {nombre: {llamadas, total_ms, p50_ms, ...}}, 'subprocesos': {...}}"""
+        with self._lock:
+            operaciones = {nombre: (dict(datos), sorted(datos['muestras']))
+                           for nombre, datos in self._operaciones.items()}
+            subprocesos = {comando: dict(datos) for comando, datos in self._subprocesos.items()}
+        resultado = {}
+        for nombre, (datos, muestras) in operaciones.items():
+            fila = {'llamadas': datos['llamadas'], 'total_ms': datos['total'] * 1000,
+                    'max_ms': datos['maximo'] * 1000}
+            for p in PERCENTILES_METRICAS:
+                indice = min(len(muestras) - 1, int(len(muestras) * p / 100))
+                fila[f'p{p}_ms'] = muestras[indice] * 1000
+            resultado[nombre] = fila
+        for datos in subprocesos.values():
+            datos['total_ms'] = datos.pop('total') * 1000
+        return {'desde': self.inicio, 'operaciones': resultado, 'subprocesos': subprocesos}
+
+    def exportar_json(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.resumen(), f, indent=2, ensure_ascii=False)
+
+
+METRICAS = MetricasRendimiento()
+
+
+# Tope de eventos por grabación (~200 bytes cada uno en el JSON)
+MAX_EVENTOS_TRAZA = 500_000
+
+
+class Trazador:
+    """
+    Graba spans anidados (operación → proceso de git → parseo → callback de Tk)
+    con el hilo de cada uno, en formato Chrome Trace Event: el JSON se abre en
+    chrome://tracing o ui.perfetto.dev. Apagado no cuesta nada más que un if.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.activo = False
+        self._eventos = []
+        self._hilos = {}
+        self._origen = time.perf_counter()
+
+    def iniciar(self):
+        with self._lock:
+            self._eventos = []
+            self._hilos = {}
+            self._origen = time.perf_counter()
+            self.activo = True
+
+    def detener(self):
+        self.activo = False
+        return len(self._eventos)
+
+    def registrar(self, nombre, categoria, inicio, fin, args=None):
+        """Span ya terminado; inicio y fin en segundos de time.perf_counter()"""
+        hilo = threading.get_ident()
+        evento = {'name': nombre, 'cat': categoria, 'ph': 'X', 'pid': os.getpid(), 'tid': hilo,
+                  'ts': (inicio - self._origen) * 1e6, 'dur': (fin - inicio) * 1e6}
+        if args:
+            evento['args'] = args
+        with self._lock:
+            if hilo not in self._hilos:
+                self._hilos[hilo] = threading.current_thread().name
+            if len(self._eventos) < MAX_EVENTOS_TRAZA:
+                self._eventos.append(evento)
+
+    def span(self, nombre, categoria, **args):
+        return _Span(self, nombre, categoria, args)
+
+    def instante(self, nombre, categoria, **args):
+        """Evento sin duración (ej: lanzamiento de un proceso que se lee en streaming)"""
+        if not self.activo:
+            return
+        hilo = threading.get_ident()
+        with self._lock:
+            if hilo not in self._hilos:
+                self._hilos[hilo] = threading.current_thread().name
+            if len(self._eventos) < MAX_EVENTOS_TRAZA:
+                self._eventos.append({'name': nombre, 'cat': categoria, 'ph': 'i', 's': 't',
+                                      'pid': os.getpid(), 'tid': hilo,
+                                      'ts': (time.perf_counter() - self._origen) * 1e6, 'args': args})
+
+    def exportar_json(self, ruta):
+        with self._lock:
+            eventos = list(self._eventos)
+            hilos = dict(self._hilos)
+        metadatos = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': hilo,
+                      'args': {'name': nombre}} for hilo, nombre in hilos.items()]
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadatos + eventos, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+class _Span:
+    __slots__ = ('trazador', 'nombre', 'categoria', 'args', '_inicio')
+
+    def __init__(self, trazador, nombre, categoria, args):
+        self.trazador = trazador
+        self.nombre = nombre
+        self.categoria = categoria
+        self.args = args
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        if self.trazador.activo:
+            self.trazador.registrar(self.nombre, self.categoria, self._inicio, time.perf_counter(), self.args)
+        return False
+
+
+TRAZADOR = Trazador()
+
+
+def _subcomando_git(argv):
+    # Se saltean las opciones globales (-c clave=valor, -C ruta, --literal-pathspecs...)
+    argv = [str(a) for a in argv]
+    i = 1 if argv and os.path.basename(argv[0]).startswith('git') else 0
+    while i < len(argv) and argv[i].startswith('-'):
+        i += 2 if argv[i] in ('-c', '-C') else 1
+    return f"git {argv[i]}" if i < len(argv) else "git"
+
+
+class medir_subproceso:
+    """
+    `with medir_subproceso(argv) as medicion:` alrededor de cada llamada a git;
+    `medicion.bytes` se completa con lo leído.
+    """
+    __slots__ = ('argv', 'bytes', '_inicio')
+
+    def __init__(self, argv):
+        self.argv = argv
+        self.bytes = 0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        fin = time.perf_counter()
+        if METRICAS.activo:
+            METRICAS.registrar_subproceso(self.argv, fin - self._inicio, self.bytes)
+        if TRAZADOR.activo:
+            TRAZADOR.registrar(_subcomando_git(self.argv), 'git', self._inicio, fin,
+                               {'argv': ' '.join(str(a) for a in self.argv)[:500], 'bytes': self.bytes})
+        return False
+
+
+def medir(operacion):
+    """Decorador: registra la duración de cada llamada como `operacion` (y su span si se está trazando)"""
+    categoria = operacion.split('.', 1)[0].lower()
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            if not (METRICAS.activo or TRAZADOR.activo):
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                fin = time.perf_counter()
+                if METRICAS.activo:
+                    METRICAS.registrar(operacion, fin - inicio)
+                if TRAZADOR.activo:
+                    TRAZADOR.registrar(operacion, categoria, inicio, fin)
+        return medida
+    return decorador
+
+
+def _instrumentar_clase(clase, prefijo):
+    """Envuelve los métodos de la clase con `medir` (no los generadores: su tiempo es del que los consume)"""
+    for nombre, valor in list(vars(clase).items()):
+        if nombre.startswith('__') or not inspect.isfunction(valor):
+            continue
+        if inspect.isgeneratorfunction(valor) or inspect.iscoroutinefunction(valor) \
+                or inspect.isasyncgenfunction(valor):
+            continue
+        setattr(clase, nombre, medir(f"{prefijo}.{nombre}")(valor))
+
+
+def cargar_git():
+    """Importa GitPython (una sola vez) y arma RepoMedido/GitMedido sobre sus clases"""
+    global Repo, Git, GitCommandError, GitMedido, RepoMedido
+    with _lock_git:
+        if RepoMedido is not None:
+            return RepoMedido
+        inicio = time.perf_counter()
+        from git import Repo, Git, GitCommandError
+
+        class GitMedido(Git):
+            """Comando git de GitPython que cuenta sus procesos y lo que leen"""
+
+            def __init__(self, working_dir=None):
+                super().__init__(working_dir)
+                # El `cat-file --batch` persistente se comparte entre los hilos lectores
+                self._lock_cat_file = threading.RLock()
+
+            def get_object_header(self, ref):
+                with self._lock_cat_file:
+                    return super().get_object_header(ref)
+
+            def get_object_data(self, ref):
+                with self._lock_cat_file:
+                    return super().get_object_data(ref)
+
+            def stream_object_data(self, ref):
+                # El stream lee del mismo proceso: se consume entero antes de soltar el lock
+                with self._lock_cat_file:
+                    hexsha, tipo, tamaño, stream = super().stream_object_data(ref)
+                    return hexsha, tipo, tamaño, io.BytesIO(stream.read(tamaño))
+
+            def execute(self, command, *args, **kwargs):
+                with medir_subproceso(command) as medicion:
+                    resultado = super().execute(command, *args, **kwargs)
+                    salida = resultado[1] if isinstance(resultado, tuple) else resultado
+                    if isinstance(salida, (str, bytes)):
+                        medicion.bytes = len(salida)
+                    return resultado
+
+        class RepoMedido(Repo):
+            GitCommandWrapperType = GitMedido
+
+        fin = time.perf_counter()
+        METRICAS.registrar("import.git", fin - inicio)
+        if TRAZADOR.activo:
+            TRAZADOR.registrar("import git", 'import', inicio, fin)
+        return RepoMedido
+
+
+def _error_comando_git(comando, codigo, error):
+    """GitCommandError de GitPython para un proceso lanzado a mano (lo carga si hacía falta)"""
+    cargar_git()
+    return GitCommandError(comando, codigo, error)
+
+
+#-----------------------------------
+# Registros compactos de commits
+#-----------------------------------
+
+def _tiempo_relativo(timestamp, ahora):
+    diferencia = max(0, int(ahora - timestamp))
+    dias, segundos = divmod(diferencia, 86400)
+    
+    if dias > 0:
+        return f"hace {dias} día{'s' if dias > 1 else ''}"
+    elif segundos > 3600:
+        horas = segundos // 3600
+        return f"hace {horas} hora{'s' if horas > 1 else ''}"
+    elif segundos > 60:
+        minutos = segundos // 60
+        return f"hace {minutos} minuto{'s' if minutos > 1 else ''}"
+    else:
+        return "hace unos segundos"
+
+
+def tiempos_relativos(commits, ahora=None):
+    """Textos "hace N días" de una lista de commits, con un solo `ahora` para todo el lote"""
+    ahora = time.time() if ahora is None else ahora
+    return [_tiempo_relativo(c.timestamp, ahora) for c in commits]
+
+
+class RegistroCommit:
+    """
+    Commit liviano para las vistas de historial: el SHA (y los de sus padres) se
+    guarda en sus 20 bytes y la fecha como entero. Los textos para pantalla se
+    arman recién al pedirlos.
+    """
+    __slots__ = ('sha', 'mensaje', 'autor', 'timestamp', 'padres',
+                 'tipo_cambio', 'ruta', 'ruta_anterior',
+                 'lineas_agregadas', 'lineas_eliminadas', 'archivos')
+
+    def __init__(self, sha, mensaje, autor, timestamp, padres=()):
+        self.sha = bytes.fromhex(sha) if isinstance(sha, str) else sha
+        self.mensaje = mensaje
+        self.autor = autor
+        self.timestamp = timestamp
+        self.padres = tuple(bytes.fromhex(p) if isinstance(p, str) else p for p in padres)
+        # Datos opcionales: historial por archivo y búsqueda en el historial
+        self.tipo_cambio = None
+        self.ruta = None
+        self.ruta_anterior = None
+        self.lineas_agregadas = None
+        self.lineas_eliminadas = None
+        self.archivos = ()
+
+    @property
+    def hash_completo(self):
+        return self.sha.hex()
+
+    @property
+    def hash(self):
+        return self.sha[:4].hex()
+
+    @property
+    def fecha(self):
+        return datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+    @property
+    def asunto(self):
+        return self.mensaje.split('\n', 1)[0]
+
+    @property
+    def cambios(self):
+        if not self.padres:
+            return "📄 Commit inicial"
+        return CAMBIOS_ARCHIVO.get(self.tipo_cambio, "Sin cambios")
+
+    def __eq__(self, otro):
+        return isinstance(otro, RegistroCommit) and otro.sha == self.sha
+
+    def __hash__(self):
+        return hash(self.sha)
+
+    def __repr__(self):
+        return f"RegistroCommit({self.hash} {self.asunto!r})"
+
+
+class RegistroTag:
+    """Tag con su commit apuntado (RegistroCommit)"""
+    __slots__ = ('nombre', 'mensaje_tag', 'commit')
+
+    def __init__(self, nombre, commit, mensaje_tag=""):
+        self.nombre = nombre
+        self.commit = commit
+        self.mensaje_tag = mensaje_tag
+
+
+#-----------------------------------
+# Cache persistente de commits
+#-----------------------------------
+
+# Campos separados por \x1f y commits por \x1e para parsear el log sin ambigüedades
+FORMATO_LOG_CACHE = '%x1e%H%x1f%P%x1f%an%x1f%ae%x1f%at%x1f%ct%x1f%s%x1f%b%x1f'
+
+CAMBIOS_ARCHIVO = {
+    'A': "📄 Archivo creado",
+    'M': "✏️ Modificado",
+    'D': "🗑️ Eliminado",
+    'R': "📝 Renombrado",
+}
+
+# Historiales por archivo que se mantienen en memoria, clave (HEAD, ruta)
+MAX_HISTORIALES_CACHE = 32
+
+# Commits por proceso `git diff-tree | git patch-id` al calcular equivalencias
+TAM_BLOQUE_PATCH_ID = 200
+
+# Evita que cada proceso git abra una consola en Windows
+FLAGS_SUBPROCESO = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def _leer_registros(flujo, separador=b'\x1e', tam_bloque=1 << 16):
+    """Itera los registros separados por `separador` a medida que llegan del flujo"""
+    pendiente = b''
+    while True:
+        bloque = flujo.read1(tam_bloque)
+        if not bloque:
+            break
+        pendiente += bloque
+        registros = pendiente.split(separador)
+        pendiente = registros.pop()
+        for registro in registros:
+            if registro:
+                yield registro
+    if pendiente:
+        yield pendiente
+
+
+@medir("parse.parsear_raw_numstat")
+def _parsear_raw_numstat(texto):
+    """
+    Parsea la salida -z de --raw --numstat en una lista de dicts por archivo:
+    estado, ruta, ruta_anterior, blob_antes, blob_despues, agregadas y eliminadas
+    (agregadas/eliminadas quedan en None para binarios)
+    """
+    tokens = texto.lstrip('\0\n').split('\0')
+    archivos = []
+    por_ruta = {}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i].lstrip('\n')
+        if token.startswith(':') and i + 1 < len(tokens):
+            meta = token[1:].split(' ')
+            estado = meta[-1]
+            if estado[:1] in ('R', 'C') and i + 2 < len(tokens):
+                anterior, ruta = tokens[i + 1], tokens[i + 2]
+                i += 3
+            else:
+                anterior, ruta = None, tokens[i + 1]
+                i += 2
+            entrada = {
+                'estado': estado[:1],
+                'ruta': ruta,
+                'ruta_anterior': anterior,
+                'blob_antes': meta[2] if len(meta) > 4 else None,
+                'blob_despues': meta[3] if len(meta) > 4 else None,
+                'agregadas': None,
+                'eliminadas': None,
+            }
+            archivos.append(entrada)
+            por_ruta[ruta] = entrada
+        elif token.count('\t') >= 2:
+            agregadas, eliminadas, ruta = token.split('\t', 2)
+            i += 1
+            if not ruta and i + 1 < len(tokens):
+                # Renombre: origen y destino vienen en los dos tokens siguientes
+                ruta = tokens[i + 1]
+                i += 2
+            entrada = por_ruta.get(ruta)
+            if entrada is not None and agregadas != '-':
+                entrada['agregadas'] = int(agregadas)
+                entrada['eliminadas'] = int(eliminadas)
+        else:
+            i += 1
+    return archivos
+
+
+class CacheCommits:
+    """
+    Cache en disco de metadatos de commits (SQLite en .git/aetheryon/)
+
+    Guarda SHA, padres, autor, fechas, asunto, cuerpo y archivos tocados.
+    Se actualiza de forma incremental: solo se recorre desde las puntas
+    nuevas de las refs hasta los commits que ya están en la cache.
+    Mantiene además un índice de texto completo (FTS5) para las búsquedas.
+    """
+
+    VERSION_ESQUEMA = 3
+    COLUMNAS = 'sha, padres, autor, email, fecha_autor, fecha_commit, asunto, cuerpo'
+
+    def __init__(self, proyecto):
+        self.proyecto = proyecto
+        carpeta = os.path.join(proyecto.repo.git_dir, 'aetheryon')
+        os.makedirs(carpeta, exist_ok=True)
+        self.ruta_db = os.path.join(carpeta, 'commits.db')
+        self._lock = threading.RLock()
+        self._fechas_memo = (None, {})
+        self.fts = True
+        self.conexion = sqlite3.connect(self.ruta_db, check_same_thread=False)
+        self._crear_esquema()
+
+    def _crear_esquema(self):
+        with self._lock:
+            c = self.conexion
+            c.execute('PRAGMA journal_mode=WAL')
+            c.execute('PRAGMA synchronous=NORMAL')
+            version = c.execute('PRAGMA user_version').fetchone()[0]
+            if version == 2:
+                # La v2 calculaba los patch-id sin --root: los commits raíz quedaron como "sin cambios"
+                c.execute('DELETE FROM patch_ids WHERE patch_id IS NULL')
+            elif version != self.VERSION_ESQUEMA:
+                c.executescript("""
+                    DROP TABLE IF EXISTS commits;
+                    DROP TABLE IF EXISTS archivos;
+                    DROP TABLE IF EXISTS refs;
+                    DROP TABLE IF EXISTS busqueda;
+                    DROP TABLE IF EXISTS patch_ids;
+                """)
+            c.executescript("""
+                CREATE TABLE IF NOT EXISTS commits (
+                    sha TEXT PRIMARY KEY,
+                    padres TEXT NOT NULL,
+                    autor TEXT,
+                    email TEXT,
+                    fecha_autor INTEGER,
+                    fecha_commit INTEGER,
+                    asunto TEXT,
+                    cuerpo TEXT
+                );
+                CREATE TABLE IF NOT EXISTS archivos (
+                    sha TEXT NOT NULL,
+                    ruta TEXT NOT NULL,
+                    estado TEXT NOT NULL,
+                    ruta_anterior TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_archivos_sha ON archivos(sha);
+                CREATE INDEX IF NOT EXISTS idx_archivos_ruta ON archivos(ruta);
+                CREATE TABLE IF NOT EXISTS refs (
+                    nombre TEXT PRIMARY KEY,
+                    sha TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS patch_ids (
+                    sha TEXT PRIMARY KEY,
+                    patch_id TEXT
+                );
+            """)
+            try:
+                c.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5(
+                        sha UNINDEXED, asunto, cuerpo, autor, rutas,
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                # SQLite sin FTS5: tabla común y búsqueda con LIKE
+                self.fts = False
+                c.execute("""
+                    CREATE TABLE IF NOT EXISTS busqueda (
+                        sha TEXT PRIMARY KEY, asunto TEXT, cuerpo TEXT, autor TEXT, rutas TEXT
+                    )
+                """)
+            c.execute(f'PRAGMA user_version={self.VERSION_ESQUEMA}')
+            c.commit()
+
+    def _puntas_actuales(self):
+        """Devuelve {ref: sha del commit} para ramas, remotas, tags y HEAD"""
+        salida = self.proyecto._git(
+            'for-each-ref',
+            '--format=%(refname)%00%(objectname)%00%(objecttype)%00%(*objectname)%00%(*objecttype)',
+            'refs/heads', 'refs/remotes', 'refs/tags'
+        )
+        puntas = {}
+        for linea in salida.decode('utf-8', 'replace').splitlines():
+            partes = linea.split('\0')
+            if len(partes) < 5:
+                continue
+            nombre, sha, tipo, sha_pelado, tipo_pelado = partes[:5]
+            if tipo == 'commit':
+                puntas[nombre] = sha
+            elif tipo_pelado == 'commit':
+                puntas[nombre] = sha_pelado
+        try:
+            puntas['HEAD'] = self.proyecto.repo.head.commit.hexsha
+        except Exception:
+            pass
+        return puntas
+
+    def contiene(self, sha):
+        with self._lock:
+            return self.conexion.execute(
+                'SELECT 1 FROM commits WHERE sha=?', (sha,)).fetchone() is not None
+
+    def actualizar(self):
+        """Incorpora los commits nuevos desde las refs; devuelve cuántos se agregaron"""
+        with self._lock:
+            puntas = self._puntas_actuales()
+            conocidas = dict(self.conexion.execute('SELECT nombre, sha FROM refs'))
+            if puntas == conocidas:
+                return 0
+
+            nuevas = {sha for sha in puntas.values() if not self.contiene(sha)}
+            agregados = 0
+            if nuevas:
+                candidatas = set(puntas.values()) | set(conocidas.values())
+                excluir = {sha for sha in candidatas if sha not in nuevas and self.contiene(sha)}
+                try:
+                    agregados = self._importar_log(nuevas, excluir)
+                except GitCommandError:
+                    # Alguna punta vieja ya no existe (gc, force-push): excluir solo las actuales
+                    excluir = {sha for sha in puntas.values() if sha not in nuevas}
+                    agregados = self._importar_log(nuevas, excluir)
+
+            self.conexion.execute('DELETE FROM refs')
+            self.conexion.executemany('INSERT INTO refs VALUES (?, ?)', puntas.items())
+            self.conexion.commit()
+
+            if agregados:
+                self._fechas_memo = (None, {})
+                print(f"🗃️ Cache de commits: {agregados} commit(s) nuevo(s)")
+            return agregados
+
+    def _importar_log(self, incluir, excluir):
+        """Recorre `git log` desde `incluir` hasta `excluir` e inserta lo recorrido"""
+        entrada = ''.join(f'{sha}\n' for sha in incluir)
+        entrada += ''.join(f'^{sha}\n' for sha in excluir)
+
+        proceso = self.proyecto._git_proceso(
+            'log', '--stdin', '-z', '--name-status', f'--format={FORMATO_LOG_CACHE}')
+        proceso.stdin.write(entrada.encode())
+        proceso.stdin.close()
+
+        filas_commits = []
+        filas_archivos = []
+        agregados = 0
+        try:
+            for registro in _leer_registros(proceso.stdout):
+                datos = self._parsear_registro(registro)
+                if not datos or self.contiene(datos[0][0]):
+                    continue
+                fila, archivos = datos
+                filas_commits.append(fila)
+                filas_archivos.extend((fila[0], ruta, estado, anterior)
+                                      for estado, ruta, anterior in archivos)
+                if len(filas_commits) >= 1000:
+                    agregados += self._insertar(filas_commits, filas_archivos)
+            agregados += self._insertar(filas_commits, filas_archivos)
+
+            error = proceso.stderr.read()
+            if proceso.wait() != 0:
+                raise _error_comando_git(['git', 'log', '--stdin'], proceso.returncode, error)
+        except Exception:
+            self.conexion.rollback()
+            proceso.kill()
+            raise
+        return agregados
+
+    def _insertar(self, filas_commits, filas_archivos):
+        self.conexion.executemany(
+            f'INSERT OR IGNORE INTO commits ({self.COLUMNAS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            filas_commits)
+        self.conexion.executemany('INSERT INTO archivos VALUES (?, ?, ?, ?)', filas_archivos)
+
+        rutas = {}
+        for sha, ruta, _, anterior in filas_archivos:
+            rutas.setdefault(sha, []).append(f'{anterior} {ruta}' if anterior else ruta)
+        self.conexion.executemany(
+            'INSERT INTO busqueda (sha, asunto, cuerpo, autor, rutas) VALUES (?, ?, ?, ?, ?)',
+            [(fila[0], fila[6], fila[7], f'{fila[2]} {fila[3]}', ' '.join(rutas.get(fila[0], [])))
+             for fila in filas_commits])
+
+        cantidad = len(filas_commits)
+        filas_commits.clear()
+        filas_archivos.clear()
+        return cantidad
+
+    @staticmethod
+    def _parsear_registro(registro):
+        """Convierte un registro de FORMATO_LOG_CACHE + --name-status -z en filas"""
+        campos = registro.decode('utf-8', 'replace').split('\x1f', 8)
+        if len(campos) < 9:
+            return None
+        sha, padres, autor, email, fecha_autor, fecha_commit, asunto, cuerpo, resto = campos
+
+        resto = resto.lstrip('\0\n').rstrip('\0')
+        tokens = resto.split('\0') if resto else []
+        archivos = []
+        i = 0
+        while i + 1 < len(tokens):
+            estado = tokens[i]
+            if estado[:1] in ('R', 'C') and i + 2 < len(tokens):
+                archivos.append((estado[0], tokens[i + 2], tokens[i + 1]))
+                i += 3
+            else:
+                archivos.append((estado[:1], tokens[i + 1], None))
+                i += 2
+
+        fila = (sha, padres, autor, email, int(fecha_autor or 0), int(fecha_commit or 0),
+                asunto, cuerpo)
+        return fila, archivos
+
+    def _fila_a_dict(self, fila):
+        sha, padres, autor, email, fecha_autor, fecha_commit, asunto, cuerpo = fila
+        return {
+            'sha': sha,
+            'padres': padres.split() if padres else [],
+            'autor': autor,
+            'email': email,
+            'fecha_autor': fecha_autor,
+            'fecha_commit': fecha_commit,
+            'asunto': asunto,
+            'cuerpo': cuerpo,
+        }
+
+    def obtener(self, sha):
+        """Metadatos de un commit o None si no está en la cache"""
+        with self._lock:
+            fila = self.conexion.execute(
+                f'SELECT {self.COLUMNAS} FROM commits WHERE sha=?', (sha,)).fetchone()
+        return self._fila_a_dict(fila) if fila else None
+
+    def patch_ids(self, shas):
+        """{sha: patch_id} de los commits ya calculados (None = commit sin cambios)"""
+        resultado = {}
+        with self._lock:
+            lista = list(shas)
+            for i in range(0, len(lista), 500):
+                bloque = lista[i:i + 500]
+                marcas = ','.join('?' * len(bloque))
+                resultado.update(self.conexion.execute(
+                    f'SELECT sha, patch_id FROM patch_ids WHERE sha IN ({marcas})', bloque))
+        return resultado
+
+    def guardar_patch_ids(self, pares):
+        """Guarda pares (sha, patch_id); un commit es inmutable, así que no se invalidan nunca"""
+        with self._lock:
+            self.conexion.executemany(
+                'INSERT OR REPLACE INTO patch_ids (sha, patch_id) VALUES (?, ?)', pares)
+            self.conexion.commit()
+
+    def archivos_de(self, sha, ruta=None):
+        """Lista de (estado, ruta, ruta_anterior) tocados por un commit"""
+        with self._lock:
+            if ruta is None:
+                filas = self.conexion.execute(
+                    'SELECT estado, ruta, ruta_anterior FROM archivos WHERE sha=?', (sha,))
+            else:
+                filas = self.conexion.execute(
+                    'SELECT estado, ruta, ruta_anterior FROM archivos WHERE sha=? AND ruta=?',
+                    (sha, ruta))
+            return filas.fetchall()
+
+    def recorrer(self, desde, max_count=None, ruta=None):
+        """
+        Recorre la historia desde `desde` en orden de fecha de commit, como git log
+
+        Si se indica `ruta`, solo devuelve los commits que tocaron ese archivo.
+        """
+        with self._lock:
+            filtro = None
+            if ruta is not None:
+                filtro = {sha for (sha,) in self.conexion.execute(
+                    'SELECT sha FROM archivos WHERE ruta=?', (ruta,))}
+                if not filtro:
+                    return []
+
+            inicio = self.obtener(desde)
+            if not inicio:
+                return []
+
+            resultado = []
+            visitados = {desde}
+            cola = [(-inicio['fecha_commit'], desde, inicio)]
+            while cola:
+                _, sha, commit = heapq.heappop(cola)
+                if filtro is None or sha in filtro:
+                    resultado.append(commit)
+                    if max_count and len(resultado) >= max_count:
+                        break
+                    if filtro is not None:
+                        filtro.discard(sha)
+                        if not filtro:
+                            break
+
+                for padre in commit['padres']:
+                    if padre not in visitados:
+                        visitados.add(padre)
+                        datos = self.obtener(padre)
+                        if datos:
+                            heapq.heappush(cola, (-datos['fecha_commit'], padre, datos))
+            return resultado
+
+    def buscar(self, texto, max_count=50):
+        """
+        Busca commits por asunto, cuerpo, autor, rutas tocadas o prefijo de SHA
+
+        Admite filtros por campo: `autor:ana`, `ruta:src/app.py`, `asunto:fix`.
+        Devuelve los commits más recientes primero.
+        """
+        columnas_filtro = {'autor': 'autor', 'ruta': 'rutas', 'asunto': 'asunto', 'cuerpo': 'cuerpo'}
+        terminos = []
+        for palabra in texto.split():
+            campo, _, valor = palabra.partition(':')
+            if valor and campo.lower() in columnas_filtro:
+                terminos.append((columnas_filtro[campo.lower()], valor))
+            else:
+                terminos.append((None, palabra))
+        if not terminos:
+            return []
+
+        columnas = ', '.join(f'c.{col.strip()}' for col in self.COLUMNAS.split(','))
+        with self._lock:
+            if self.fts:
+                partes = []
+                for columna, valor in terminos:
+                    frase = '"' + valor.replace('"', '""') + '"*'
+                    partes.append(f'{columna} : {frase}' if columna else frase)
+                condicion = 'busqueda MATCH ?'
+                parametros = [' AND '.join(partes)]
+            else:
+                condiciones = []
+                parametros = []
+                for columna, valor in terminos:
+                    cols = [columna] if columna else ['asunto', 'cuerpo', 'autor', 'rutas']
+                    condiciones.append('(' + ' OR '.join(f'b.{col} LIKE ?' for col in cols) + ')')
+                    parametros.extend([f'%{valor}%'] * len(cols))
+                condicion = ' AND '.join(condiciones)
+
+            consulta = (f'SELECT {columnas} FROM busqueda b JOIN commits c ON c.sha = b.sha '
+                        f'WHERE {condicion} ORDER BY c.fecha_commit DESC LIMIT ?')
+            try:
+                filas = self.conexion.execute(consulta, parametros + [max_count]).fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"⚠️ Consulta de búsqueda inválida: {e}")
+                filas = []
+
+            # Un término que parece un hash también se busca como prefijo de SHA
+            if len(terminos) == 1 and terminos[0][0] is None:
+                valor = terminos[0][1].lower()
+                if len(valor) >= 4 and all(ch in '0123456789abcdef' for ch in valor):
+                    por_sha = self.conexion.execute(
+                        f'SELECT {self.COLUMNAS} FROM commits WHERE sha LIKE ? LIMIT ?',
+                        (valor + '%', max_count)).fetchall()
+                    filas = por_sha + [f for f in filas if f not in por_sha]
+
+        return [self._fila_a_dict(fila) for fila in filas[:max_count]]
+
+    def fechas_ultimo_commit(self, desde, rutas):
+        """{ruta: fecha} del último commit alcanzable desde `desde` que tocó cada ruta"""
+        with self._lock:
+            head_memo, memo = self._fechas_memo
+            if head_memo != desde:
+                memo = {}
+                self._fechas_memo = (desde, memo)
+
+            pendientes = {r for r in rutas if r not in memo}
+            if pendientes:
+                fila = self.conexion.execute(
+                    'SELECT padres, fecha_commit FROM commits WHERE sha=?', (desde,)).fetchone()
+                visitados = {desde}
+                cola = [(-fila[1], desde, fila[0])] if fila else []
+                while cola and pendientes:
+                    menos_fecha, sha, padres = heapq.heappop(cola)
+                    for (ruta,) in self.conexion.execute(
+                            'SELECT ruta FROM archivos WHERE sha=?', (sha,)):
+                        if ruta in pendientes:
+                            memo[ruta] = -menos_fecha
+                            pendientes.discard(ruta)
+                    for padre in padres.split():
+                        if padre not in visitados:
+                            visitados.add(padre)
+                            fila = self.conexion.execute(
+                                'SELECT padres, fecha_commit FROM commits WHERE sha=?',
+                                (padre,)).fetchone()
+                            if fila:
+                                heapq.heappush(cola, (-fila[1], padre, fila[0]))
+                for ruta in pendientes:
+                    memo[ruta] = None
+
+            return {r: memo[r] for r in rutas if memo.get(r)}
+
+
+#-----------------------------------
+# Búsqueda en el contenido del historial (pickaxe)
+#-----------------------------------
+
+# Commits por proceso git: bloques chicos reparten mejor la carga, grandes lanzan menos procesos
+TAM_BLOQUE_BUSQUEDA = 2000
+MIN_BLOQUE_BUSQUEDA = 200
+
+
+class BusquedaHistorial:
+    """
+    Busca cuándo se agregó o quitó un texto (`git log -S`) o qué commits tocaron
+    líneas que coinciden con una regex (`git log -G`).
+    
+    La lista de commits se parte en bloques y cada bloque corre en su propio
+    proceso git (`--stdin --no-walk`) en paralelo. Los resultados se entregan en
+    el orden del historial, sin duplicados, a medida que se completan los bloques.
+    """
+
+    def __init__(self, proyecto, patron, modo='S', regex=False, desde='HEAD',
+                 ruta=None, trabajadores=None):
+        self.proyecto = proyecto
+        self.patron = patron
+        self.modo = modo
+        self.regex = regex
+        self.desde = desde
+        self.ruta = ruta
+        self.trabajadores = trabajadores or min(8, os.cpu_count() or 2)
+        self._cancelada = threading.Event()
+        self._procesos = set()
+        self._lock = threading.Lock()
+        self._hilo = None
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def _argumentos_pickaxe(self):
+        if self.modo == 'G':
+            return [f'-G{self.patron}']
+        argumentos = [f'-S{self.patron}']
+        if self.regex:
+            argumentos.append('--pickaxe-regex')
+        return argumentos
+
+    def _listar_commits(self):
+        argumentos = ['rev-list', *([self.desde] if isinstance(self.desde, str) else self.desde)]
+        if self.ruta:
+            argumentos += ['--', self.ruta]
+        return self.proyecto._git(*argumentos).decode().split()
+
+    def _bloques(self, shas):
+        tam = max(MIN_BLOQUE_BUSQUEDA,
+                  min(TAM_BLOQUE_BUSQUEDA, len(shas) // (self.trabajadores * 4) + 1))
+        return [shas[i:i + tam] for i in range(0, len(shas), tam)]
+
+    def _buscar_bloque(self, bloque):
+        """Corre el pickaxe sobre un bloque de commits y devuelve las coincidencias en orden"""
+        if self.cancelada:
+            return []
+        argumentos = ['log', '--stdin', '--no-walk=unsorted', *self._argumentos_pickaxe(),
+                      '-z', '--name-only', f'--format={FORMATO_LOG_CACHE}']
+        if self.ruta:
+            argumentos += ['--', self.ruta]
+        proceso = self.proyecto._git_proceso(*argumentos)
+        with self._lock:
+            self._procesos.add(proceso)
+        try:
+            # Escribir stdin desde otro hilo evita el bloqueo si git llena stdout antes
+            def escribir():
+                try:
+                    proceso.stdin.write(('\n'.join(bloque) + '\n').encode())
+                    proceso.stdin.close()
+                except (BrokenPipeError, OSError):
+                    pass
+            escritor = threading.Thread(target=escribir, daemon=True)
+            escritor.start()
+            
+            encontrados = []
+            for registro in _leer_registros(proceso.stdout):
+                campos = registro.decode('utf-8', 'replace').split('\x1f', 8)
+                if len(campos) < 9:
+                    continue
+                sha, padres, autor, email, fecha_autor, fecha_commit, asunto, cuerpo, resto = campos
+                c = {'sha': sha, 'padres': padres.split(), 'autor': autor, 'email': email,
+                     'fecha_autor': int(fecha_autor), 'fecha_commit': int(fecha_commit),
+                     'asunto': asunto, 'cuerpo': cuerpo}
+                commit = self.proyecto._commit_desde_cache(c)
+                commit.archivos = tuple(r for r in resto.lstrip('\0\n').split('\0') if r)
+                encontrados.append(commit)
+            
+            escritor.join()
+            error = proceso.stderr.read()
+            if proceso.wait() != 0 and not self.cancelada:
+                raise _error_comando_git(['git', *argumentos], proceso.returncode, error)
+            return encontrados
+        finally:
+            with self._lock:
+                self._procesos.discard(proceso)
+
+    def iniciar(self, al_encontrar, al_progreso=None, al_terminar=None):
+        """
+        Lanza la búsqueda en segundo plano. Los callbacks se llaman desde el hilo
+        de búsqueda (la UI debe reenviarlos con after):
+        al_encontrar(commits), al_progreso(bloques_listos, total_bloques) y
+        al_terminar(total_encontrados, error)
+        """
+        self._hilo = threading.Thread(
+            target=self._ejecutar, args=(al_encontrar, al_progreso, al_terminar), daemon=True)
+        self._hilo.start()
+        return self
+
+    def _ejecutar(self, al_encontrar, al_progreso, al_terminar):
+        # concurrent.futures trae logging: se importa recién acá y no al arrancar
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        total = 0
+        error = None
+        try:
+            bloques = self._bloques(self._listar_commits())
+            if al_progreso:
+                al_progreso(0, len(bloques))
+            
+            vistos = set()
+            listos = {}
+            siguiente = 0
+            with ThreadPoolExecutor(max_workers=self.trabajadores) as pool:
+                futuros = {pool.submit(self._buscar_bloque, b): i for i, b in enumerate(bloques)}
+                try:
+                    for hechos, futuro in enumerate(as_completed(futuros), 1):
+                        if self.cancelada:
+                            break
+                        listos[futuros[futuro]] = futuro.result()
+                        # Solo se entregan bloques contiguos para respetar el orden del historial
+                        while siguiente in listos:
+                            lote = [c for c in listos.pop(siguiente) if c.sha not in vistos]
+                            vistos.update(c.sha for c in lote)
+                            siguiente += 1
+                            if lote:
+                                total += len(lote)
+                                al_encontrar(lote)
+                        if al_progreso:
+                            al_progreso(hechos, len(bloques))
+                except Exception:
+                    # Un bloque falló (p. ej. regex inválida): se cortan los procesos restantes
+                    self.cancelar()
+                    raise
+                finally:
+                    for futuro in futuros:
+                        futuro.cancel()
+        except Exception as e:
+            self.cancelar()
+            error = str(e)
+        
+        if al_terminar:
+            al_terminar(total, error)
+
+    def cancelar(self):
+        """Detiene la búsqueda y termina los procesos git en curso"""
+        self._cancelada.set()
+        with self._lock:
+            procesos = list(self._procesos)
+        for proceso in procesos:
+            try:
+                proceso.kill()
+            except OSError:
+                pass
+
+
+#-----------------------------------
+# Grafo de commits (disposición en carriles)
+#-----------------------------------
+
+# Campos del log para el grafo: sha, padres, autor, fecha, refs y asunto
+FORMATO_LOG_GRAFO = '%x1e%H%x1f%P%x1f%an%x1f%ct%x1f%D%x1f%s'
+
+# Columnas máximas del grafo: las ramas que no entran se cortan en el borde
+MAX_CARRILES_GRAFO = 48
+
+
+class DisposicionGrafo:
+    """
+    Asigna columna (carril) a cada commit de un log en orden topológico y calcula
+    las líneas que lo unen con sus padres. Se alimenta de a páginas: solo guarda
+    el estado de los carriles activos más una fila compacta por commit.
+    
+    Cada fila es una tupla (columna, pasantes, entrantes, salientes):
+    - pasantes: carriles que cruzan la fila de arriba a abajo sin tocar el commit
+    - entrantes: carriles que llegan desde arriba al commit (hijos)
+    - salientes: carriles que salen del commit hacia abajo (padres)
+    """
+
+    def __init__(self, max_carriles=MAX_CARRILES_GRAFO):
+        self.max_carriles = max_carriles
+        self.carriles = []    # SHA esperado en cada columna (None = libre)
+        self.filas = []
+        self.ancho = 0        # Columnas usadas por la fila más ancha
+
+    def _columna_libre(self):
+        try:
+            return self.carriles.index(None)
+        except ValueError:
+            if len(self.carriles) < self.max_carriles:
+                self.carriles.append(None)
+                return len(self.carriles) - 1
+            return None
+
+    def agregar(self, sha, padres):
+        """Ubica el siguiente commit del log y devuelve su fila"""
+        carriles = self.carriles
+        entrantes = tuple(i for i, esperado in enumerate(carriles) if esperado == sha)
+        for i in entrantes:
+            carriles[i] = None
+        
+        if entrantes:
+            columna = entrantes[0]
+        else:
+            columna = self._columna_libre()
+            if columna is None:
+                # Sin lugar: se corta la rama del último carril
+                columna = len(carriles) - 1
+                carriles[columna] = None
+        
+        pasantes = tuple(i for i, esperado in enumerate(carriles) if esperado is not None)
+        
+        salientes = []
+        for n, padre in enumerate(padres):
+            if n == 0:
+                # El primer padre sigue en la misma columna; si otro carril también
+                # lo espera, ambos se juntan en la fila del padre
+                carriles[columna] = padre
+                salientes.append(columna)
+            elif padre in carriles:
+                # Padre de merge que ya tiene carril: la línea se une a ese carril
+                salientes.append(carriles.index(padre))
+            else:
+                destino = self._columna_libre()
+                if destino is not None:
+                    carriles[destino] = padre
+                    salientes.append(destino)
+        
+        while carriles and carriles[-1] is None:
+            carriles.pop()
+        
+        fila = (columna, pasantes, entrantes, tuple(salientes))
+        self.filas.append(fila)
+        self.ancho = max(self.ancho, columna + 1, len(carriles))
+        return fila
+
+    def agregar_pagina(self, commits):
+        for commit in commits:
+            self.agregar(commit.sha, commit.padres)
+
+
+#-----------------------------------
+# Blame incremental
+#-----------------------------------
+
+# Blames completos que se mantienen en memoria, clave (blob, ruta)
+MAX_BLAMES_CACHE = 16
+
+
+@medir("parse.parsear_diff_u0")
+def _parsear_diff_u0(texto):
+    """Encabezados de hunk de un diff -U0: lista de (inicio_viejo, cant_viejo, inicio_nuevo, cant_nuevo)"""
+    hunks = []
+    for linea in texto.splitlines():
+        if not linea.startswith('@@ '):
+            continue
+        viejo, nuevo = linea.split(' ')[1:3]
+        a, _, b = viejo[1:].partition(',')
+        c, _, d = nuevo[1:].partition(',')
+        hunks.append((int(a), int(b or 1), int(c), int(d or 1)))
+    return hunks
+
+
+class BlameIncremental:
+    """
+    `git blame --incremental` de un archivo en HEAD, entregando los tramos a
+    medida que git los resuelve.
+    
+    Los resultados se cachean en el Proyecto por (blob, ruta) junto con el
+    commit en que se calcularon, y solo se usan si ese commit es ancestro del
+    HEAD actual (en otra rama la atribución sería de commits que HEAD no
+    tiene). Si el archivo cambió desde ese blame, las líneas que no cambiaron
+    heredan su atribución (vía `git diff -U0` entre los dos blobs) y solo se
+    recalculan los rangos modificados con `-L`.
+    
+    Cada tramo es una tupla (linea_final, cantidad, sha, linea_original) y los
+    datos de cada commit quedan en `commits[sha]` = (autor, timestamp, resumen).
+    """
+
+    def __init__(self, proyecto, ruta):
+        self.proyecto = proyecto
+        self.ruta = ruta
+        self.blob = None
+        self.contenido = None
+        self.tramos = []
+        self.commits = {}
+        self.reutilizadas = 0
+        self._cancelada = threading.Event()
+        self._proceso = None
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def iniciar(self, al_cargar, al_tramos, al_terminar=None):
+        """
+        Lanza el blame en segundo plano. Los callbacks llegan desde el hilo de
+        trabajo: al_cargar(lineas) con el contenido del archivo, al_tramos(tramos)
+        por cada lote resuelto y al_terminar(desde_cache, error).
+        """
+        threading.Thread(target=self._ejecutar, args=(al_cargar, al_tramos, al_terminar),
+                         daemon=True).start()
+        return self
+
+    def cancelar(self):
+        self._cancelada.set()
+        proceso = self._proceso
+        if proceso and proceso.poll() is None:
+            try:
+                proceso.kill()
+            except OSError:
+                pass
+
+    def _ejecutar(self, al_cargar, al_tramos, al_terminar):
+        desde_cache = False
+        error = None
+        try:
+            head = self.proyecto._head_sha()
+            if not head:
+                raise ValueError("El repositorio no tiene commits")
+            self.blob = self.proyecto._git('rev-parse', f'{head}:{self.ruta}').decode().strip()
+            leido = self.proyecto.get_lector_objetos().leer(self.blob)
+            self.contenido = leido[2].decode('utf-8', 'replace') if leido else ''
+            lineas = self.contenido.splitlines()
+            al_cargar(lineas)
+            
+            guardado = self.proyecto._obtener_blame(self.blob, self.ruta)
+            if guardado and self.proyecto._es_ancestro(guardado[2], head):
+                desde_cache = True
+                self.tramos, self.commits, _commit = guardado
+                al_tramos(list(self.tramos))
+            else:
+                rangos = None
+                base = self.proyecto._ultimo_blame_de(self.ruta, head)
+                if base:
+                    rangos = self._reutilizar(base, len(lineas))
+                    if self.tramos:
+                        al_tramos(list(self.tramos))
+                if rangos is None or rangos:
+                    self._blame(head, rangos, al_tramos)
+                if not self.cancelada:
+                    self.tramos.sort()
+                    self.proyecto._guardar_blame(self.blob, self.ruta, self.tramos, self.commits, head)
+        except GitCommandError as e:
+            error = str(e)
+        except Exception as e:
+            error = str(e)
+        
+        if al_terminar:
+            al_terminar(desde_cache, error)
+
+    def _reutilizar(self, base, total_lineas):
+        """
+        Copia la atribución de las líneas sin cambios desde el blame `base`
+        (blob_anterior, tramos, commits, commit). Devuelve los rangos (inicio, fin)
+        que hay que recalcular, o None si no se pudo reutilizar nada.
+        """
+        blob_anterior, tramos_anteriores, commits_anteriores, _commit = base
+        try:
+            diff = self.proyecto._git('diff', '-U0', '--no-color', '--no-ext-diff',
+                                      blob_anterior, self.blob).decode('utf-8', 'replace')
+        except GitCommandError:
+            return None
+        
+        # Atribución línea por línea de la versión anterior
+        anterior = {}
+        for inicio, cantidad, sha, origen in tramos_anteriores:
+            for k in range(cantidad):
+                anterior[inicio + k] = (sha, origen + k)
+        
+        rangos = []
+        copias = []    # (linea_nueva, linea_vieja) de los bloques sin cambios
+        viejo, nuevo = 1, 1
+        for a, b, c, d in _parsear_diff_u0(diff):
+            fin_nuevo = c if d == 0 else c - 1
+            copias.append((nuevo, viejo, fin_nuevo - nuevo + 1))
+            viejo = a + b if b else a + 1
+            nuevo = c + d if d else c + 1
+            if d:
+                rangos.append((c, c + d - 1))
+        copias.append((nuevo, viejo, total_lineas - nuevo + 1))
+        
+        tramos = []
+        for linea_nueva, linea_vieja, cantidad in copias:
+            for k in range(max(0, cantidad)):
+                atribucion = anterior.get(linea_vieja + k)
+                if atribucion is None:
+                    return None
+                sha, origen = atribucion
+                ultimo = tramos[-1] if tramos else None
+                # Se juntan líneas consecutivas del mismo commit en un solo tramo
+                if ultimo and ultimo[2] == sha and ultimo[0] + ultimo[1] == linea_nueva + k \
+                        and ultimo[3] + ultimo[1] == origen:
+                    tramos[-1] = (ultimo[0], ultimo[1] + 1, sha, ultimo[3])
+                else:
+                    tramos.append((linea_nueva + k, 1, sha, origen))
+        
+        self.tramos = tramos
+        self.commits = {sha: commits_anteriores[sha] for _, _, sha, _ in tramos}
+        self.reutilizadas = sum(t[1] for t in tramos)
+        return rangos
+
+    def _blame(self, head, rangos, al_tramos):
+        argumentos = ['blame', '--incremental']
+        for inicio, fin in rangos or ():
+            argumentos += ['-L', f'{inicio},{fin}']
+        argumentos += [head, '--', self.ruta]
+        
+        self._proceso = self.proyecto._git_proceso(*argumentos)
+        self._proceso.stdin.close()
+        
+        actual = None
+        datos = {}
+        lote = []
+        ultimo_envio = time.monotonic()
+        for linea in self._proceso.stdout:
+            linea = linea.decode('utf-8', 'replace').rstrip('\n')
+            partes = linea.split(' ')
+            if actual is None:
+                if len(partes) == 4 and len(partes[0]) == 40:
+                    sha, origen, final, cantidad = partes
+                    actual = (int(final), int(cantidad), sha, int(origen))
+                    datos = {}
+                continue
+            clave, _, valor = linea.partition(' ')
+            if clave in ('author', 'author-time', 'summary'):
+                datos[clave] = valor
+            elif clave == 'filename':
+                sha = actual[2]
+                if sha not in self.commits:
+                    self.commits[sha] = (datos.get('author', ''), int(datos.get('author-time', 0)),
+                                         datos.get('summary', ''))
+                self.tramos.append(actual)
+                lote.append(actual)
+                actual = None
+                # Los tramos se entregan en lotes chicos para no saturar la cola de la UI
+                if time.monotonic() - ultimo_envio > 0.05:
+                    al_tramos(lote)
+                    lote = []
+                    ultimo_envio = time.monotonic()
+        if lote:
+            al_tramos(lote)
+        
+        error = self._proceso.stderr.read()
+        if self._proceso.wait() != 0 and not self.cancelada:
+            raise _error_comando_git(argumentos, self._proceso.returncode, error)
+
+
+#-----------------------------------
+# Lector persistente de objetos (git cat-file --batch)
+#-----------------------------------
+
+# Memoria total para contenidos de blobs ya leídos
+MAX_BYTES_CACHE_BLOBS = 64 * 1024 * 1024
+
+# Los blobs más grandes no entran en la cache (se leen en streaming)
+MAX_BYTES_BLOB_CACHEABLE = 8 * 1024 * 1024
+
+
+class LectorObjetos:
+    """
+    Un `git cat-file --batch-check` y un `git cat-file --batch` que quedan abiertos
+    mientras dure el Proyecto, para leer objetos sin lanzar un proceso por lectura.
+    
+    Se puede usar desde varios hilos: cada proceso tiene su lock y las lecturas
+    del mismo blob salen de una LRU por SHA acotada por bytes.
+    """
+
+    def __init__(self, proyecto, max_bytes=MAX_BYTES_CACHE_BLOBS):
+        self.proyecto = proyecto
+        self.max_bytes = max_bytes
+        self._blobs = OrderedDict()
+        self._bytes = 0
+        self._lock_cache = threading.Lock()
+        self._procesos = {}
+        self._locks = {'--batch-check': threading.Lock(), '--batch': threading.Lock()}
+
+    def info(self, nombre):
+        """(sha, tipo, tamaño) de un objeto (sha, rama:ruta, etc.), o None si no existe"""
+        with self._locks['--batch-check']:
+            return self._consultar('--batch-check', nombre, leer_contenido=False)
+
+    def leer(self, nombre):
+        """(sha, tipo, contenido en bytes) de un objeto, o None si no existe"""
+        info = self.info(nombre)
+        if not info:
+            return None
+        sha, tipo, tamaño = info
+        with self._lock_cache:
+            contenido = self._blobs.get(sha)
+            if contenido is not None:
+                self._blobs.move_to_end(sha)
+                return sha, tipo, contenido
+        
+        with self._locks['--batch']:
+            resultado = self._consultar('--batch', sha, leer_contenido=True)
+        if not resultado:
+            return None
+        contenido = resultado[2]
+        if tamaño <= MAX_BYTES_BLOB_CACHEABLE:
+            self._guardar(sha, contenido)
+        return sha, tipo, contenido
+
+    def _guardar(self, sha, contenido):
+        with self._lock_cache:
+            if sha in self._blobs:
+                return
+            self._blobs[sha] = contenido
+            self._bytes += len(contenido)
+            while self._bytes > self.max_bytes and self._blobs:
+                _, descartado = self._blobs.popitem(last=False)
+                self._bytes -= len(descartado)
+
+    def _consultar(self, modo, nombre, leer_contenido):
+        # Si el proceso murió (repo reemplazado, kill externo) se relanza una vez
+        for intento in range(2):
+            proceso = self._procesos.get(modo)
+            if proceso is not None and proceso.poll() is not None:
+                self._descartar(modo)
+                proceso = None
+            if proceso is None:
+                proceso = self._procesos[modo] = self.proyecto._git_proceso('cat-file', modo)
+            try:
+                proceso.stdin.write(nombre.encode() + b'\n')
+                proceso.stdin.flush()
+                cabecera = proceso.stdout.readline()
+                if not cabecera:
+                    raise BrokenPipeError("cat-file terminó sin responder")
+                partes = cabecera.split()
+                # "<nombre> missing" / "<nombre> ambiguous"
+                if len(partes) != 3 or partes[-1] in (b'missing', b'ambiguous'):
+                    return None
+                sha, tipo, tamaño = partes[0].decode(), partes[1].decode(), int(partes[2])
+                if not leer_contenido:
+                    return sha, tipo, tamaño
+                contenido = proceso.stdout.read(tamaño)
+                proceso.stdout.read(1)
+                METRICAS.sumar_bytes(['git', 'cat-file', modo], tamaño)
+                return sha, tipo, contenido
+            except (OSError, ValueError):
+                self._descartar(modo)
+                if intento:
+                    raise
+        return None
+
+    def _descartar(self, modo):
+        proceso = self._procesos.pop(modo, None)
+        if proceso:
+            self.proyecto._cerrar_proceso(proceso)
+
+    def cerrar(self):
+        for modo in list(self._procesos):
+            with self._locks[modo]:
+                self._descartar(modo)
+        with self._lock_cache:
+            self._blobs.clear()
+            self._bytes = 0
+
+
+#-----------------------------------
+# Diff lado a lado
+#-----------------------------------
+
+ALGORITMOS_DIFF = ('histogram', 'patience', 'myers')
+
+CONTEXTO_DIFF = 3
+
+# Diffs ya parseados que se mantienen en memoria, clave (blob_antes, blob_despues, algoritmo, contexto)
+MAX_DIFFS_CACHE = 64
+
+# Comparación de árboles: filas que se dibujan, líneas por diff expandido y archivos precargados
+MAX_ARCHIVOS_COMPARACION = 500
+
+MAX_LINEAS_DIFF_EN_LINEA = 400
+
+ARCHIVOS_PRECARGA = 3
+
+
+def _cerrar_bloque_cambios(filas, eliminadas, agregadas):
+    """Empareja las líneas eliminadas y agregadas consecutivas en filas alineadas"""
+    for k in range(max(len(eliminadas), len(agregadas))):
+        izq = eliminadas[k] if k < len(eliminadas) else (None, None)
+        der = agregadas[k] if k < len(agregadas) else (None, None)
+        if izq[0] is None:
+            tipo = 'agregada'
+        elif der[0] is None:
+            tipo = 'eliminada'
+        else:
+            tipo = 'modificada'
+        filas.append((izq[0], izq[1], der[0], der[1], tipo))
+    eliminadas.clear()
+    agregadas.clear()
+
+
+@medir("parse.parsear_diff_lado_a_lado")
+def _parsear_diff_lado_a_lado(texto):
+    """
+    Hunks de un diff unificado con las líneas ya alineadas para mostrar en dos columnas.
+    
+    Cada hunk es (inicio_viejo, cant_viejo, inicio_nuevo, cant_nuevo, encabezado, filas)
+    y cada fila (num_izq, texto_izq, num_der, texto_der, tipo), con None del lado que
+    no tiene línea y tipo 'igual', 'eliminada', 'agregada' o 'modificada'.
+    """
+    hunks = []
+    filas = eliminadas = agregadas = None
+    izq = der = 0
+    for linea in texto.split('\n'):
+        if linea.startswith('@@ '):
+            if filas is not None:
+                _cerrar_bloque_cambios(filas, eliminadas, agregadas)
+            viejo, nuevo = linea.split(' ')[1:3]
+            a, _, b = viejo[1:].partition(',')
+            c, _, d = nuevo[1:].partition(',')
+            a, b, c, d = int(a), int(b or 1), int(c), int(d or 1)
+            filas, eliminadas, agregadas = [], [], []
+            hunks.append((a, b, c, d, linea.partition(' @@')[2].strip(), filas))
+            # Con cantidad 0 git indica la línea anterior al cambio
+            izq = a if b else a + 1
+            der = c if d else c + 1
+        elif filas is None or not linea or linea[0] == '\\':
+            continue
+        elif linea[0] == '-':
+            eliminadas.append((izq, linea[1:].rstrip('\r')))
+            izq += 1
+        elif linea[0] == '+':
+            agregadas.append((der, linea[1:].rstrip('\r')))
+            der += 1
+        elif linea[0] == ' ':
+            _cerrar_bloque_cambios(filas, eliminadas, agregadas)
+            contenido = linea[1:].rstrip('\r')
+            filas.append((izq, contenido, der, contenido, 'igual'))
+            izq += 1
+            der += 1
+    if filas is not None:
+        _cerrar_bloque_cambios(filas, eliminadas, agregadas)
+    return hunks
+
+
+#-----------------------------------
+# Contenido de archivos (binarios y archivos grandes)
+#-----------------------------------
+
+# Por encima de este tamaño se muestra un resumen antes de cargar el contenido
+UMBRAL_ARCHIVO_GRANDE = 2 * 1024 * 1024
+
+LINEAS_VISTA_PREVIA = 2000
+
+TAM_BLOQUE_CONTENIDO = 1 << 16
+
+# Mismo criterio que git: un NUL en los primeros 8000 bytes indica un binario
+BYTES_DETECCION = 8000
+
+# UTF-32 antes que UTF-16: su BOM little-endian empieza igual
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _detectar_codificacion(muestra):
+    """Codificación probable a partir de los primeros bytes, o None si parece binario"""
+    for bom, codificacion in BOMS:
+        if muestra.startswith(bom):
+            return codificacion
+    if b'\x00' in muestra:
+        return None
+    try:
+        # final=False: la muestra puede cortar un carácter multibyte al final
+        codecs.getincrementaldecoder('utf-8')().decode(muestra, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def tamaño_legible(tamaño):
+    for unidad in ('B', 'KB', 'MB'):
+        if tamaño < 1024:
+            return f"{tamaño:.0f} {unidad}" if unidad == 'B' else f"{tamaño:.1f} {unidad}"
+        tamaño /= 1024
+    return f"{tamaño:.1f} GB"
+
+
+#-----------------------------------
+# Estadísticas del repositorio (churn y autoría)
+#-----------------------------------
+
+SEGUNDOS_SEMANA = 7 * 24 * 3600
+
+FORMATO_LOG_ESTADISTICAS = '%x1e%H%x1f%an%x1f%at%x1f'
+
+
+class EstadisticasRepo:
+    """
+    Estadísticas de churn y autoría de la rama actual, armadas con un único
+    `git log --numstat -z` y agregadas con NumPy.
+    
+    Los datos quedan en .git/aetheryon/estadisticas.npz como arrays planos
+    (una fila por archivo tocado en cada commit) junto con el último SHA
+    analizado, así la próxima vez solo se leen los commits nuevos.
+    """
+
+    VERSION = 1
+
+    def __init__(self, proyecto):
+        if cargar_numpy() is None:
+            raise RuntimeError("Las estadísticas necesitan NumPy (pip install numpy)")
+        self.proyecto = proyecto
+        carpeta = os.path.join(proyecto.repo.git_dir, 'aetheryon')
+        os.makedirs(carpeta, exist_ok=True)
+        self.ruta_datos = os.path.join(carpeta, 'estadisticas.npz')
+        self._lock = threading.Lock()
+        self._vaciar()
+        self._cargar()
+
+    def _vaciar(self):
+        self.ultimo_sha = None
+        self.archivos = []
+        self.autores = []
+        # Por commit
+        self.autor_commit = np.zeros(0, dtype=np.int32)
+        self.fecha_commit = np.zeros(0, dtype=np.int64)
+        # Por archivo tocado en cada commit
+        self.fila_commit = np.zeros(0, dtype=np.int32)
+        self.fila_archivo = np.zeros(0, dtype=np.int32)
+        self.agregadas = np.zeros(0, dtype=np.int64)
+        self.eliminadas = np.zeros(0, dtype=np.int64)
+
+    def _cargar(self):
+        if not os.path.exists(self.ruta_datos):
+            return
+        try:
+            with np.load(self.ruta_datos, allow_pickle=False) as datos:
+                if int(datos['version'][0]) != self.VERSION:
+                    return
+                self.ultimo_sha = str(datos['ultimo'][0]) or None
+                self.archivos = datos['archivos'].tolist()
+                self.autores = datos['autores'].tolist()
+                self.autor_commit = datos['autor_commit']
+                self.fecha_commit = datos['fecha_commit']
+                self.fila_commit = datos['fila_commit']
+                self.fila_archivo = datos['fila_archivo']
+                self.agregadas = datos['agregadas']
+                self.eliminadas = datos['eliminadas']
+        except Exception as e:
+            print(f"⚠️ Estadísticas guardadas ilegibles, se recalculan: {e}")
+            self._vaciar()
+
+    def _guardar(self):
+        np.savez(self.ruta_datos,
+                 version=np.array([self.VERSION]),
+                 ultimo=np.array([self.ultimo_sha or ''], dtype=str),
+                 archivos=np.array(self.archivos, dtype=str),
+                 autores=np.array(self.autores, dtype=str),
+                 autor_commit=self.autor_commit,
+                 fecha_commit=self.fecha_commit,
+                 fila_commit=self.fila_commit,
+                 fila_archivo=self.fila_archivo,
+                 agregadas=self.agregadas,
+                 eliminadas=self.eliminadas)
+
+    def actualizar(self):
+        """Incorpora los commits nuevos desde el último SHA analizado; devuelve cuántos leyó"""
+        with self._lock:
+            head = self.proyecto._head_sha()
+            if not head or head == self.ultimo_sha:
+                return 0
+            
+            rango = [head]
+            desde_cero = True
+            if self.ultimo_sha:
+                try:
+                    self.proyecto._git('merge-base', '--is-ancestor', self.ultimo_sha, head)
+                    rango.append(f'^{self.ultimo_sha}')
+                    desde_cero = False
+                except GitCommandError:
+                    # Historia reescrita (rebase, reset): se recalcula todo
+                    print("🔄 Estadísticas: la rama cambió de base, se recalculan")
+            
+            nuevos = self._leer_log(rango, desde_cero)
+            self.ultimo_sha = head
+            self._guardar()
+            return nuevos
+
+    def _leer_log(self, rango, desde_cero=False):
+        """
+        Lee los commits del rango y recién si git terminó bien los suma a los
+        arrays (o los reemplaza, con desde_cero): si falla a mitad, queda lo anterior.
+        """
+        lista_archivos = [] if desde_cero else list(self.archivos)
+        lista_autores = [] if desde_cero else list(self.autores)
+        indice_archivos = {ruta: i for i, ruta in enumerate(lista_archivos)}
+        indice_autores = {autor: i for i, autor in enumerate(lista_autores)}
+        base = 0 if desde_cero else len(self.autor_commit)
+        
+        autores, fechas = [], []
+        filas_commit, filas_archivo, agregadas, eliminadas = [], [], [], []
+        
+        proceso = self.proyecto._git_proceso(
+            'log', '--numstat', '-z', f'--format={FORMATO_LOG_ESTADISTICAS}', *rango)
+        proceso.stdin.close()
+        for registro in _leer_registros(proceso.stdout):
+            campos = registro.decode('utf-8', 'replace').split('\x1f', 3)
+            if len(campos) < 4:
+                continue
+            _sha, autor, fecha, resto = campos
+            numero = base + len(autores)
+            if autor not in indice_autores:
+                indice_autores[autor] = len(lista_autores)
+                lista_autores.append(autor)
+            autores.append(indice_autores[autor])
+            fechas.append(int(fecha))
+            
+            tokens = resto.lstrip('\0\n').split('\0')
+            i = 0
+            while i < len(tokens):
+                token = tokens[i]
+                i += 1
+                if token.count('\t') < 2:
+                    continue
+                mas, menos, ruta = token.split('\t', 2)
+                if not ruta and i + 1 < len(tokens):
+                    # Renombre: el churn se atribuye a la ruta nueva
+                    ruta = tokens[i + 1]
+                    i += 2
+                if ruta not in indice_archivos:
+                    indice_archivos[ruta] = len(lista_archivos)
+                    lista_archivos.append(ruta)
+                filas_commit.append(numero)
+                filas_archivo.append(indice_archivos[ruta])
+                # Los binarios vienen con '-'
+                agregadas.append(int(mas) if mas != '-' else 0)
+                eliminadas.append(int(menos) if menos != '-' else 0)
+        
+        error = proceso.stderr.read()
+        if proceso.wait() != 0:
+            raise _error_comando_git(['git', 'log', '--numstat', *rango], proceso.returncode, error)
+        
+        if desde_cero:
+            self._vaciar()
+        self.archivos = lista_archivos
+        self.autores = lista_autores
+        self.autor_commit = np.concatenate([self.autor_commit, np.array(autores, dtype=np.int32)])
+        self.fecha_commit = np.concatenate([self.fecha_commit, np.array(fechas, dtype=np.int64)])
+        self.fila_commit = np.concatenate([self.fila_commit, np.array(filas_commit, dtype=np.int32)])
+        self.fila_archivo = np.concatenate([self.fila_archivo, np.array(filas_archivo, dtype=np.int32)])
+        self.agregadas = np.concatenate([self.agregadas, np.array(agregadas, dtype=np.int64)])
+        self.eliminadas = np.concatenate([self.eliminadas, np.array(eliminadas, dtype=np.int64)])
+        return len(autores)
+
+    def resumen(self, top=15, semanas=52):
+        """Agregados para el dashboard: archivos calientes, autores, semanas y bus factor"""
+        with self._lock:
+            n_archivos = len(self.archivos)
+            n_autores = len(self.autores)
+            autor_fila = self.autor_commit[self.fila_commit]
+            
+            # Por archivo
+            toques = np.bincount(self.fila_archivo, minlength=n_archivos)
+            mas_archivo = np.bincount(self.fila_archivo, weights=self.agregadas, minlength=n_archivos)
+            menos_archivo = np.bincount(self.fila_archivo, weights=self.eliminadas, minlength=n_archivos)
+            orden = np.lexsort((-(mas_archivo + menos_archivo), -toques))[:top]
+            calientes = [(self.archivos[i], int(toques[i]), int(mas_archivo[i]), int(menos_archivo[i]))
+                         for i in orden]
+            
+            # Por autor
+            commits_autor = np.bincount(self.autor_commit, minlength=n_autores)
+            mas_autor = np.bincount(autor_fila, weights=self.agregadas, minlength=n_autores)
+            menos_autor = np.bincount(autor_fila, weights=self.eliminadas, minlength=n_autores)
+            orden = np.argsort(-commits_autor, kind='stable')[:top]
+            por_autor = [(self.autores[i], int(commits_autor[i]), int(mas_autor[i]), int(menos_autor[i]))
+                         for i in orden]
+            
+            # Por semana (las últimas `semanas` con actividad)
+            por_semana = []
+            if len(self.fecha_commit):
+                semana_commit = self.fecha_commit // SEGUNDOS_SEMANA
+                claves, inversa = np.unique(semana_commit, return_inverse=True)
+                commits_semana = np.bincount(inversa, minlength=len(claves))
+                semana_fila = inversa[self.fila_commit]
+                mas_semana = np.bincount(semana_fila, weights=self.agregadas, minlength=len(claves))
+                menos_semana = np.bincount(semana_fila, weights=self.eliminadas, minlength=len(claves))
+                for k in range(max(0, len(claves) - semanas), len(claves)):
+                    por_semana.append((int(claves[k]) * SEGUNDOS_SEMANA, int(commits_semana[k]),
+                                       int(mas_semana[k]), int(menos_semana[k])))
+            
+            # Bus factor por directorio de primer nivel: cuántos autores suman más
+            # de la mitad de las líneas agregadas
+            bus_factor = []
+            if n_archivos and n_autores:
+                nombres_dir = {}
+                dir_archivo = np.array([
+                    nombres_dir.setdefault(ruta.split('/', 1)[0] if '/' in ruta else '(raíz)', len(nombres_dir))
+                    for ruta in self.archivos], dtype=np.int64)
+                n_dirs = len(nombres_dir)
+                dir_fila = dir_archivo[self.fila_archivo]
+                matriz = np.bincount(dir_fila * n_autores + autor_fila, weights=self.agregadas,
+                                     minlength=n_dirs * n_autores).reshape(n_dirs, n_autores)
+                totales = matriz.sum(axis=1)
+                ordenada = -np.sort(-matriz, axis=1)
+                acumulada = np.cumsum(ordenada, axis=1)
+                factores = np.argmax(acumulada > totales[:, None] / 2, axis=1) + 1
+                principal = np.argmax(matriz, axis=1)
+                nombres = sorted(nombres_dir, key=nombres_dir.get)
+                for d in np.argsort(-totales, kind='stable')[:top]:
+                    if totales[d] <= 0:
+                        continue
+                    bus_factor.append((nombres[d], int(factores[d]), self.autores[principal[d]],
+                                       round(100 * matriz[d, principal[d]] / totales[d])))
+            
+            return {
+                'commits': len(self.autor_commit),
+                'autores': n_autores,
+                'archivos': n_archivos,
+                'agregadas': int(self.agregadas.sum()),
+                'eliminadas': int(self.eliminadas.sum()),
+                'archivos_calientes': calientes,
+                'por_autor': por_autor,
+                'por_semana': por_semana,
+                'bus_factor': bus_factor,
+            }
+
+
+#-----------------------------------
+# Planificador de trabajos de git
+#-----------------------------------
+
+# Menor número = se atiende antes
+PRIORIDAD_INTERACTIVA = 0
+PRIORIDAD_NORMAL = 1
+PRIORIDAD_FONDO = 2
+
+HILOS_PLANIFICADOR = 4
+
+
+class LockLecturaEscritura:
+    """
+    Varias lecturas a la vez o una sola escritura. Mientras una escritura espera
+    no entran lecturas nuevas, para que no quede postergada indefinidamente.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition()
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    def adquirir_lectura(self):
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+
+    def liberar_lectura(self):
+        with self._condicion:
+            self._lectores -= 1
+            if not self._lectores:
+                self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escribiendo or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escribiendo = True
+
+    def liberar_escritura(self):
+        with self._condicion:
+            self._escribiendo = False
+            self._condicion.notify_all()
+
+
+class Trabajo:
+    """Handle de un trabajo enviado al planificador: estado, resultado y cancelación"""
+
+    def __init__(self, funcion, args, kwargs, prioridad, escritura, descripcion):
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.prioridad = prioridad
+        self.escritura = escritura
+        self.descripcion = descripcion or getattr(funcion, '__name__', 'trabajo')
+        self.estado = 'pendiente'
+        self.resultado = None
+        self._planificador = None
+        self._secuencia = None
+        self._de_fondo = False
+        self._cancelado = threading.Event()
+        self._terminado = threading.Event()
+        self._callbacks = []
+        self._al_cancelar = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    @property
+    def terminado(self):
+        return self._terminado.is_set()
+
+    def cancelar(self):
+        """Un trabajo pendiente no llega a correr; uno en curso recibe los hooks de al_cancelar"""
+        self._cancelado.set()
+        with self._lock:
+            hooks = list(self._al_cancelar)
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"⚠️ Error cancelando '{self.descripcion}': {e}")
+
+    def al_cancelar(self, hook):
+        """Registra cómo interrumpir el trabajo en curso (ej: matar el proceso de git)"""
+        with self._lock:
+            self._al_cancelar.append(hook)
+        if self.cancelado:
+            hook()
+
+    def cuando_termine(self, callback):
+        """callback(resultado) en el hilo de Tk; si ya terminó se llama enseguida"""
+        with self._lock:
+            if not self._terminado.is_set():
+                self._callbacks.append(callback)
+                return
+        if not self.cancelado:
+            self._planificador._despachar(lambda: self._llamar(callback, self.resultado))
+
+    def esperar(self, timeout=None):
+        self._terminado.wait(timeout)
+        return self.resultado
+
+    def _finalizar(self, estado, resultado):
+        with self._lock:
+            self.estado = estado
+            self.resultado = resultado
+            self._terminado.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if estado == 'terminado':
+            for callback in callbacks:
+                self._planificador._despachar(lambda c=callback: self._llamar(c, resultado))
+
+    def _llamar(self, callback, resultado):
+        # En la traza, lo que se dibuja con el resultado queda como span del hilo de Tk
+        with TRAZADOR.span(f"al terminar: {self.descripcion}", 'tk'):
+            callback(resultado)
+
+
+class PlanificadorTrabajos:
+    """
+    Cola central para las operaciones de git de la interfaz.
+    
+    Los trabajos se atienden por prioridad (interactivos antes que precargas de
+    fondo) con varios hilos. Las lecturas corren en paralelo y las que tocan el
+    índice o las refs (`escritura=True`) corren solas, así commit, merge o pull
+    no chocan con otra operación por el index.lock. Los callbacks se pasan al
+    hilo de Tk con `despachar`. Los trabajos de fondo nunca ocupan todos los
+    hilos, para que siempre quede uno libre para lo interactivo.
+    """
+
+    def __init__(self, despachar=None, hilos=HILOS_PLANIFICADOR):
+        self._despachar = despachar or (lambda funcion: funcion())
+        self._cola = []
+        self._secuencia = itertools.count()
+        self._condicion = threading.Condition()
+        self._lock_repo = LockLecturaEscritura()
+        self._hilos = hilos
+        self._fondo_corriendo = 0
+        self._cerrado = False
+        for i in range(hilos):
+            threading.Thread(target=self._trabajar, name=f"aetheryon-trabajo-{i}", daemon=True).start()
+
+    def enviar(self, funcion, *args, prioridad=PRIORIDAD_NORMAL, escritura=False,
+               al_terminar=None, descripcion=None, **kwargs):
+        """
+        Encola funcion(*args, **kwargs). Las excepciones se devuelven como str,
+        igual que los métodos de Proyecto. Devuelve el Trabajo.
+        """
+        trabajo = Trabajo(funcion, args, kwargs, prioridad, escritura, descripcion)
+        trabajo._planificador = self
+        if al_terminar:
+            trabajo._callbacks.append(al_terminar)
+        with self._condicion:
+            if self._cerrado:
+                raise RuntimeError("El planificador está cerrado")
+            self._encolar(trabajo, prioridad)
+        return trabajo
+
+    def priorizar(self, trabajo, prioridad):
+        """Adelanta un trabajo pendiente (ej: una precarga que el usuario acaba de pedir)"""
+        with self._condicion:
+            if trabajo._secuencia is not None and prioridad < trabajo.prioridad:
+                self._encolar(trabajo, prioridad)
+
+    def _encolar(self, trabajo, prioridad):
+        # Las entradas viejas de un trabajo re-encolado se descartan al salir de la cola
+        trabajo.prioridad = prioridad
+        trabajo._secuencia = next(self._secuencia)
+        heapq.heappush(self._cola, (prioridad, trabajo._secuencia, trabajo))
+        self._condicion.notify()
+
+    def _siguiente(self):
+        with self._condicion:
+            while True:
+                while self._cola and self._cola[0][2]._secuencia != self._cola[0][1]:
+                    heapq.heappop(self._cola)
+                if self._cola:
+                    prioridad, _, trabajo = self._cola[0]
+                    if prioridad < PRIORIDAD_FONDO or self._fondo_corriendo < self._hilos - 1:
+                        heapq.heappop(self._cola)
+                        trabajo._secuencia = None
+                        trabajo._de_fondo = prioridad >= PRIORIDAD_FONDO
+                        self._fondo_corriendo += trabajo._de_fondo
+                        return trabajo
+                elif self._cerrado:
+                    return None
+                self._condicion.wait()
+
+    def _trabajar(self):
+        while True:
+            trabajo = self._siguiente()
+            if trabajo is None:
+                return
+            try:
+                self._ejecutar(trabajo)
+            finally:
+                if trabajo._de_fondo:
+                    with self._condicion:
+                        self._fondo_corriendo -= 1
+                        self._condicion.notify_all()
+
+    def _ejecutar(self, trabajo):
+        if trabajo.cancelado:
+            trabajo._finalizar('cancelado', None)
+            return
+        if trabajo.escritura:
+            self._lock_repo.adquirir_escritura()
+        else:
+            self._lock_repo.adquirir_lectura()
+        try:
+            if trabajo.cancelado:
+                trabajo._finalizar('cancelado', None)
+                return
+            trabajo.estado = 'corriendo'
+            try:
+                with TRAZADOR.span(trabajo.descripcion, 'trabajo', prioridad=trabajo.prioridad,
+                                   escritura=trabajo.escritura):
+                    resultado = trabajo.funcion(*trabajo.args, **trabajo.kwargs)
+            except (GitCommandError, ErrorGit) as e:
+                resultado = str(e)
+            except Exception as e:
+                print(f"❌ Error en '{trabajo.descripcion}': {e}")
+                resultado = str(e)
+        finally:
+            if trabajo.escritura:
+                self._lock_repo.liberar_escritura()
+            else:
+                self._lock_repo.liberar_lectura()
+        trabajo._finalizar('cancelado' if trabajo.cancelado else 'terminado', resultado)
+
+    def cerrar(self):
+        """Cancela lo pendiente y deja que los hilos terminen"""
+        with self._condicion:
+            self._cerrado = True
+            pendientes = list(dict.fromkeys(trabajo for _, _, trabajo in self._cola))
+            self._cola.clear()
+            self._condicion.notify_all()
+        for trabajo in pendientes:
+            trabajo.cancelar()
+            trabajo._finalizar('cancelado', None)
+
+
+#-----------------------------------
+# Errores de git (AsyncProyecto y planificador)
+#-----------------------------------
+
+class ErrorGit(Exception):
+    """git terminó con error. str() da un texto listo para mostrar en la interfaz"""
+
+    def __init__(self, comando, codigo, detalle):
+        self.comando = comando
+        self.codigo = codigo
+        self.detalle = detalle.strip()
+        if codigo is None:
+            super().__init__(f"{' '.join(comando)}: {self.detalle}")
+        else:
+            super().__init__(f"{' '.join(comando)} (código {codigo}):\n{self.detalle}")
+
+
+class ErrorTiempoGit(ErrorGit):
+    """git no respondió dentro del timeout y se cortó el proceso"""
+
+
+class ErrorConflicto(ErrorGit):
+    """pull/merge/cherry-pick se detuvo por conflictos"""
+
+
+class ErrorGitAusente(ErrorGit):
+    """No se encontró el ejecutable de git"""
+
+
+def _error_de_git(comando, codigo, stdout, stderr):
+    salida = stdout.decode('utf-8', 'replace')
+    detalle = stderr.decode('utf-8', 'replace') or salida
+    if 'CONFLICT' in salida:
+        return ErrorConflicto(comando, codigo, salida + detalle)
+    return ErrorGit(comando, codigo, detalle)
+
+
+#-----------------------------------
+# Backends de lectura (git CLI / libgit2)
+#-----------------------------------
+
+# Operaciones que se comparan entre backends (paridad y latencia)
+OPERACIONES_BACKEND = ('estado', 'rama_actual', 'ramas', 'log', 'diff_arboles', 'leer_blob')
+
+# Commits que se recorren por llamada al comparar y medir
+COMMITS_LOG_BACKEND = 200
+
+
+class BackendCLI:
+    """
+    Lecturas frecuentes con un proceso de git por llamada (los blobs, con el
+    lector persistente de cat-file). Es el backend que siempre está disponible.
+    """
+    nombre = 'cli'
+
+    def __init__(self, proyecto):
+        self.proyecto = proyecto
+
+    def _texto(self, *args):
+        return self.proyecto._git(*args).decode('utf-8', 'replace')
+
+    def estado(self):
+        """{'staged', 'unstaged', 'untracked'} sin detección de renombres (igual que libgit2)"""
+        staged, unstaged, untracked = [], [], []
+        salida = self._texto('status', '--porcelain=v1', '-z', '--no-renames', '--untracked-files=all')
+        for registro in salida.split('\0'):
+            if not registro:
+                continue
+            indice, arbol, ruta = registro[0], registro[1], registro[3:]
+            if indice == '?':
+                untracked.append(ruta)
+                continue
+            if indice not in ' !':
+                staged.append(ruta)
+            if arbol != ' ':
+                unstaged.append(ruta)
+        return {'staged': staged, 'unstaged': unstaged, 'untracked': untracked}
+
+    def rama_actual(self):
+        try:
+            return self._texto('symbolic-ref', '--short', '-q', 'HEAD').strip()
+        except GitCommandError:
+            return None
+
+    def ramas(self):
+        return self._texto('for-each-ref', '--format=%(refname:short)', 'refs/heads').splitlines()
+
+    def ramas_remotas(self, remoto='origin'):
+        prefijo = f'refs/remotes/{remoto}/'
+        refs = self._texto('for-each-ref', '--format=%(refname)', prefijo).splitlines()
+        return [ref[len(prefijo):] for ref in refs if ref != prefijo + 'HEAD']
+
+    def log(self, rango='HEAD', max_count=None):
+        """Commits en --topo-order (el mismo orden que GIT_SORT_TOPOLOGICAL de libgit2)"""
+        args = ['log', '--topo-order', '--format=%H%x1f%P%x1f%an%x1f%ct%x1f%s%x1e']
+        if max_count:
+            args.append(f'--max-count={max_count}')
+        commits = []
+        for registro in self._texto(*args, rango, '--').split('\x1e'):
+            registro = registro.strip('\n')
+            if not registro:
+                continue
+            sha, padres, autor, fecha, asunto = registro.split('\x1f', 4)
+            commits.append({'hash': sha, 'padres': padres.split(), 'autor': autor,
+                            'fecha': int(fecha), 'mensaje': asunto})
+        return commits
+
+    def diff_arboles(self, rev1, rev2):
+        """[(estado, ruta)] entre dos commits, sin renombres"""
+        campos = self._texto('diff-tree', '-r', '--no-renames', '--name-status', '-z', rev1, rev2).split('\0')
+        return [(campos[i], campos[i + 1]) for i in range(0, len(campos) - 1, 2)]
+
+    def leer_blob(self, rev, ruta):
+        leido = self.proyecto.get_lector_objetos().leer(f"{rev}:{ruta}")
+        return leido[2] if leido else None
+
+
+class BackendPygit2(BackendCLI):
+    """Las mismas lecturas dentro del proceso con libgit2 (pygit2), sin lanzar git"""
+    nombre = 'pygit2'
+
+    def __init__(self, proyecto):
+        super().__init__(proyecto)
+        self.repo = pygit2.Repository(proyecto.path)
+        self._lock = threading.Lock()
+
+    def estado(self):
+        staged, unstaged, untracked = [], [], []
+        flags_indice = (pygit2.GIT_STATUS_INDEX_NEW | pygit2.GIT_STATUS_INDEX_MODIFIED |
+                        pygit2.GIT_STATUS_INDEX_DELETED | pygit2.GIT_STATUS_INDEX_TYPECHANGE |
+                        pygit2.GIT_STATUS_INDEX_RENAMED)
+        flags_arbol = (pygit2.GIT_STATUS_WT_MODIFIED | pygit2.GIT_STATUS_WT_DELETED |
+                       pygit2.GIT_STATUS_WT_TYPECHANGE | pygit2.GIT_STATUS_WT_RENAMED)
+        with self._lock:
+            estados = self.repo.status()
+        for ruta, flags in sorted(estados.items()):
+            if flags & pygit2.GIT_STATUS_WT_NEW:
+                untracked.append(ruta)
+            if flags & flags_indice:
+                staged.append(ruta)
+            if flags & flags_arbol:
+                unstaged.append(ruta)
+        return {'staged': staged, 'unstaged': unstaged, 'untracked': untracked}
+
+    def rama_actual(self):
+        with self._lock:
+            if self.repo.head_is_unborn:
+                return self.repo.references['HEAD'].target.replace('refs/heads/', '', 1)
+            if self.repo.head_is_detached:
+                return None
+            return self.repo.head.shorthand
+
+    def ramas(self):
+        with self._lock:
+            return sorted(self.repo.branches.local)
+
+    def ramas_remotas(self, remoto='origin'):
+        prefijo = f'{remoto}/'
+        with self._lock:
+            nombres = list(self.repo.branches.remote)
+        return sorted(n[len(prefijo):] for n in nombres if n.startswith(prefijo) and n != prefijo + 'HEAD')
+
+    def log(self, rango='HEAD', max_count=None):
+        commits = []
+        with self._lock:
+            inicio = self.repo.revparse_single(rango).peel(pygit2.Commit)
+            recorrido = self.repo.walk(inicio.id, pygit2.GIT_SORT_TOPOLOGICAL)
+            for commit in itertools.islice(recorrido, max_count):
+                commits.append({'hash': str(commit.id), 'padres': [str(p) for p in commit.parent_ids],
+                                'autor': commit.author.name, 'fecha': commit.commit_time,
+                                'mensaje': commit.message.split('\n', 1)[0]})
+        return commits
+
+    def diff_arboles(self, rev1, rev2):
+        with self._lock:
+            arbol1 = self.repo.revparse_single(rev1).peel(pygit2.Tree)
+            arbol2 = self.repo.revparse_single(rev2).peel(pygit2.Tree)
+            deltas = self.repo.diff(arbol1, arbol2).deltas
+            cambios = [(delta.status_char(), delta.new_file.path if delta.status_char() != 'D'
+                        else delta.old_file.path) for delta in deltas]
+        return sorted(cambios, key=lambda cambio: cambio[1])
+
+    def leer_blob(self, rev, ruta):
+        with self._lock:
+            try:
+                return self.repo.revparse_single(f"{rev}:{ruta}").data
+            except KeyError:
+                return None
+
+
+def elegir_backend(proyecto, nombre=None):
+    """
+    libgit2 si pygit2 está instalado y abre el repo; si no, git CLI.
+    AETHERYON_BACKEND=cli|pygit2 fuerza uno (para comparar).
+    """
+    nombre = nombre or os.environ.get('AETHERYON_BACKEND')
+    if nombre != 'cli' and cargar_pygit2() is not None:
+        try:
+            return BackendPygit2(proyecto)
+        except Exception as e:
+            print(f"⚠️ pygit2 no pudo abrir el repositorio, se usa git CLI: {e}")
+    return BackendCLI(proyecto)
+
+
+def _llamadas_backend(backend):
+    """Una llamada representativa por operación, con argumentos tomados del propio repo"""
+    commits = backend.log('HEAD', COMMITS_LOG_BACKEND) if backend.rama_actual() is not None else []
+    anterior = commits[-1]['hash'] if commits else None
+    archivo = next((ruta for estado, ruta in backend.diff_arboles(anterior, 'HEAD') if estado != 'D'),
+                   None) if anterior else None
+    llamadas = {
+        'estado': backend.estado,
+        'rama_actual': backend.rama_actual,
+        'ramas': backend.ramas,
+        'log': lambda: backend.log('HEAD', COMMITS_LOG_BACKEND),
+    }
+    if anterior:
+        llamadas['diff_arboles'] = lambda: backend.diff_arboles(anterior, 'HEAD')
+    if archivo:
+        llamadas['leer_blob'] = lambda: backend.leer_blob('HEAD', archivo)
+    return llamadas
+
+
+def verificar_paridad_backends(proyecto):
+    """
+    Compara cada operación de lectura entre git CLI y pygit2.
+    Devuelve {operacion: None si coinciden, o (cli, pygit2)}; str si falta pygit2.
+    """
+    if cargar_pygit2() is None:
+        return "pygit2 no está instalado"
+    cli, libgit2 = BackendCLI(proyecto), elegir_backend(proyecto, 'pygit2')
+    if not isinstance(libgit2, BackendPygit2):
+        return "pygit2 no pudo abrir el repositorio"
+    llamadas_cli, llamadas_libgit2 = _llamadas_backend(cli), _llamadas_backend(libgit2)
+    diferencias = {}
+    for operacion in OPERACIONES_BACKEND:
+        if operacion not in llamadas_cli:
+            continue
+        a, b = llamadas_cli[operacion](), llamadas_libgit2[operacion]()
+        if operacion == 'estado':
+            a, b = {k: sorted(v) for k, v in a.items()}, {k: sorted(v) for k, v in b.items()}
+        elif operacion in ('ramas', 'diff_arboles'):
+            a, b = sorted(a), sorted(b)
+        diferencias[operacion] = None if a == b else (a, b)
+    return diferencias
+
+
+def medir_backends(proyecto, repeticiones=20):
+    """Latencia mediana en ms por llamada: {operacion: {backend: ms}}"""
+    backends = [BackendCLI(proyecto)]
+    if cargar_pygit2() is not None:
+        backend = elegir_backend(proyecto, 'pygit2')
+        if isinstance(backend, BackendPygit2):
+            backends.append(backend)
+    tiempos = {}
+    for backend in backends:
+        for operacion, llamada in _llamadas_backend(backend).items():
+            muestras = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                llamada()
+                muestras.append((time.perf_counter() - inicio) * 1000)
+            muestras.sort()
+            tiempos.setdefault(operacion, {})[backend.nombre] = muestras[len(muestras) // 2]
+    return tiempos
+
+
+def _imprimir_verificacion_backends(path):
+    """`--verificar-backends [ruta]`: paridad y latencia de los backends, sin abrir la interfaz"""
+    proyecto = Proyecto(path)
+    if not proyecto.repo:
+        print(f"❌ {path} no es un repositorio git")
+        return
+    paridad = verificar_paridad_backends(proyecto)
+    if isinstance(paridad, str):
+        print(f"⚠️ Paridad: {paridad}")
+    else:
+        for operacion, diferencia in paridad.items():
+            print(f"{'✅' if diferencia is None else '❌'} {operacion}")
+            if diferencia is not None:
+                print(f"     cli:    {diferencia[0]!r:.300}\n     pygit2: {diferencia[1]!r:.300}")
+    print("\n⏱️ Latencia mediana por llamada (ms):")
+    for operacion, por_backend in medir_backends(proyecto).items():
+        columnas = "  ".join(f"{nombre}: {ms:8.2f}" for nombre, ms in por_backend.items())
+        print(f"  {operacion:<13} {columnas}")
+    proyecto.cerrar()
+
+
+#-----------------------------------
+# Sesión persistente
+#-----------------------------------
+
+CARPETA_SESION = os.path.join(os.path.expanduser('~'), '.aetheryon')
+
+MAX_PROYECTOS_RECIENTES = 10
+
+# Listas más largas se guardan recortadas: al abrir se reescanea igual
+MAX_ARCHIVOS_SESION = 20000
+
+VERSION_SESION = 1
+
+
+class SesionPersistida:
+    """
+    ~/.aetheryon/sesion.json: proyectos recientes (el primero es el último
+    abierto) y, por proyecto, la última rama, status y lista de archivos vistos.
+    Sirve para mostrar algo útil apenas se abre la app, mientras se reescanea.
+    Se escribe a un temporal y se reemplaza, así un cierre a mitad no la rompe.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or os.path.join(CARPETA_SESION, 'sesion.json')
+        self._lock = threading.Lock()
+        self._datos = self._leer()
+
+    def _leer(self):
+        vacia = {'version': VERSION_SESION, 'recientes': [], 'proyectos': {}}
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return vacia
+        if not isinstance(datos, dict) or datos.get('version') != VERSION_SESION:
+            return vacia
+        return datos
+
+    @staticmethod
+    def _clave(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def recientes(self):
+        """Rutas de los proyectos recientes que todavía existen, del más nuevo al más viejo"""
+        with self._lock:
+            rutas = [self._datos['proyectos'][clave]['path'] for clave in self._datos['recientes']
+                     if clave in self._datos['proyectos']]
+        return [ruta for ruta in rutas if os.path.isdir(ruta)]
+
+    def instantanea(self, path):
+        """{'path', 'rama', 'status', 'archivos', 'ignorados', 'total', 'guardado'} o None"""
+        with self._lock:
+            datos = self._datos['proyectos'].get(self._clave(path))
+            return dict(datos) if datos else None
+
+    def guardar_instantanea(self, path, rama, escaneo):
+        """Guarda lo último que se vio del proyecto (escaneo de escanear_archivos) y lo pasa al frente"""
+        archivos = escaneo['archivos']
+        clave = self._clave(path)
+        with self._lock:
+            self._datos['proyectos'][clave] = {
+                'path': os.path.abspath(path),
+                'rama': rama,
+                'status': escaneo.get('status'),
+                'archivos': [list(par) for par in archivos[:MAX_ARCHIVOS_SESION]],
+                'ignorados': escaneo['ignorados'],
+                'total': len(archivos),
+                'guardado': time.time(),
+            }
+            self._al_frente(clave)
+            self._escribir()
+
+    def olvidar(self, path):
+        clave = self._clave(path)
+        with self._lock:
+            self._datos['proyectos'].pop(clave, None)
+            if clave in self._datos['recientes']:
+                self._datos['recientes'].remove(clave)
+            self._escribir()
+
+    def _al_frente(self, clave):
+        recientes = [clave] + [c for c in self._datos['recientes'] if c != clave]
+        self._datos['recientes'] = recientes[:MAX_PROYECTOS_RECIENTES]
+        for vieja in set(self._datos['proyectos']) - set(self._datos['recientes']):
+            del self._datos['proyectos'][vieja]
+
+    def _escribir(self):
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            temporal = f"{self.ruta}.{os.getpid()}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self._datos, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la sesión: {e}")
+
+
+#-----------------------------------
+# Clase Proyecto
+#-----------------------------------
+
+class Proyecto:
+    def __init__(self, path):
+        self.path = path
+        # El Repo de GitPython se crea recién cuando algo lo usa (ver repo)
+        self._repo = None
+        self._repo_cargado = False
+        self._lock_apertura = threading.Lock()
+        self._cache_commits = None
+        self._historiales_archivo = OrderedDict()
+        self._lock_historiales = threading.Lock()
+        self._blames = OrderedDict()
+        self._estadisticas = None
+        self._lock_blames = threading.Lock()
+        self._lector_objetos = None
+        self._lock_lector = threading.Lock()
+        self._diffs = OrderedDict()
+        self._lock_diffs = threading.Lock()
+        self._async = None
+        self._backend = None
+
+    @property
+    def repo(self):
+        """Repo de GitPython (None si no es un repositorio), abierto en el primer uso"""
+        if not self._repo_cargado:
+            with self._lock_apertura:
+                if not self._repo_cargado:
+                    self._repo = self._cargar_repo()
+                    self._repo_cargado = True
+        return self._repo
+
+    @repo.setter
+    def repo(self, repo):
+        self._repo = repo
+        self._repo_cargado = True
+
+    @property
+    def es_repositorio(self):
+        """Como `bool(self.repo)` pero sin importar GitPython si todavía no se abrió"""
+        if self._repo_cargado:
+            return self._repo is not None
+        return os.path.exists(os.path.join(self.path, '.git'))
+
+    def _cargar_repo(self):
+        cargar_git()
+        try:
+            return RepoMedido(self.path)
+        except:
+            return None
+
+    def _git(self, *args, entrada=None):
+        """Ejecuta git en el proyecto y devuelve stdout en bytes (GitCommandError si falla)"""
+        comando = ['git', *args]
+        with medir_subproceso(comando) as medicion:
+            resultado = subprocess.run(comando, cwd=self.path, input=entrada,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       creationflags=FLAGS_SUBPROCESO)
+            medicion.bytes = len(resultado.stdout)
+        if resultado.returncode != 0:
+            raise _error_comando_git(comando, resultado.returncode, resultado.stderr)
+        return resultado.stdout
+
+    def _git_proceso(self, *args, entorno=None):
+        """Lanza git con stdin/stdout en pipes para procesar la salida en streaming"""
+        # Solo se cuenta el lanzamiento: la lectura la hace quien consume la salida
+        METRICAS.registrar_subproceso(['git', *args])
+        TRAZADOR.instante(_subcomando_git(['git', *args]), 'git', argv=' '.join(['git', *args])[:500])
+        return subprocess.Popen(['git', *args], cwd=self.path,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, creationflags=FLAGS_SUBPROCESO,
+                                env={**os.environ, **entorno} if entorno else None)
+
+    def get_lector_objetos(self):
+        """Lector de objetos compartido por todas las vistas del proyecto"""
+        with self._lock_lector:
+            if self._lector_objetos is None:
+                self._lector_objetos = LectorObjetos(self)
+            return self._lector_objetos
+
+    def get_backend(self):
+        """Backend de lectura elegido al abrir el proyecto (libgit2 si está disponible)"""
+        if self._backend is None and self.es_repositorio:
+            self._backend = elegir_backend(self)
+            print(f"📚 Backend de lectura: {self._backend.nombre}")
+        return self._backend
+
+    def get_async(self):
+        """Fachada asyncio del mismo proyecto (excepciones tipadas en vez de str)"""
+        if self._async is None:
+            # asyncio tarda en importarse: se carga recién con la primera operación que lo usa
+            from aetheryon_async import AsyncProyecto
+            self._async = AsyncProyecto(self.path)
+        return self._async
+
+    def _sincronico(self, corrutina):
+        """Espera una corrutina de AsyncProyecto con el contrato de siempre: True/valor o str del error"""
+        try:
+            resultado = self.get_async().bucle.ejecutar(corrutina)
+        except ErrorGit as e:
+            return str(e)
+        return True if resultado is None else resultado
+
+    def cerrar(self):
+        """Libera los procesos de git que quedan abiertos (al cambiar de proyecto)"""
+        if self._lector_objetos:
+            self._lector_objetos.cerrar()
+
+    def get_cache_commits(self):
+        """Devuelve la cache de commits ya actualizada, o None si no se puede usar"""
+        if not self.repo:
+            return None
+        try:
+            if self._cache_commits is None:
+                self._cache_commits = CacheCommits(self)
+            self._cache_commits.actualizar()
+            return self._cache_commits
+        except Exception as e:
+            print(f"⚠️ Cache de commits no disponible: {e}")
+            return None
+
+    def _head_sha(self):
+        try:
+            return self.repo.head.commit.hexsha
+        except ValueError:
+            return None
+
+    def iniciar_git(self):
+        if not os.path.exists(os.path.join(self.path, ".git")):
+            self.repo = cargar_git().init(self.path)
+            
+            gitignore_path = os.path.join(self.path, ".gitignore")
+            if not os.path.exists(gitignore_path):
+                with open(gitignore_path, 'w', encoding='utf-8') as f:
+                    f.write(GITIGNORE_TEMPLATE)
+                print("📄 .gitignore creado automáticamente")
+            
+            return True
+        return False
+
+    def get_rama_actual(self):
+        if not self.es_repositorio:
+            return "Sin repo"
+        try:
+            return self.get_backend().rama_actual() or "HEAD detached"
+        except Exception:
+            return "HEAD detached"
+
+    def cambiar_rama(self, nombre_rama):
+        try:
+            self.repo.git.checkout(nombre_rama)
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def listar_ramas(self):
+        try:
+            backend = self.get_backend()
+            ramas_locales = backend.ramas()
+            try:
+                ramas_remotas = backend.ramas_remotas('origin')
+            except Exception:
+                ramas_remotas = []
+            return {
+                'locales': ramas_locales,
+                'remotas': ramas_remotas
+            }
+        except Exception as e:
+            return {'locales': [], 'remotas': []}
+
+    def fetch(self):
+        return self._sincronico(self.get_async().fetch())
+
+    def fetch_remotos(self):
+        """Fetch de todos los remotos en paralelo: {remoto: True o str del error}, o str si no se pudo"""
+        resultado = self._sincronico(self.get_async().fetch_remotos())
+        if isinstance(resultado, str):
+            return resultado
+        return {remoto: r if r is True else str(r) for remoto, r in resultado.items()}
+
+    def cherry_pick_commit(self, commit_hash):
+        try:
+            self.repo.git.cherry_pick(commit_hash)
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def cherry_pick_commits(self, hashes, al_progreso=None):
+        """
+        Aplica varios commits, en el orden recibido, con una sola corrida del
+        secuenciador de git. al_progreso(aplicados, linea) se llama por cada
+        commit creado.
+        
+        Returns:
+            True, o str con el error. Si se frenó por un conflicto,
+            hay_cherry_pick_en_progreso() queda en True.
+        """
+        return self._correr_secuenciador(['cherry-pick', *hashes], al_progreso)
+
+    def continuar_cherry_pick(self, al_progreso=None):
+        """Crea el commit con los conflictos resueltos y sigue con los restantes"""
+        return self._correr_secuenciador(['cherry-pick', '--continue'], al_progreso)
+
+    def saltar_cherry_pick(self, al_progreso=None):
+        """Descarta el commit en conflicto y sigue con los restantes"""
+        return self._correr_secuenciador(['cherry-pick', '--skip'], al_progreso)
+
+    def abortar_cherry_pick(self):
+        try:
+            self.repo.git.cherry_pick('--abort')
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def _correr_secuenciador(self, argumentos, al_progreso=None):
+        # GIT_EDITOR=true: los commits usan su mensaje original sin abrir un editor
+        proceso = self._git_proceso(*argumentos, entorno={'GIT_EDITOR': 'true'})
+        proceso.stdin.close()
+        # stderr se vacía en paralelo: con muchos conflictos o avisos llenaría el pipe
+        # y git quedaría bloqueado escribiéndolo mientras acá se espera stdout
+        errores = []
+        lector_errores = threading.Thread(target=lambda: errores.append(proceso.stderr.read()), daemon=True)
+        lector_errores.start()
+        aplicados = 0
+        for linea in proceso.stdout:
+            linea = linea.decode('utf-8', 'replace').rstrip()
+            # git informa cada commit creado como "[rama abc1234] asunto"
+            if linea.startswith('['):
+                aplicados += 1
+                print(f"🍒 {linea}")
+                if al_progreso:
+                    al_progreso(aplicados, linea)
+        lector_errores.join()
+        error = b''.join(errores).decode('utf-8', 'replace').strip()
+        if proceso.wait() != 0:
+            return error or f"git {' '.join(argumentos)} terminó con código {proceso.returncode}"
+        return True
+
+    def hay_cherry_pick_en_progreso(self):
+        """Verifica si hay un cherry-pick detenido (por conflicto) en progreso"""
+        if not self.repo:
+            return False
+        git_dir = self.repo.git_dir
+        return (os.path.exists(os.path.join(git_dir, 'CHERRY_PICK_HEAD')) or
+                os.path.exists(os.path.join(git_dir, 'sequencer', 'todo')))
+
+    def get_cherry_picks_pendientes(self):
+        """Cantidad de commits que le quedan al secuenciador (incluye el detenido)"""
+        try:
+            with open(os.path.join(self.repo.git_dir, 'sequencer', 'todo'), encoding='utf-8') as f:
+                return sum(1 for linea in f if linea.strip() and not linea.startswith('#'))
+        except OSError:
+            return 1 if self.hay_cherry_pick_en_progreso() else 0
+
+    def get_candidatos_cherry_pick(self, rama_origen, al_progreso=None):
+        """
+        Commits de `rama_origen` que todavía no están en la rama actual, descartando
+        los que ya se aplicaron con otro SHA (mismo patch-id, como `git cherry`) y
+        los que no introducen cambios.
+        
+        Returns:
+            dict con 'candidatos' (RegistroCommit, más nuevo primero), 'equivalentes'
+            y 'sin_cambios', o str con el error
+        """
+        if not self.repo:
+            return "No hay repositorio Git"
+        try:
+            lado_origen = self._git('rev-list', '--no-merges', f'HEAD..{rama_origen}', '--').decode().split()
+            lado_actual = self._git('rev-list', '--no-merges', f'{rama_origen}..HEAD', '--').decode().split()
+            ids = self._get_patch_ids(lado_origen + lado_actual, al_progreso)
+        except GitCommandError as e:
+            return str(e)
+        
+        aplicados = {ids[sha] for sha in lado_actual if ids.get(sha)}
+        candidatos = []
+        equivalentes = sin_cambios = 0
+        for sha in lado_origen:
+            patch_id = ids.get(sha)
+            if patch_id is None:
+                sin_cambios += 1
+            elif patch_id in aplicados:
+                equivalentes += 1
+            else:
+                candidatos.append(sha)
+        
+        cache = self.get_cache_commits()
+        registros = []
+        for sha in candidatos:
+            c = cache.obtener(sha) if cache else None
+            if c:
+                registros.append(self._commit_desde_cache(c))
+            else:
+                commit = self.repo.commit(sha)
+                registros.append(RegistroCommit(commit.binsha, commit.message.strip(), str(commit.author),
+                                                commit.committed_date, [p.binsha for p in commit.parents]))
+        return {'candidatos': registros, 'equivalentes': equivalentes, 'sin_cambios': sin_cambios}
+
+    def _get_patch_ids(self, shas, al_progreso=None):
+        """
+        {sha: patch_id} (None si el commit no tiene cambios). Los que no están en
+        la cache se calculan por bloques en paralelo y se guardan.
+        """
+        cache = self.get_cache_commits()
+        ids = cache.patch_ids(shas) if cache else {}
+        faltantes = [sha for sha in shas if sha not in ids]
+        if not faltantes:
+            return ids
+        
+        bloques = [faltantes[i:i + TAM_BLOQUE_PATCH_ID] for i in range(0, len(faltantes), TAM_BLOQUE_PATCH_ID)]
+        
+        def calcular(bloque):
+            diff = self._git('diff-tree', '--stdin', '--root', '-p', '--no-color', '--no-ext-diff',
+                             entrada=('\n'.join(bloque) + '\n').encode())
+            salida = self._git('patch-id', '--stable', entrada=diff).decode()
+            calculados = dict.fromkeys(bloque)
+            for linea in salida.splitlines():
+                patch_id, _, sha = linea.partition(' ')
+                if sha in calculados:
+                    calculados[sha] = patch_id
+            return calculados
+        
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 2)) as pool:
+            for hechos, calculados in enumerate(pool.map(calcular, bloques), 1):
+                ids.update(calculados)
+                if cache:
+                    cache.guardar_patch_ids(list(calculados.items()))
+                if al_progreso:
+                    al_progreso(hechos, len(bloques))
+        return ids
+
+    def listar_rango(self, rango):
+        """SHAs de un rango (ej: 'main..feature'), del más viejo al más nuevo"""
+        try:
+            return self._git('rev-list', '--reverse', '--topo-order', rango, '--').decode().split()
+        except GitCommandError as e:
+            print(f"Error listando rango {rango}: {e}")
+            return []
+
+    def crear_rama(self, nombre_rama):
+        try:
+            self.repo.git.checkout('HEAD', b=nombre_rama)
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+#####MERGE
+    def merge_rama(self, rama_origen):
+        """Realiza un merge de la rama especificada a la rama actual"""
+        try:
+            self.repo.git.merge(rama_origen)
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def abortar_merge(self):
+        """Aborta un merge en progreso"""
+        try:
+            self.repo.git.merge('--abort')
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def continuar_merge(self):
+        """Continúa un merge después de resolver conflictos"""
+        try:
+            self.repo.git.commit('--no-edit')
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def hay_merge_en_progreso(self):
+        """Verifica si hay un merge en progreso"""
+        merge_head = os.path.join(self.path, '.git', 'MERGE_HEAD')
+        return os.path.exists(merge_head)
+
+    def get_conflictos(self):
+        """Obtiene la lista de archivos con conflictos"""
+        if not self.repo:
+            return []
+        
+        try:
+            # Obtener archivos con conflictos usando git diff
+            output = self.repo.git.diff('--name-only', '--diff-filter=U')
+            if output:
+                return output.strip().split('\n')
+            return []
+        except Exception as e:
+            print(f"Error obteniendo conflictos: {e}")
+            return []
+
+    def resolver_conflicto_archivo(self, archivo, resolucion='ours'):
+        """
+        Resuelve un conflicto de merge para un archivo específico
+        resolucion: 'ours' (mantener cambios actuales) o 'theirs' (aceptar cambios entrantes)
+        """
+        try:
+            if resolucion == 'ours':
+                self.repo.git.checkout('--ours', archivo)
+            elif resolucion == 'theirs':
+                self.repo.git.checkout('--theirs', archivo)
+            
+            self.repo.git.add(archivo)
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+
+
+    def detectar_divergencia_ramas(self, rama1, rama2):
+        """
+        Detecta si dos ramas tienen commits diferentes (divergencia)
+        Retorna dict con archivos divergentes y sus timestamps ({} si no hay),
+        o None si falla
+        """
+        if not self.repo:
+            return None
+        
+        try:
+            # Último commit que tocó cada archivo en cada rama
+            cache = self.get_cache_commits()
+            commits_rama1 = self._ultimos_cambios_por_archivo(rama1, cache)
+            commits_rama2 = self._ultimos_cambios_por_archivo(rama2, cache)
+            
+            # Encontrar divergencias
+            divergencias = {}
+            todos_archivos = set(commits_rama1.keys()) | set(commits_rama2.keys())
+            
+            for archivo in todos_archivos:
+                info1 = commits_rama1.get(archivo)
+                info2 = commits_rama2.get(archivo)
+                
+                # Si el archivo existe en ambas ramas pero con diferentes commits
+                if info1 and info2:
+                    if info1['hash'] != info2['hash']:
+                        divergencias[archivo] = {
+                            rama1: info1,
+                            rama2: info2,
+                            'mas_reciente': rama1 if info1['timestamp'] > info2['timestamp'] else rama2,
+                            'diferencia_dias': abs(info1['timestamp'] - info2['timestamp']) / 86400
+                        }
+                # Si el archivo solo existe en una rama
+                elif info1 and not info2:
+                    divergencias[archivo] = {
+                        rama1: info1,
+                        rama2: {'hash': 'N/A', 'fecha': 'No existe', 'mensaje': 'Archivo no presente'},
+                        'solo_en': rama1
+                    }
+                elif info2 and not info1:
+                    divergencias[archivo] = {
+                        rama1: {'hash': 'N/A', 'fecha': 'No existe', 'mensaje': 'Archivo no presente'},
+                        rama2: info2,
+                        'solo_en': rama2
+                    }
+            
+            return divergencias
+            
+        except Exception as e:
+            print(f"Error detectando divergencias: {e}")
+            return None
+
+    def _ultimos_cambios_por_archivo(self, rama, cache, max_count=50):
+        """
+        {ruta: datos del commit más reciente que la tocó} en los últimos
+        `max_count` commits de `rama`, leídos de la cache de commits
+        """
+        ultimos = {}
+        if cache:
+            sha = self._git('rev-parse', '--verify', f'{rama}^{{commit}}').decode().strip()
+            for c in cache.recorrer(sha, max_count=max_count):
+                for _, ruta, ruta_anterior in cache.archivos_de(c['sha']):
+                    # Un renombre toca las dos rutas, igual que en commit.stats
+                    for r in (ruta, ruta_anterior):
+                        if r and r not in ultimos:
+                            ultimos[r] = {
+                                'hash': c['sha'][:8],
+                                'fecha': datetime.fromtimestamp(c['fecha_commit']).strftime('%Y-%m-%d %H:%M'),
+                                'timestamp': c['fecha_commit'],
+                                'mensaje': self._commit_desde_cache(c).mensaje
+                            }
+            return ultimos
+        
+        # Sin cache: un `git diff` por commit vía commit.stats
+        for commit in self.repo.iter_commits(rama, max_count=max_count):
+            for item in commit.stats.files.keys():
+                if item not in ultimos:
+                    ultimos[item] = {
+                        'hash': commit.hexsha[:8],
+                        'fecha': datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M'),
+                        'timestamp': commit.committed_date,
+                        'mensaje': commit.message.strip()
+                    }
+        return ultimos
+
+    def analizar_merge_previo(self, rama_origen):
+        """
+        Analiza si un merge sería fast-forward o requiere commit de merge
+        """
+        try:
+            rama_actual = self.get_rama_actual()
+            
+            # Ver si rama_actual está contenida en rama_origen (fast-forward posible);
+            # --is-ancestor sale con 1 cuando no lo está, cualquier otro código es un error
+            try:
+                self.repo.git.merge_base('--is-ancestor', rama_actual, rama_origen)
+                es_fast_forward = True
+            except GitCommandError as e:
+                if e.status != 1:
+                    raise
+                es_fast_forward = False
+            
+            # Contar commits diferentes
+            commits_adelante = len(list(self.repo.iter_commits(f'{rama_actual}..{rama_origen}')))
+            commits_atras = len(list(self.repo.iter_commits(f'{rama_origen}..{rama_actual}')))
+            
+            return {
+                'es_fast_forward': es_fast_forward,
+                'commits_adelante': commits_adelante,  # Cuántos commits tiene rama_origen que no tiene actual
+                'commits_atras': commits_atras,        # Cuántos commits tiene actual que no tiene rama_origen
+                'requiere_merge': commits_adelante > 0 and commits_atras > 0
+            }
+            
+        except Exception as e:
+            print(f"Error analizando merge: {e}")
+            return None
+
+    def get_info_archivo_en_rama(self, archivo, rama):
+        """
+        Hash, tamaño y tipo de un archivo en una rama sin leerlo entero: el tamaño
+        sale de `cat-file --batch-check` y el tipo de los primeros bytes.
+        
+        Returns:
+            dict con 'sha', 'tamaño', 'binario' y 'codificacion', None si el archivo
+            no existe en esa rama, o str con el error
+        """
+        if not self.repo:
+            return "No hay repositorio Git"
+        lector = self.get_lector_objetos()
+        try:
+            info = lector.info(f'{rama}:{archivo}')
+            if not info or info[1] != 'blob':
+                return None
+            sha, _, tamaño = info
+            if tamaño <= MAX_BYTES_BLOB_CACHEABLE:
+                # Queda en la cache del lector para la lectura completa que suele seguir
+                muestra = lector.leer(sha)[2][:BYTES_DETECCION]
+            else:
+                proceso = self._git_proceso('cat-file', 'blob', sha)
+                try:
+                    proceso.stdin.close()
+                    muestra = proceso.stdout.read(BYTES_DETECCION)
+                finally:
+                    self._cerrar_proceso(proceso)
+        except OSError as e:
+            return str(e)
+        codificacion = _detectar_codificacion(muestra)
+        return {'sha': sha, 'tamaño': tamaño, 'binario': codificacion is None, 'codificacion': codificacion}
+
+    def _bloques_blob(self, info):
+        """Bytes de un blob por bloques: desde el lector si es chico, en streaming si es grande"""
+        if info['tamaño'] <= MAX_BYTES_BLOB_CACHEABLE:
+            leido = self.get_lector_objetos().leer(info['sha'])
+            contenido = leido[2] if leido else b''
+            for inicio in range(0, len(contenido), TAM_BLOQUE_CONTENIDO):
+                yield contenido[inicio:inicio + TAM_BLOQUE_CONTENIDO]
+            return
+        proceso = self._git_proceso('cat-file', 'blob', info['sha'])
+        try:
+            proceso.stdin.close()
+            while True:
+                bloque = proceso.stdout.read(TAM_BLOQUE_CONTENIDO)
+                if not bloque:
+                    return
+                yield bloque
+        finally:
+            self._cerrar_proceso(proceso)
+
+    def iterar_contenido_archivo(self, info, max_lineas=None):
+        """
+        Contenido de un blob de texto (ver get_info_archivo_en_rama) en bloques ya
+        decodificados, sin cargarlo entero en memoria. Con max_lineas corta después
+        de esa cantidad de líneas.
+        """
+        decodificador = codecs.getincrementaldecoder(info['codificacion'])(errors='replace')
+        bloques = self._bloques_blob(info)
+        restantes = max_lineas
+        retenido = ''
+        try:
+            while True:
+                bloque = next(bloques, b'')
+                texto = retenido + decodificador.decode(bloque, final=not bloque)
+                # Un \r al final puede ser la mitad de un \r\n partido entre bloques
+                retenido = '\r' if bloque and texto.endswith('\r') else ''
+                texto = texto[:len(texto) - len(retenido)].replace('\r\n', '\n')
+                if restantes is not None:
+                    saltos = texto.count('\n')
+                    if saltos >= restantes:
+                        posicion = -1
+                        for _ in range(restantes):
+                            posicion = texto.index('\n', posicion + 1)
+                        yield texto[:posicion + 1]
+                        return
+                    restantes -= saltos
+                if texto:
+                    yield texto
+                if not bloque:
+                    return
+        finally:
+            bloques.close()
+
+    def _cerrar_proceso(self, proceso):
+        """Termina un proceso de git que se dejó de leer antes del final"""
+        if proceso.poll() is None:
+            try:
+                proceso.kill()
+            except OSError:
+                pass
+        for flujo in (proceso.stdin, proceso.stdout, proceso.stderr):
+            try:
+                flujo.close()
+            except OSError:
+                pass
+        proceso.wait()
+
+    def get_contenido_archivo_en_rama(self, archivo, rama, max_lineas=None):
+        """Obtiene el contenido de un archivo en una rama específica (None si no existe o es binario)"""
+        info = self.get_info_archivo_en_rama(archivo, rama)
+        if not isinstance(info, dict) or info['binario']:
+            return None
+        try:
+            return ''.join(self.iterar_contenido_archivo(info, max_lineas))
+        except OSError:
+            return None
+
+    def get_diff_lado_a_lado(self, archivo, rama1, rama2, algoritmo='histogram', contexto=CONTEXTO_DIFF,
+                             ruta_anterior=None):
+        """
+        Diff de un archivo entre dos ramas con el motor de git, ya alineado en hunks.
+        Solo se leen las líneas de contexto alrededor de cada cambio. Con
+        `ruta_anterior` se compara un archivo renombrado entre las dos ramas.
+        
+        Los resultados se cachean por los blobs de ambos lados, así que vuelven a
+        servir aunque las ramas avancen mientras el archivo no cambie.
+        
+        Returns:
+            dict con 'hunks' (ver _parsear_diff_lado_a_lado), 'binario', 'nuevo' y
+            'eliminado' (el archivo falta en rama1 o en rama2), o str con el error
+        """
+        if not self.repo:
+            return "No hay repositorio Git"
+        try:
+            lector = self.get_lector_objetos()
+            antes = lector.info(f'{rama1}:{ruta_anterior or archivo}')
+            despues = lector.info(f'{rama2}:{archivo}')
+        except OSError as e:
+            return str(e)
+        clave = (antes and antes[0], despues and despues[0], algoritmo, contexto)
+        with self._lock_diffs:
+            if clave in self._diffs:
+                self._diffs.move_to_end(clave)
+                return self._diffs[clave]
+        
+        rutas = [archivo, ruta_anterior] if ruta_anterior else [archivo]
+        try:
+            salida = self._git('diff', '--no-color', '--no-ext-diff', '-M', f'--diff-algorithm={algoritmo}',
+                               f'-U{contexto}', rama1, rama2, '--', *rutas)
+        except GitCommandError as e:
+            return str(e)
+        
+        texto = salida.decode('utf-8', errors='replace')
+        # git avisa "Binary files ... differ" en lugar de hunks
+        cabecera = texto.partition('\n@@ ')[0].splitlines()
+        binario = any(linea.startswith('Binary files ') for linea in cabecera)
+        resultado = {
+            'hunks': [] if binario else _parsear_diff_lado_a_lado(texto),
+            'binario': binario,
+            'nuevo': any(linea.startswith('new file mode') for linea in cabecera),
+            'eliminado': any(linea.startswith('deleted file mode') for linea in cabecera),
+        }
+        if antes or despues:
+            with self._lock_diffs:
+                self._diffs[clave] = resultado
+                while len(self._diffs) > MAX_DIFFS_CACHE:
+                    self._diffs.popitem(last=False)
+        return resultado
+
+    def comparar_arboles_ramas(self, rama1, rama2):
+        """
+        Todos los archivos que difieren entre las puntas de dos ramas, con un solo
+        `git diff --raw --numstat -z` (con detección de renombres).
+        
+        Returns:
+            dict con 'archivos' (ver _parsear_raw_numstat), 'agregadas' y
+            'eliminadas', o str con el error
+        """
+        if not self.repo:
+            return "No hay repositorio Git"
+        try:
+            salida = self._git('diff', '--raw', '--numstat', '-z', '-M', '--no-abbrev', rama1, rama2, '--')
+        except GitCommandError as e:
+            return str(e)
+        archivos = _parsear_raw_numstat(salida.decode('utf-8', errors='replace'))
+        archivos.sort(key=lambda a: a['ruta'])
+        return {
+            'archivos': archivos,
+            'agregadas': sum(a['agregadas'] or 0 for a in archivos),
+            'eliminadas': sum(a['eliminadas'] or 0 for a in archivos),
+        }
+
+    def precargar_diff(self, entrada, rama1, rama2, algoritmo='histogram'):
+        """
+        Calcula y deja en cache el diff de un archivo de comparar_arboles_ramas y
+        sus blobs en el lector de objetos (pensado para correr en segundo plano).
+        """
+        lector = self.get_lector_objetos()
+        for blob in (entrada['blob_antes'], entrada['blob_despues']):
+            if blob and blob.strip('0'):
+                info = lector.info(blob)
+                if info and info[2] <= MAX_BYTES_BLOB_CACHEABLE:
+                    lector.leer(blob)
+        return self.get_diff_lado_a_lado(entrada['ruta'], rama1, rama2, algoritmo,
+                                         ruta_anterior=entrada['ruta_anterior'])
+
+    def get_lineas_archivo_en_rama(self, archivo, rama):
+        """Líneas de un archivo en una rama (para expandir regiones sin cambios), o None"""
+        contenido = self.get_contenido_archivo_en_rama(archivo, rama)
+        if contenido is None:
+            return None
+        lineas = contenido.split('\n')
+        if lineas and lineas[-1] == '':
+            lineas.pop()
+        return lineas
+
+
+####
+
+    def push(self):
+        return self._sincronico(self.get_async().push())
+
+    def pull(self):
+        return self._sincronico(self.get_async().pull())
+
+    def get_git_log(self, max_count=10):
+        return self._sincronico(self.get_async().log(max_count))
+
+    def get_git_status(self):
+        return self._sincronico(self.get_async().status_texto())
+
+    def clonar_repo(self, url, directorio_destino):
+        try:
+            print(f"📥 Clonando repositorio: {url}")
+            print(f"📂 Destino: {directorio_destino}")
+            
+            parent_dir = os.path.dirname(directorio_destino)
+            if not os.path.exists(parent_dir):
+                os.makedirs(parent_dir)
+            
+            self.repo = cargar_git().clone_from(url, directorio_destino)
+            self.path = directorio_destino
+            print("✅ Repositorio clonado exitosamente")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al clonar: {e}")
+            return str(e)
+
+    def get_commits_detallados(self, max_count=20):
+        if not self.repo:
+            return []
+        
+        cache = self.get_cache_commits()
+        if cache:
+            head = self._head_sha()
+            if not head:
+                return []
+            return [self._commit_desde_cache(c) for c in cache.recorrer(head, max_count=max_count)]
+        
+        try:
+            commits = []
+            for commit in self.repo.iter_commits(max_count=max_count):
+                commits.append(RegistroCommit(commit.binsha, commit.message.strip(), str(commit.author),
+                                              commit.committed_date, [p.binsha for p in commit.parents]))
+            return commits
+        except Exception as e:
+            return []
+
+    def _commit_desde_cache(self, c):
+        mensaje = c['asunto']
+        if c['cuerpo'].strip():
+            mensaje += '\n\n' + c['cuerpo'].strip()
+        return RegistroCommit(c['sha'], mensaje, c['autor'], c['fecha_commit'], c['padres'])
+
+    def buscar_commits(self, texto, max_count=50):
+        """Búsqueda de texto completo sobre mensajes, autores y rutas (vía cache)"""
+        cache = self.get_cache_commits()
+        if not cache:
+            return []
+        try:
+            return [self._commit_desde_cache(c) for c in cache.buscar(texto, max_count)]
+        except Exception as e:
+            print(f"Error buscando commits: {e}")
+            return []
+
+    def buscar_en_historial(self, patron, modo='S', regex=False, todas_las_ramas=False, ruta=None):
+        """
+        Prepara una búsqueda pickaxe (-S/-G) sobre el historial; se lanza con
+        `iniciar(...)` y se puede detener con `cancelar()`
+        """
+        if not self.repo:
+            return None
+        desde = ['--all'] if todas_las_ramas else 'HEAD'
+        return BusquedaHistorial(self, patron, modo=modo, regex=regex, desde=desde, ruta=ruta)
+
+    def iterar_log_grafo(self, todas_las_ramas=False):
+        """
+        Recorre el historial en orden topológico con un solo `git log` en streaming.
+        Genera tuplas (RegistroCommit, refs); cerrar el generador termina el proceso.
+        """
+        if not self.repo or not self._head_sha():
+            return
+        proceso = self._git_proceso('log', '--topo-order', f'--format={FORMATO_LOG_GRAFO}',
+                                    '--all' if todas_las_ramas else 'HEAD')
+        proceso.stdin.close()
+        try:
+            for registro in _leer_registros(proceso.stdout):
+                campos = registro.decode('utf-8', 'replace').rstrip('\n').split('\x1f', 5)
+                if len(campos) < 6:
+                    continue
+                sha, padres, autor, fecha_commit, refs, asunto = campos
+                yield RegistroCommit(sha, asunto, autor, int(fecha_commit), padres.split()), refs
+        finally:
+            if proceso.poll() is None:
+                proceso.kill()
+            proceso.wait()
+
+    def get_estadisticas(self):
+        """
+        Churn y autoría de la rama actual, actualizados desde el último SHA analizado
+        
+        Returns:
+            dict con los agregados, o str con el error
+        """
+        if not self.repo:
+            return "No hay repositorio Git"
+        try:
+            if self._estadisticas is None:
+                self._estadisticas = EstadisticasRepo(self)
+            nuevos = self._estadisticas.actualizar()
+            if nuevos:
+                print(f"📈 Estadísticas: {nuevos} commit(s) analizados")
+            return self._estadisticas.resumen()
+        except GitCommandError as e:
+            return str(e)
+        except RuntimeError as e:
+            return str(e)
+
+    def blame_archivo(self, ruta):
+        """Prepara el blame incremental de `ruta` en HEAD; se lanza con `iniciar(...)`"""
+        if not self.repo:
+            return None
+        return BlameIncremental(self, ruta)
+
+    def _obtener_blame(self, blob, ruta):
+        with self._lock_blames:
+            guardado = self._blames.get((blob, ruta))
+            if guardado:
+                self._blames.move_to_end((blob, ruta))
+            return guardado
+
+    def _ultimo_blame_de(self, ruta, head):
+        """
+        Blame cacheado más reciente de la ruta (de cualquier versión) calculado en
+        un ancestro de `head`: (blob, tramos, commits, commit), o None
+        """
+        with self._lock_blames:
+            candidatos = [(blob, *guardado) for (blob, ruta_guardada), guardado
+                          in reversed(self._blames.items()) if ruta_guardada == ruta]
+        for candidato in candidatos:
+            if self._es_ancestro(candidato[3], head):
+                return candidato
+        return None
+
+    def _es_ancestro(self, commit, head):
+        """`git merge-base --is-ancestor`: sale con 1 si no lo es (o con error si el commit ya no existe)"""
+        if commit == head:
+            return True
+        try:
+            self._git('merge-base', '--is-ancestor', commit, head)
+            return True
+        except GitCommandError:
+            return False
+
+    def _guardar_blame(self, blob, ruta, tramos, commits, commit):
+        with self._lock_blames:
+            self._blames[(blob, ruta)] = (tramos, commits, commit)
+            self._blames.move_to_end((blob, ruta))
+            while len(self._blames) > MAX_BLAMES_CACHE:
+                self._blames.popitem(last=False)
+
+    def get_fechas_ultimo_commit(self, rutas):
+        """
+        Fecha del último commit que tocó cada archivo, resuelta desde la cache
+        
+        Returns:
+            dict {ruta: timestamp}, o None si la cache no está disponible
+        """
+        cache = self.get_cache_commits()
+        if not cache:
+            return None
+        head = self._head_sha()
+        if not head:
+            return {}
+        # Solo archivos versionados: los ignorados obligarían a recorrer toda la historia
+        versionados = {ruta for ruta, _ in self.repo.index.entries.keys()}
+        return cache.fechas_ultimo_commit(head, [r for r in rutas if r in versionados])
+
+    def get_commits_por_archivo(self, archivo, max_count=20):
+        """
+        Historial de un archivo siguiendo renombres, con un solo `git log --follow`
+        
+        El tipo de cambio, la ruta anterior y las líneas +/- salen del mismo
+        stream (--raw --numstat -z). El resultado se cachea por (HEAD, ruta).
+        """
+        if not self.repo:
+            return []
+        
+        head = self._head_sha()
+        if not head:
+            return []
+        
+        clave = (head, archivo)
+        with self._lock_historiales:
+            guardado = self._historiales_archivo.get(clave)
+            if guardado and (guardado[0] >= max_count or len(guardado[1]) < guardado[0]):
+                self._historiales_archivo.move_to_end(clave)
+                return guardado[1][:max_count]
+        
+        try:
+            proceso = self._git_proceso(
+                'log', '--follow', '--raw', '--numstat', '-z', f'--max-count={max_count}',
+                f'--format={FORMATO_LOG_CACHE}', head, '--', archivo)
+            proceso.stdin.close()
+            
+            commits = []
+            for registro in _leer_registros(proceso.stdout):
+                campos = registro.decode('utf-8', 'replace').split('\x1f', 8)
+                if len(campos) < 9:
+                    continue
+                sha, padres, autor, email, fecha_autor, fecha_commit, asunto, cuerpo, resto = campos
+                c = {'sha': sha, 'padres': padres.split(), 'autor': autor, 'email': email,
+                     'fecha_autor': int(fecha_autor), 'fecha_commit': int(fecha_commit),
+                     'asunto': asunto, 'cuerpo': cuerpo}
+                
+                # Con --follow el diff queda limitado al archivo seguido
+                entradas = _parsear_raw_numstat(resto)
+                entrada = entradas[0] if entradas else None
+                
+                commit = self._commit_desde_cache(c)
+                commit.ruta = archivo
+                if entrada:
+                    commit.tipo_cambio = entrada['estado']
+                    commit.ruta = entrada['ruta']
+                    commit.ruta_anterior = entrada['ruta_anterior']
+                    commit.lineas_agregadas = entrada['agregadas']
+                    commit.lineas_eliminadas = entrada['eliminadas']
+                commits.append(commit)
+            
+            error = proceso.stderr.read()
+            if proceso.wait() != 0:
+                raise _error_comando_git(['git', 'log', '--follow', archivo], proceso.returncode, error)
+            
+            with self._lock_historiales:
+                self._historiales_archivo[clave] = (max_count, commits)
+                self._historiales_archivo.move_to_end(clave)
+                while len(self._historiales_archivo) > MAX_HISTORIALES_CACHE:
+                    self._historiales_archivo.popitem(last=False)
+            return commits
+        except Exception as e:
+            print(f"Error obteniendo commits del archivo: {e}")
+            return []
+
+    def crear_tag(self, nombre_tag, mensaje="", commit_hash=None):
+        try:
+            if commit_hash:
+                if mensaje:
+                    self.repo.git.tag('-a', nombre_tag, '-m', mensaje, commit_hash)
+                else:
+                    self.repo.git.tag(nombre_tag, commit_hash)
+            else:
+                if mensaje:
+                    self.repo.git.tag('-a', nombre_tag, '-m', mensaje)
+                else:
+                    self.repo.git.tag(nombre_tag)
+            
+            print(f"🏷️ Tag '{nombre_tag}' creado")
+            return True
+            
+        except GitCommandError as e:
+            return str(e)
+
+    def get_tags(self):
+        if not self.repo:
+            return []
+        
+        cache = self.get_cache_commits()
+        if cache:
+            try:
+                return self._get_tags_desde_cache(cache)
+            except GitCommandError as e:
+                print(f"Error obteniendo tags: {e}")
+                return []
+        
+        try:
+            tags_info = []
+            for tag in self.repo.tags:
+                try:
+                    commit = tag.commit
+                    
+                    try:
+                        tag_obj = self.repo.odb.info(tag.object.binsha)
+                        mensaje_tag = tag.tag.message if hasattr(tag, 'tag') else ""
+                    except:
+                        mensaje_tag = ""
+                    
+                    registro = RegistroCommit(commit.binsha, commit.message.strip(), str(commit.author),
+                                              commit.committed_date, [p.binsha for p in commit.parents])
+                    tags_info.append(RegistroTag(tag.name, registro, mensaje_tag))
+                except Exception as e:
+                    print(f"Error procesando tag {tag.name}: {e}")
+                    continue
+            
+            tags_info.sort(key=lambda x: x.commit.timestamp, reverse=True)
+            return tags_info
+            
+        except Exception as e:
+            print(f"Error obteniendo tags: {e}")
+            return []
+
+    def _get_tags_desde_cache(self, cache):
+        """Lista los tags con un solo for-each-ref y completa los commits desde la cache"""
+        salida = self._git(
+            'for-each-ref',
+            '--format=%(refname:short)%00%(objecttype)%00%(objectname)%00%(*objectname)%00%(contents)%1e',
+            'refs/tags'
+        ).decode('utf-8', 'replace')
+        
+        tags_info = []
+        for registro in salida.split('\x1e'):
+            partes = registro.lstrip('\n').split('\0', 4)
+            if len(partes) < 5:
+                continue
+            nombre, tipo, sha, sha_pelado, contenido = partes
+            anotado = (tipo == 'tag')
+            c = cache.obtener(sha_pelado if anotado else sha)
+            if not c:
+                continue
+            
+            tags_info.append(RegistroTag(nombre, self._commit_desde_cache(c),
+                                         contenido.strip() if anotado else ""))
+        
+        tags_info.sort(key=lambda x: x.commit.timestamp, reverse=True)
+        return tags_info
+
+    def eliminar_tag(self, nombre_tag):
+        try:
+            self.repo.git.tag('-d', nombre_tag)
+            print(f"🗑️ Tag '{nombre_tag}' eliminado")
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def push_tags(self):
+        try:
+            self.repo.git.push('--tags')
+            return True
+        except GitCommandError as e:
+            return str(e)
+
+    def reset_to_commit(self, commit_hash, tipo="soft"):
+        try:
+            if tipo == "soft":
+                self.repo.git.reset('--soft', commit_hash)
+            elif tipo == "mixed":
+                self.repo.git.reset('--mixed', commit_hash)
+            elif tipo == "hard":
+                self.repo.git.reset('--hard', commit_hash)
+            
+            print(f"🔄 Reset {tipo} a commit {commit_hash}")
+            return True
+            
+        except GitCommandError as e:
+            return str(e)
+
+    def crear_repo_gh(self, nombre, visibilidad="private"):
+        """Crea un repositorio en GitHub usando GitHub CLI"""
+        try:
+            os.chdir(self.path)
+            print(f"📂 Cambiando a directorio: {self.path}")
+            
+            if not os.path.exists(os.path.join(self.path, ".git")):
+                print("🚀 Inicializando repositorio Git local...")
+                self.iniciar_git()
+            
+            if not self.repo:
+                self.repo = cargar_git()(self.path)
+            
+            status = subprocess.getoutput("git status --porcelain").strip()
+            print(f"📋 Status actual: {status}")
+            
+            try:
+                result = subprocess.getoutput("git log --oneline -1").strip()
+                if not result:
+                    print("📝 No hay commits, creando commit inicial...")
+                    need_initial_commit = True
+                else:
+                    print(f"✅ Último commit: {result}")
+                    need_initial_commit = False
+            except:
+                need_initial_commit = True
+            
+            if need_initial_commit or status:
+                print("📝 Preparando archivos para commit...")
+                
+                readme_path = os.path.join(self.path, "README.md")
+                if not os.path.exists(readme_path):
+                    with open(readme_path, 'w', encoding='utf-8') as f:
+                        f.write(f"# {nombre}\n\nProyecto creado con AETHERYON Dev Core\n")
+                    print("📄 README.md creado")
+                
+                subprocess.run("git add .", shell=True, check=True)
+                print("➕ Archivos añadidos al stage")
+                
+                commit_result = subprocess.run('git commit -m "Initial commit"', shell=True)
+                if commit_result.returncode == 0:
+                    print("✅ Commit inicial realizado")
+                else:
+                    print("⚠️ Error en commit o no hay cambios")
+            
+            print(f"🌐 Creando repositorio en GitHub: {nombre}")
+            
+            command = f'gh repo create {nombre} --{visibilidad} --source=. --remote=origin --push'
+            print(f"🔧 Ejecutando: {command}")
+            
+            result = subprocess.run(command, shell=True)
+            
+            if result.returncode == 0:
+                print("✅ Repositorio GitHub creado exitosamente")
+                self.repo = cargar_git()(self.path)
+                return True
+            else:
+                error_msg = f"Error ejecutando GitHub CLI (código: {result.returncode}).\n"
+                
+                if result.returncode == 1:
+                    error_msg += "Posible causa: El repositorio ya existe o hay un problema de autenticación."
+                elif result.returncode == 2:
+                    error_msg += "Posible causa: Problema con los parámetros del comando."
+                else:
+                    error_msg += "Verifica que 'gh' esté instalado y autenticado correctamente."
+                
+                return error_msg
+                
+        except Exception as e:
+            print(f"❌ Error en crear_repo_gh: {e}")
+            return str(e)
+
+    def estado_archivos(self):
+        if not self.es_repositorio:
+            return {}
+
+        # Una sola consulta (un proceso o ninguno con libgit2) en vez de tres diffs de GitPython
+        try:
+            estado = self.get_backend().estado()
+        except Exception as e:
+            print(f"Error obteniendo estado: {e}")
+            estado = {"unstaged": [], "staged": [], "untracked": []}
+
+        untracked = [f for f in estado["untracked"] if not self._esta_en_carpeta_ignorada(f)]
+        unstaged = [f for f in estado["unstaged"] if not self._esta_en_carpeta_ignorada(f)]
+        staged = [f for f in estado["staged"] if not self._esta_en_carpeta_ignorada(f)]
+
+        print(f"📊 Estado Git (filtrado):")
+        print(f"  🆕 Untracked: {len(untracked)} archivos")
+        print(f"  📝 Unstaged: {len(unstaged)} archivos")
+        print(f"  ✅ Staged: {len(staged)} archivos")
+
+        return {
+            "unstaged": unstaged,
+            "staged": staged,
+            "untracked": untracked
+        }
+
+    def _esta_en_carpeta_ignorada(self, ruta):
+        partes = ruta.split('/')
+        return any(carpeta in CARPETAS_IGNORADAS for carpeta in partes)
+
+    def escanear_archivos(self):
+        """
+        Archivos del directorio con su estado git, lo que muestra la lista principal
+        
+        Returns:
+            dict {'archivos': [(ruta, estado)], 'ignorados': cantidad en carpetas ignoradas,
+                  'status': estado_archivos() usado para clasificarlos}
+        """
+        git_estado = self.estado_archivos()
+        untracked = set(git_estado.get("untracked", []))
+        unstaged = set(git_estado.get("unstaged", []))
+        staged = set(git_estado.get("staged", []))
+        
+        encontrados = []
+        ignorados = 0
+        for root_dir, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in CARPETAS_IGNORADAS]
+            for file in files:
+                rel_path = os.path.relpath(os.path.join(root_dir, file), self.path).replace('\\', '/')
+                if self._esta_en_carpeta_ignorada(rel_path):
+                    ignorados += 1
+                    continue
+                encontrados.append(rel_path)
+        
+        # Fechas del último commit de todos los archivos en una sola pasada por la cache
+        fechas_commits = self.get_fechas_ultimo_commit(encontrados)
+        
+        archivos = []
+        for rel_path in encontrados:
+            if rel_path in untracked:
+                estado = "🆕 Untracked"
+            elif rel_path in unstaged:
+                estado = "📝 Modificado"
+            elif rel_path in staged:
+                estado = "✅ Staged"
+            else:
+                estado = self._estado_commit_archivo(rel_path, fechas_commits)
+            archivos.append((rel_path, estado))
+        return {'archivos': archivos, 'ignorados': ignorados, 'status': git_estado}
+
+    def _estado_commit_archivo(self, rel_path, fechas_commits):
+        if fechas_commits is not None:
+            if rel_path in fechas_commits:
+                fecha = datetime.fromtimestamp(fechas_commits[rel_path]).strftime('%Y-%m-%d %H:%M')
+                return f"💾 Committed ({fecha})"
+            return "📄 Sin cambios"
+        # Sin cache: un log por archivo
+        try:
+            if self.repo and self.repo.head.is_valid():
+                commits = list(self.repo.iter_commits(paths=rel_path, max_count=1))
+                if commits:
+                    fecha = datetime.fromtimestamp(commits[0].committed_date).strftime('%Y-%m-%d %H:%M')
+                    return f"💾 Committed ({fecha})"
+            return "📄 Sin cambios"
+        except Exception:
+            return "❓ Desconocido"
+
+    def _git_por_rutas(self, args, rutas):
+        """
+        Corre `git <args>` una sola vez con todas las rutas por stdin (separadas
+        por NUL, sin interpretar comodines). Si falla, divide el lote en mitades
+        hasta aislar las rutas con problema: el resto se aplica igual.
+        Devuelve {'ok': [rutas], 'fallidos': {ruta: mensaje}}.
+        """
+        fallidos = {}
+        pendientes = [list(rutas)]
+        while pendientes:
+            grupo = pendientes.pop()
+            if not grupo:
+                continue
+            comando = ['git', '--literal-pathspecs', *args, '--pathspec-from-file=-', '--pathspec-file-nul']
+            with medir_subproceso(comando):
+                resultado = subprocess.run(comando, cwd=self.path, input='\0'.join(grupo).encode('utf-8'),
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                           creationflags=FLAGS_SUBPROCESO)
+            if resultado.returncode == 0:
+                continue
+            if len(grupo) == 1:
+                mensaje = resultado.stderr.decode('utf-8', 'replace').strip()
+                fallidos[grupo[0]] = mensaje or f"git {args[0]} terminó con código {resultado.returncode}"
+            else:
+                # Las tres operaciones son idempotentes: repetir la parte que sí se aplicó no cambia nada
+                mitad = len(grupo) // 2
+                pendientes += [grupo[mitad:], grupo[:mitad]]
+        return {'ok': [ruta for ruta in rutas if ruta not in fallidos], 'fallidos': fallidos}
+
+    def git_add(self, archivos):
+        """Agrega al stage todas las rutas con un solo proceso de git"""
+        try:
+            return self._git_por_rutas(['add'], archivos)
+        except OSError as e:
+            return str(e)
+
+    def git_unstage(self, archivos):
+        """Saca rutas del stage (conserva los cambios en el working directory)"""
+        try:
+            return self._git_por_rutas(['reset', '-q'], archivos)
+        except OSError as e:
+            return str(e)
+
+    def descartar_cambios(self, archivos):
+        """Vuelve las rutas a lo que hay en el índice (se pierden los cambios sin stage)"""
+        try:
+            return self._git_por_rutas(['checkout'], archivos)
+        except OSError as e:
+            return str(e)
+
+    def git_commit(self, mensaje):
+        return self._sincronico(self.get_async().commit(mensaje))
+
+#########################
+
+    def verificar_cambios_pendientes(self):
+        """
+        Verifica si hay cambios sin guardar en el working directory
+        
+        Returns:
+            dict: {
+                'tiene_cambios': bool,
+                'unstaged': int,
+                'untracked': int,
+                'staged': int,
+                'detalles': list[str]
+            }
+        """
+        if not self.repo:
+            return {
+                'tiene_cambios': False,
+                'unstaged': 0,
+                'untracked': 0,
+                'staged': 0,
+                'detalles': []
+            }
+        
+        try:
+            detalles = []
+            
+            # Archivos modificados pero no staged
+            unstaged_items = list(self.repo.index.diff(None))
+            unstaged = len(unstaged_items)
+            if unstaged > 0:
+                detalles.append(f"📝 {unstaged} archivo(s) modificado(s)")
+            
+            # Archivos sin trackear
+            untracked_files = self.repo.untracked_files
+            untracked = len(untracked_files)
+            if untracked > 0:
+                detalles.append(f"🆕 {untracked} archivo(s) nuevo(s)")
+            
+            # Archivos staged pero no commiteados
+            try:
+                if self.repo.head.is_valid():
+                    staged_items = list(self.repo.index.diff("HEAD"))
+                    staged = len(staged_items)
+                    if staged > 0:
+                        detalles.append(f"✅ {staged} archivo(s) en stage")
+                else:
+                    staged = 0
+            except:
+                staged = 0
+            
+            tiene_cambios = unstaged > 0 or untracked > 0 or staged > 0
+            
+            return {
+                'tiene_cambios': tiene_cambios,
+                'unstaged': unstaged,
+                'untracked': untracked,
+                'staged': staged,
+                'detalles': detalles
+            }
+        except Exception as e:
+            print(f"Error verificando cambios: {e}")
+            return {
+                'tiene_cambios': False,
+                'unstaged': 0,
+                'untracked': 0,
+                'staged': 0,
+                'detalles': []
+            }
+
+    def stash_cambios(self, mensaje="Auto-stash antes de cambiar rama"):
+        """
+        Guarda cambios temporalmente en stash
+        
+        Args:
+            mensaje: Mensaje descriptivo del stash
+            
+        Returns:
+            True si exitoso, str con error si falla
+        """
+        try:
+            # Verificar si hay algo que hacer stash
+            info_cambios = self.verificar_cambios_pendientes()
+            if not info_cambios['tiene_cambios']:
+                return True  # No hay nada que guardar
+            
+            # Stash con mensaje
+            self.repo.git.stash('push', '-u', '-m', mensaje)  # -u incluye untracked
+            print(f"📦 Stash creado: {mensaje}")
+            return True
+        except GitCommandError as e:
+            return f"Error al hacer stash: {str(e)}"
+
+    def aplicar_stash(self, index=0, eliminar_despues=True):
+        """
+        Aplica un stash guardado
+        
+        Args:
+            index: Índice del stash (0 es el más reciente)
+            eliminar_despues: Si True usa 'pop', si False usa 'apply'
+            
+        Returns:
+            True si exitoso, str con error si falla
+        """
+        try:
+            if index == 0 and eliminar_despues:
+                self.repo.git.stash('pop')
+            elif eliminar_despues:
+                self.repo.git.stash('pop', f'stash@{{{index}}}')
+            else:
+                self.repo.git.stash('apply', f'stash@{{{index}}}')
+            
+            print(f"✅ Stash aplicado (índice: {index})")
+            return True
+        except GitCommandError as e:
+            return f"Error al aplicar stash: {str(e)}"
+
+    def listar_stashes(self):
+        """
+        Lista todos los stashes disponibles
+        
+        Returns:
+            list[dict]: Lista de stashes con info estructurada
+        """
+        try:
+            stashes = []
+            stash_list = self.repo.git.stash('list').split('\n')
+            
+            for i, stash_str in enumerate(stash_list):
+                if stash_str.strip():
+                    # Parsear formato: stash@{0}: WIP on branch: mensaje
+                    parts = stash_str.split(': ', 2)
+                    if len(parts) >= 3:
+                        stashes.append({
+                            'index': i,
+                            'ref': parts[0],
+                            'tipo': parts[1],
+                            'mensaje': parts[2] if len(parts) > 2 else '',
+                            'texto_completo': stash_str
+                        })
+                    else:
+                        stashes.append({
+                            'index': i,
+                            'ref': f'stash@{{{i}}}',
+                            'tipo': 'WIP',
+                            'mensaje': stash_str,
+                            'texto_completo': stash_str
+                        })
+            
+            return stashes
+        except Exception as e:
+            print(f"Error listando stashes: {e}")
+            return []
+
+    def eliminar_stash(self, index):
+        """Elimina un stash específico"""
+        try:
+            self.repo.git.stash('drop', f'stash@{{{index}}}')
+            print(f"🗑️ Stash {index} eliminado")
+            return True
+        except GitCommandError as e:
+            return f"Error al eliminar stash: {str(e)}"
+
+    def cambiar_rama_seguro(self, nombre_rama, forzar=False, stash_automatico=False):
+        """
+        Cambia de rama de forma segura, verificando el estado del working directory
+        
+        Args:
+            nombre_rama: Nombre de la rama destino
+            forzar: Si es True, fuerza el checkout descartando cambios locales
+            stash_automatico: Si es True, hace stash automático de cambios
+        
+        Returns:
+            dict con resultado detallado
+        """
+        try:
+            rama_origen = self.get_rama_actual()
+            
+            # Verificar si ya estamos en esa rama
+            if rama_origen == nombre_rama:
+                return {
+                    'exito': True,
+                    'mensaje': f'Ya estás en la rama {nombre_rama}',
+                    'cambios_pendientes': False,
+                    'rama_actual': rama_origen,
+                    'sin_cambios': True
+                }
+            
+            # Verificar si hay cambios pendientes
+            info_cambios = self.verificar_cambios_pendientes()
+            tiene_cambios = info_cambios['tiene_cambios']
+            
+            # Manejar cambios pendientes
+            if tiene_cambios:
+                if stash_automatico:
+                    # Hacer stash automático
+                    resultado_stash = self.stash_cambios(
+                        f"Auto-stash: cambio de {rama_origen} a {nombre_rama}"
+                    )
+                    if resultado_stash != True:
+                        return {
+                            'exito': False,
+                            'mensaje': 'Error al hacer stash automático',
+                            'cambios_pendientes': True,
+                            'error': resultado_stash
+                        }
+                    print("📦 Cambios guardados automáticamente en stash")
+                elif not forzar:
+                    # Requiere acción del usuario
+                    return {
+                        'exito': False,
+                        'mensaje': 'Hay cambios sin guardar',
+                        'cambios_pendientes': True,
+                        'requiere_stash': True,
+                        'info_cambios': info_cambios
+                    }
+            
+            # Realizar el checkout
+            if forzar:
+                # Checkout forzado (descarta cambios locales)
+                print(f"⚠️ Checkout FORZADO a {nombre_rama} (descartando cambios)")
+                self.repo.git.checkout(nombre_rama, force=True)
+            else:
+                # Checkout normal
+                print(f"🔀 Checkout a {nombre_rama}")
+                self.repo.git.checkout(nombre_rama)
+            
+            # Verificar que el checkout fue exitoso
+            rama_actual = self.get_rama_actual()
+            checkout_exitoso = (rama_actual == nombre_rama)
+            
+            if checkout_exitoso:
+                print(f"✅ Cambio exitoso: {rama_origen} → {rama_actual}")
+                return {
+                    'exito': True,
+                    'mensaje': f'Cambiado exitosamente a {nombre_rama}',
+                    'cambios_pendientes': False,
+                    'rama_origen': rama_origen,
+                    'rama_actual': rama_actual,
+                    'habia_cambios': tiene_cambios,
+                    'stash_aplicado': stash_automatico and tiene_cambios
+                }
+            else:
+                return {
+                    'exito': False,
+                    'mensaje': f'El checkout no se completó correctamente (rama actual: {rama_actual})',
+                    'cambios_pendientes': False,
+                    'rama_actual': rama_actual
+                }
+                
+        except GitCommandError as e:
+            error_msg = str(e)
+            
+            # Analizar el tipo de error
+            if "would be overwritten" in error_msg:
+                return {
+                    'exito': False,
+                    'mensaje': 'Archivos modificados serían sobrescritos',
+                    'cambios_pendientes': True,
+                    'requiere_stash': True,
+                    'error': error_msg,
+                    'tipo_error': 'conflicto_archivos'
+                }
+            elif "does not exist" in error_msg:
+                return {
+                    'exito': False,
+                    'mensaje': f'La rama {nombre_rama} no existe',
+                    'error': error_msg,
+                    'tipo_error': 'rama_inexistente'
+                }
+            else:
+                return {
+                    'exito': False,
+                    'mensaje': f'Error en checkout: {error_msg}',
+                    'error': error_msg,
+                    'tipo_error': 'desconocido'
+                }
+        except Exception as e:
+            return {
+                'exito': False,
+                'mensaje': f'Error inesperado: {str(e)}',
+                'error': str(e),
+                'tipo_error': 'excepcion'
+            }
+
+#########################
+
+# Cada método de Proyecto queda medido para el panel de rendimiento
+_instrumentar_clase(Proyecto, "Proyecto")
@@ -0,0 +1,10 @@
+"""
+Benchmarks de AETHERYON Dev Core.
+
+Genera repositorios sintéticos de forma configurable (con git fast-import) y
+mide las operaciones de Proyecto sobre ellos. Los resultados se guardan en JSON
+junto con los datos de la máquina, para comparar antes y después de un cambio:
+
+    python -m benchmarks --forma mediano --salida antes.json
+    python -m benchmarks --forma mediano --salida despues.json --comparar antes.json
+"""
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.correr import comparar, guardar, info_maquina, medir_repo
+from benchmarks.generador import FORMAS, forma_completa, generar_repo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Mide las operaciones de Proyecto sobre un repo sintético")
+    parser.add_argument('--forma', default='mediano', choices=sorted(FORMAS),
+                        help="tamaño del repo generado")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--destino', help="dónde generar el repo (por defecto, un directorio temporal)")
+    parser.add_argument('--repo', help="medir un repo existente en vez de generar uno")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--salida', help="archivo JSON con los resultados")
+    parser.add_argument('--comparar', help="JSON de una corrida anterior para mostrar la diferencia")
+    args = parser.parse_args(argv)
+
+    if args.repo:
+        path, info, generacion = os.path.abspath(args.repo), {}, None
+    else:
+        path = args.destino or os.path.join(tempfile.gettempdir(), f"aetheryon-bench-{args.forma}-{args.semilla}")
+        print(f"🏗️ Generando repo '{args.forma}' en {path}...", file=sys.stderr)
+        inicio = time.perf_counter()
+        info = generar_repo(path, args.forma, args.semilla)
+        generacion = time.perf_counter() - inicio
+        print(f"✅ Repo generado en {generacion:.1f} s", file=sys.stderr)
+
+    operaciones = medir_repo(path, info, args.repeticiones,
+                             al_progreso=lambda nombre: print(f"⏱️ {nombre}", file=sys.stderr))
+    resultados = {
+        'maquina': info_maquina(),
+        'repo': {'path': path, 'forma': info.get('forma') or (None if args.repo else forma_completa(args.forma)),
+                 'semilla': None if args.repo else args.semilla, 'generacion_s': generacion},
+        'repeticiones': args.repeticiones,
+        'operaciones': operaciones,
+    }
+
+    print(f"\n{'Operación':<42}{'frío ms':>10}{'mediana ms':>12}{'procesos':>10}")
+    for nombre, datos in operaciones.items():
+        print(f"{nombre[:41]:<42}{datos['frio_ms']:>10.1f}{datos['mediana_ms']:>12.1f}"
+              f"{datos['procesos_frio']:>10}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            print("\n" + "\n".join(comparar(json.load(f), resultados)))
+    if args.salida:
+        guardar(args.salida, resultados)
+        print(f"\n💾 Resultados en {args.salida}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Mide las operaciones de Proyecto sobre un repositorio.
+
+Cada operación se corre una vez con un Proyecto recién abierto (frío: sin
+caches en memoria) y después `repeticiones` veces sobre el mismo (caliente).
+Se guardan las duraciones, la mediana y cuántos procesos de git lanzó.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import git
+
+from aetheryon_core import METRICAS, Proyecto, cargar_numpy, cargar_pygit2
+
+
+def operaciones(info):
+    """(nombre, función(proyecto)) de lo que se mide; `info` es lo que devolvió generar_repo"""
+    principal = info.get('rama_principal', 'main')
+    rama = (info.get('ramas') or [principal])[0]
+    archivo = info.get('archivo_con_historial')
+    lista = [
+        ('estado_archivos', lambda p: p.estado_archivos()),
+        ('escanear_archivos (ver_archivos sin UI)', lambda p: p.escanear_archivos()),
+        ('verificar_cambios_pendientes', lambda p: p.verificar_cambios_pendientes()),
+        ('get_rama_actual', lambda p: p.get_rama_actual()),
+        ('listar_ramas', lambda p: p.listar_ramas()),
+        ('detectar_divergencia_ramas', lambda p: p.detectar_divergencia_ramas(principal, rama)),
+        ('analizar_merge_previo', lambda p: p.analizar_merge_previo(rama)),
+        ('comparar_arboles_ramas', lambda p: p.comparar_arboles_ramas(principal, rama)),
+        ('get_commits_detallados', lambda p: p.get_commits_detallados(200)),
+        ('get_tags', lambda p: p.get_tags()),
+        ('listar_stashes', lambda p: p.listar_stashes()),
+        ('get_git_log', lambda p: p.get_git_log(50)),
+    ]
+    if archivo:
+        lista.append(('get_commits_por_archivo', lambda p: p.get_commits_por_archivo(archivo, 50)))
+    if cargar_numpy() is not None:
+        lista.append(('get_estadisticas', lambda p: p.get_estadisticas()))
+    return lista
+
+
+def _medir(funcion, proyecto):
+    METRICAS.reiniciar()
+    inicio = time.perf_counter()
+    funcion(proyecto)
+    duracion = time.perf_counter() - inicio
+    procesos = sum(datos['procesos'] for datos in METRICAS.resumen()['subprocesos'].values())
+    return duracion * 1000, procesos
+
+
+def medir_repo(path, info=None, repeticiones=5, al_progreso=None):
+    """{operacion: {'frio_ms', 'caliente_ms': [..], 'mediana_ms', 'procesos_frio', 'procesos_caliente'}}"""
+    info = info or {}
+    resultados = {}
+    for nombre, funcion in operaciones(info):
+        if al_progreso:
+            al_progreso(nombre)
+        proyecto = Proyecto(path)
+        try:
+            frio, procesos_frio = _medir(funcion, proyecto)
+            calientes = [_medir(funcion, proyecto) for _ in range(repeticiones)]
+        finally:
+            proyecto.cerrar()
+        tiempos = [ms for ms, _ in calientes]
+        resultados[nombre] = {
+            'frio_ms': frio,
+            'procesos_frio': procesos_frio,
+            'caliente_ms': tiempos,
+            'mediana_ms': statistics.median(tiempos) if tiempos else frio,
+            'procesos_caliente': calientes[-1][1] if calientes else procesos_frio,
+        }
+    return resultados
+
+
+def _salida(*comando):
+    try:
+        return subprocess.run(comando, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def info_maquina():
+    """Lo necesario para saber si dos corridas son comparables"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': sys.version.split()[0],
+        'git': _salida('git', '--version'),
+        'gitpython': git.__version__,
+        'pygit2': getattr(cargar_pygit2(), '__version__', None),
+        'numpy': getattr(cargar_numpy(), '__version__', None),
+        'backend': os.environ.get('AETHERYON_BACKEND') or ('pygit2' if cargar_pygit2() else 'cli'),
+        'commit_aetheryon': _salida('git', '-C', raiz, 'rev-parse', '--short', 'HEAD'),
+    }
+
+
+def guardar(ruta, datos):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+
+
+def comparar(anterior, actual):
+    """Líneas de texto con la mediana de cada operación antes/después y la diferencia"""
+    lineas = [f"{'Operación':<42}{'antes ms':>10}{'después ms':>12}{'cambio':>9}"]
+    previas = anterior.get('operaciones', {})
+    for nombre, datos in actual.get('operaciones', {}).items():
+        if nombre not in previas:
+            lineas.append(f"{nombre[:41]:<42}{'-':>10}{datos['mediana_ms']:>12.1f}{'nuevo':>9}")
+            continue
+        antes, despues = previas[nombre]['mediana_ms'], datos['mediana_ms']
+        cambio = f"{(despues - antes) / antes * 100:+.0f}%" if antes else "-"
+        lineas.append(f"{nombre[:41]:<42}{antes:>10.1f}{despues:>12.1f}{cambio:>9}")
+    return lineas
@@ -0,0 +1,212 @@
+"""
+Repositorios sintéticos para los benchmarks.
+
+Todo el historial se escribe con un solo `git fast-import`, así un repo de
+miles de commits se arma en segundos. Con la misma forma y semilla el
+resultado es idéntico (mismos hashes).
+"""
+import os
+import random
+import shutil
+import subprocess
+
+# Cantidad de cada cosa; las claves que falten se toman de FORMA_POR_DEFECTO
+FORMA_POR_DEFECTO = {
+    'archivos': 2000,          # archivos versionados en la rama principal
+    'profundidad': 4,          # niveles de carpetas
+    'carpetas_por_nivel': 6,
+    'commits': 1000,           # commits en la rama principal
+    'archivos_por_commit': 5,  # archivos modificados por commit
+    'ramas': 8,                # ramas que salen de distintos puntos del historial
+    'commits_por_rama': 20,
+    'tags': 30,
+    'stashes': 5,
+    'sin_trackear': 200,       # ruido en el working directory
+    'ignorados': 500,          # dentro de node_modules (la lista los descarta)
+    'modificados': 50,         # cambios sin stage al terminar
+    'binarios': 20,
+    'tam_binario': 256 * 1024,
+    'lineas_por_archivo': 40,
+}
+
+FORMAS = {
+    'chico': {'archivos': 200, 'commits': 100, 'ramas': 3, 'commits_por_rama': 5, 'tags': 5,
+              'stashes': 2, 'sin_trackear': 20, 'ignorados': 50, 'modificados': 10, 'binarios': 3},
+    'mediano': {},
+    'grande': {'archivos': 20000, 'profundidad': 6, 'commits': 10000, 'archivos_por_commit': 10,
+               'ramas': 30, 'commits_por_rama': 50, 'tags': 200, 'stashes': 20,
+               'sin_trackear': 2000, 'ignorados': 5000, 'modificados': 500, 'binarios': 100},
+}
+
+RAMA_PRINCIPAL = 'main'
+
+# Fecha fija de inicio para que los hashes no dependan del reloj
+FECHA_INICIAL = 1_600_000_000
+AUTORES = ('Ana Pérez <ana@example.com>', 'Bruno Díaz <bruno@example.com>',
+           'Carla Gómez <carla@example.com>', 'Diego Ruiz <diego@example.com>')
+
+# Identidad para los comandos que crean commits fuera de fast-import (stash)
+IDENTIDAD = ['-c', 'user.name=Benchmark', '-c', 'user.email=benchmark@example.com']
+
+
+def forma_completa(forma):
+    """Forma por nombre ('chico', 'mediano', 'grande') o dict parcial, completada con los valores por defecto"""
+    if isinstance(forma, str):
+        forma = FORMAS[forma]
+    return {**FORMA_POR_DEFECTO, **forma}
+
+
+def _rutas(forma, azar):
+    carpetas = ['']
+    for nivel in range(forma['profundidad']):
+        carpetas += [f"{base}d{nivel}_{i}/" for base in carpetas
+                     if base.count('/') == nivel for i in range(forma['carpetas_por_nivel'])]
+    rutas = [f"{azar.choice(carpetas)}archivo_{i}.{azar.choice(('py', 'js', 'txt', 'md', 'c'))}"
+             for i in range(forma['archivos'])]
+    binarios = [f"{azar.choice(carpetas)}recurso_{i}.bin" for i in range(forma['binarios'])]
+    return rutas, binarios
+
+
+def _contenido(azar, ruta, version, lineas):
+    cuerpo = "\n".join(f"{ruta} v{version} línea {n} {azar.random():.6f}" for n in range(lineas))
+    return (cuerpo + "\n").encode('utf-8')
+
+
+class _Flujo:
+    """Escribe comandos de fast-import con marcas y fechas crecientes"""
+
+    def __init__(self, salida, azar):
+        self.salida = salida
+        self.azar = azar
+        self.marca = 0
+        self.fecha = FECHA_INICIAL
+
+    def datos(self, contenido):
+        self.salida.write(b'data %d\n' % len(contenido))
+        self.salida.write(contenido)
+        self.salida.write(b'\n')
+
+    def blob(self, contenido):
+        self.marca += 1
+        self.salida.write(b'blob\nmark :%d\n' % self.marca)
+        self.datos(contenido)
+        return self.marca
+
+    def commit(self, ref, mensaje, cambios, padre=None):
+        """cambios: [(ruta, marca_blob o None para borrar)]; devuelve la marca del commit"""
+        self.marca += 1
+        self.fecha += self.azar.randint(60, 7200)
+        autor = self.azar.choice(AUTORES)
+        cabecera = (f"commit {ref}\nmark :{self.marca}\n"
+                    f"author {autor} {self.fecha} +0000\ncommitter {autor} {self.fecha} +0000\n")
+        self.salida.write(cabecera.encode('utf-8'))
+        self.datos(mensaje.encode('utf-8'))
+        if padre is not None:
+            self.salida.write(b'from :%d\n' % padre)
+        for ruta, blob in cambios:
+            if blob is None:
+                self.salida.write(f"D {ruta}\n".encode('utf-8'))
+            else:
+                self.salida.write(f"M 100644 :{blob} {ruta}\n".encode('utf-8'))
+        self.salida.write(b'\n')
+        return self.marca
+
+    def tag(self, nombre, commit, mensaje):
+        autor = self.azar.choice(AUTORES)
+        texto = f"tag {nombre}\nfrom :{commit}\ntagger {autor} {self.fecha} +0000\n"
+        self.salida.write(texto.encode('utf-8'))
+        self.datos(mensaje.encode('utf-8'))
+
+
+def _git(destino, *args, entrada=None):
+    subprocess.run(['git', *args], cwd=destino, input=entrada, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def generar_repo(destino, forma='mediano', semilla=0):
+    """
+    Crea (o reemplaza) un repositorio en `destino` con la forma pedida.
+    
+    Returns:
+        dict con la forma usada y datos útiles para los benchmarks
+        ('rama_principal', 'ramas', 'archivo_con_historial')
+    """
+    forma = forma_completa(forma)
+    azar = random.Random(semilla)
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    os.makedirs(destino)
+    _git(destino, 'init', '-q', '-b', RAMA_PRINCIPAL)
+
+    rutas, binarios = _rutas(forma, azar)
+    versiones = {ruta: 0 for ruta in rutas}
+    ramas = []
+    proceso = subprocess.Popen(['git', 'fast-import', '--quiet'], cwd=destino,
+                               stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    flujo = _Flujo(proceso.stdin, azar)
+    try:
+        ref = f'refs/heads/{RAMA_PRINCIPAL}'
+        iniciales = [(ruta, flujo.blob(_contenido(azar, ruta, 0, forma['lineas_por_archivo'])))
+                     for ruta in rutas]
+        iniciales += [(ruta, flujo.blob(azar.randbytes(forma['tam_binario'])))
+                      for ruta in binarios]
+        commits = [flujo.commit(ref, "Commit inicial", iniciales)]
+
+        # Puntos del historial de donde salen las ramas y los tags
+        puntos_rama = set(azar.sample(range(1, max(2, forma['commits'])), min(forma['ramas'], forma['commits'] - 1)))
+        puntos_tag = set(azar.sample(range(1, max(2, forma['commits'])), min(forma['tags'], forma['commits'] - 1)))
+        for n in range(1, forma['commits']):
+            cambios = []
+            for ruta in azar.sample(rutas, min(forma['archivos_por_commit'], len(rutas))):
+                versiones[ruta] += 1
+                cambios.append((ruta, flujo.blob(_contenido(azar, ruta, versiones[ruta], forma['lineas_por_archivo']))))
+            commits.append(flujo.commit(ref, f"Cambio {n}: {cambios[0][0]}", cambios))
+            if n in puntos_tag:
+                flujo.tag(f"v{n // 100}.{n % 100}.0", commits[-1], f"Versión del commit {n}")
+
+        for indice, punto in enumerate(sorted(puntos_rama)):
+            nombre = f"rama-{indice}"
+            ramas.append(nombre)
+            padre = commits[punto]
+            for n in range(forma['commits_por_rama']):
+                ruta = azar.choice(rutas)
+                contenido = _contenido(azar, ruta, 1000 + n, forma['lineas_por_archivo'])
+                padre = flujo.commit(f'refs/heads/{nombre}', f"{nombre}: cambio {n}",
+                                     [(ruta, flujo.blob(contenido))], padre=padre if n == 0 else None)
+        proceso.stdin.close()
+    except BrokenPipeError:
+        pass
+    if proceso.wait() != 0:
+        raise RuntimeError(f"git fast-import falló: {proceso.stderr.read().decode('utf-8', 'replace')}")
+
+    _git(destino, 'checkout', '-q', '-f', RAMA_PRINCIPAL)
+
+    # Stashes: cada uno guarda una modificación distinta
+    for n in range(forma['stashes']):
+        with open(os.path.join(destino, azar.choice(rutas)), 'a', encoding='utf-8') as f:
+            f.write(f"stash {n}\n")
+        _git(destino, *IDENTIDAD, 'stash', 'push', '-q', '-m', f"benchmark {n}")
+
+    # Estado final del working directory: modificados, sin trackear e ignorados
+    for ruta in azar.sample(rutas, min(forma['modificados'], len(rutas))):
+        with open(os.path.join(destino, ruta), 'a', encoding='utf-8') as f:
+            f.write("cambio sin stage\n")
+    for n in range(forma['sin_trackear']):
+        _escribir(destino, f"ruido/nuevo_{n}.txt", f"ruido {n}\n")
+    for n in range(forma['ignorados']):
+        _escribir(destino, f"node_modules/paquete_{n % 50}/index_{n}.js", "module.exports = {}\n")
+
+    return {
+        'forma': forma,
+        'semilla': semilla,
+        'rama_principal': RAMA_PRINCIPAL,
+        'ramas': ramas,
+        'archivo_con_historial': max(versiones, key=versiones.get),
+    }
+
+
+def _escribir(destino, ruta, texto):
+    completa = os.path.join(destino, ruta)
+    os.makedirs(os.path.dirname(completa), exist_ok=True)
+    with open(completa, 'w', encoding='utf-8') as f:
+        f.write(texto)